@@ -0,0 +1,662 @@
+#!/usr/bin/env python3
+"""
+BlueEdge Framework - Benchmark Harness
+======================================
+
+Microbenchmarks for the hot kernels (Levenshtein DP, name normalization,
+each detector rule) and macro runs of the full comparison pipeline over
+1k / 10k / 100k / 1M records. Every benchmark is warmed up and repeated;
+results are written as JSON and compared against a committed baseline.
+Repeats are interleaved (one round over every benchmark, then the next
+round), so slow drift in machine speed shows up as measured spread rather
+than biasing whichever benchmarks happened to run during a slow spell.
+Each repeat is also bracketed by a short calibration workload (plain
+Python, independent of the framework); the gate compares throughput
+relative to that machine-speed reading, which cancels drift between runs. Speed also
+varies between interpreter processes (memory layout, core placement), so
+--processes N spreads the repeats over N worker processes and pools them.
+
+Microbenchmarks call the undecorated methods with result caching turned
+off, so they time the computation rather than cache hits. Macro runs use a
+fresh detector per repeat with caching on, as the app does.
+
+--workloads adds the workload profiles used by ResultsReproducer's
+measure_performance (all-distinct pairs, realistic duplicate mix, worst-case
+long names, cache-cold and cache-hot), reported as comparisons/s with a 95%
+confidence interval. They are informational and not part of the gate.
+
+The script exits with status 1 when a benchmark's median throughput drops
+below the baseline by more than the larger of --tolerance and the noise
+band derived from the spread of both runs (regression gate for CI).
+Record the baseline over several processes so its spread includes
+between-process variation:
+    python scripts/benchmark_framework.py --quick --processes 5 --micro-repeats 3 --macro-repeats 1 --update-baseline
+
+Usage:
+    python scripts/benchmark_framework.py --quick
+    python scripts/benchmark_framework.py --sizes 1000,10000,100000,1000000
+    python scripts/benchmark_framework.py --quick --update-baseline
+"""
+
+import sys
+import os
+import gc
+import json
+import math
+import time
+import random
+import timeit
+import inspect
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from datetime import datetime
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.algorithms.duplicate_detector import DuplicateDetector, PERFORMANCE_SAMPLE_PAIRS
+from src.utils.smart_cache import set_method_caching, invalidate_method_caches, CachePolicy
+from src.utils.corpus_generator import CorpusGenerator, DEFAULT_CATEGORY_RATES, DUPLICATE_CATEGORIES
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'benchmarks', 'baseline.json')
+DEFAULT_SIZES = (1000, 10000, 100000, 1000000)
+QUICK_SIZES = (1000, 10000)
+MACRO_CHUNK = 10000
+
+# Seed pools for macro workloads
+FIRST_NAMES = ['MOHAMMED', 'AHMED', 'FATIMA', 'SARA', 'OMAR', 'IBRAHIM', 'KHALED', 'NOUR',
+               'MARIAM', 'HASSAN', 'YASMINE', 'ABDULLAH', 'ABDULRAHMAN', 'LAYLA', 'YOUSEF']
+FAMILY_NAMES = ['HASSAN', 'SALEM', 'ALI', 'OMAR', 'MAHMOUD', 'IBRAHIM', 'KHALIL', 'NASSER',
+                'SAEED', 'MANSOUR', 'HAMDAN', 'YOUSSEF', 'ABDELAZIZ', 'FAROUK', 'RASHID']
+VARIANTS = {'MOHAMMED': 'MOHAMMAD', 'AHMED': 'AHMAD', 'HASSAN': 'HASAN', 'SARA': 'SOSO',
+            'FATIMA': 'FATEMA', 'KHALED': 'KHALID', 'NOUR': 'NOOR', 'MARIAM': 'MARYAM'}
+
+# Workload profiles: name -> result caching during the timed repeats
+WORKLOAD_PROFILES = {
+    'distinct': 'off',      # every pair differs: no norm1 == norm2 short-circuit
+    'realistic': 'off',     # corpus duplicate rate, hard negatives, Zipf-common names
+    'long_names': 'off',    # 8-token lineage chains one typo apart (DP worst case)
+    'cache_cold': 'cold',   # realistic pairs, caches cleared before each repeat
+    'cache_hot': 'hot'      # realistic working set that fits the cache, already cached
+}
+REALISTIC_DUPLICATE_SHARE = sum(DEFAULT_CATEGORY_RATES.values())
+LONG_NAME_TOKENS = 8
+# Distinct pairs in the cache-hot working set: half the default per-method
+# cache, since a sequential scan over more pairs than the LRU holds never hits
+HOT_WORKING_SET = CachePolicy().max_size // 2
+
+# Extra pairs for the detect_category rules PERFORMANCE_SAMPLE_PAIRS never
+# reaches: name_abbreviations fires only when both first words abbreviate to
+# the same initial, misspellings needs equal token counts below 0.7 similarity
+CATEGORY_RULE_PAIRS = PERFORMANCE_SAMPLE_PAIRS + [
+    ("M. AHMED HASSAN", "M. AHMAD HASAN"),
+    ("IBRAHIM MUSTAFA HAMED", "YASMINE YOUSEF HAMED"),
+]
+
+# Regression gate: noise band = NOISE_Z standard errors of the median ratio
+# (z = 3 keeps the chance of any false alarm across ~16 benchmarks near 4%)
+NOISE_Z = 3.0
+# Standard error of a median relative to that of a mean (normal samples)
+MEDIAN_SE_FACTOR = 1.2533
+
+# Two-sided 95% Student t critical values for 1..30 degrees of freedom
+T_CRITICAL_95 = (12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+                 2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+                 2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042)
+
+
+def environment_info():
+    """Machine/interpreter description stored with every result file."""
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpu_count': os.cpu_count()
+    }
+
+
+def calibration_workload():
+    """Fixed plain-Python string/dict work, independent of the framework code."""
+    table = {}
+    for i in range(500):
+        key = f"NAME {i % 97} SALEM"
+        parts = key.split()
+        table[parts[1]] = table.get(parts[1], 0) + len(key.lower().replace('A', 'E'))
+    return sorted(table.items())
+
+
+def make_calibration():
+    """Return a callable measuring current machine speed (calibration runs/s, ~50 ms)."""
+    timer = timeit.Timer(calibration_workload)
+    number = max(1, timer.autorange()[0] // 4)
+    timer.timeit(number)  # warm-up
+    return lambda: number / timer.timeit(number)
+
+
+def summarize(times, operations):
+    """Statistics over repeat wall times for a fixed number of operations."""
+    median = statistics.median(times)
+    return {
+        'operations': operations,
+        'repeats': len(times),
+        'times_s': times,
+        'median_s': median,
+        'mean_s': statistics.mean(times),
+        'stdev_s': statistics.stdev(times) if len(times) > 1 else 0.0,
+        'min_s': min(times),
+        'max_s': max(times),
+        'ops_per_sec': operations / median if median > 0 else 0.0,
+        # Best repeat (informational; the regression gate compares medians)
+        'best_ops_per_sec': operations / min(times) if min(times) > 0 else 0.0
+    }
+
+
+def mean_confidence_interval(samples):
+    """Mean and 95% confidence half-width (Student t) of repeat measurements."""
+    mean = statistics.mean(samples)
+    if len(samples) < 2:
+        return mean, 0.0
+    degrees = len(samples) - 1
+    t_critical = T_CRITICAL_95[degrees - 1] if degrees <= len(T_CRITICAL_95) else 1.96
+    return mean, t_critical * statistics.stdev(samples) / math.sqrt(len(samples))
+
+
+def uncached_detector():
+    """Detector whose @cached methods always compute."""
+    detector = DuplicateDetector()
+    set_method_caching(detector, False)
+    set_method_caching(detector.similarity_calculator, False)
+    return detector
+
+
+def micro_benchmarks(detector):
+    """Name -> zero-argument callable for every microbenchmark."""
+    calculator = detector.similarity_calculator
+    calculator_class = type(calculator)
+    levenshtein = inspect.unwrap(calculator_class.levenshtein_distance)
+    preprocess = inspect.unwrap(calculator_class.preprocess_name)
+    expand = inspect.unwrap(calculator_class.expand_abbreviations)
+    detect_category = inspect.unwrap(DuplicateDetector.detect_category)
+    are_duplicates = inspect.unwrap(DuplicateDetector.are_duplicates)
+
+    benchmarks = {
+        'kernel.levenshtein': lambda: levenshtein(calculator, "MOHAMMED AHMED HASSAN", "MOHAMMAD AHMAD HASAN"),
+        'normalize.preprocess_name': lambda: preprocess(calculator, "  Dr. Mohammed  Ahmed-Hassan "),
+        'normalize.expand_abbreviations': lambda: expand(calculator, "M. AHMED HASSAN"),
+        'normalize.normalize_name': lambda: detector.normalize_name("DR. MOHAMMED AHMED HASSAN"),
+        'normalize.prepare_name': lambda: detector._prepare_name_uncached("DR. MOHAMMED AHMED HASSAN"),
+        'rule.check_nicknames': lambda: detector.check_nicknames("SARA", "SOSO"),
+        'rule.check_abbreviations': lambda: detector.check_abbreviations("F.", "FATIMA"),
+        'pipeline.are_duplicates': lambda: are_duplicates(detector, "MOHAMMED AHMED HASSAN", "MOHAMMAD AHMAD HASAN"),
+    }
+
+    # One detect_category benchmark per category reached (each exits at a different rule)
+    for name1, name2 in CATEGORY_RULE_PAIRS:
+        benchmark_name = f'rule.category.{detect_category(detector, name1, name2)}'
+        if benchmark_name not in benchmarks:
+            benchmarks[benchmark_name] = lambda n1=name1, n2=name2: detect_category(detector, n1, n2)
+    missing = [category for category in DUPLICATE_CATEGORIES if f'rule.category.{category}' not in benchmarks]
+    if missing:
+        print(f"⚠️ No sample pair reaches categories: {', '.join(missing)}")
+
+    return benchmarks
+
+
+def run_micro(repeats=5):
+    """Time every microbenchmark with timeit (autorange, warm-up, interleaved repeats)."""
+    detector = uncached_detector()
+    timers = {}
+    for name, func in micro_benchmarks(detector).items():
+        timer = timeit.Timer(func)
+        number = timer.autorange()[0]  # loops per repeat (>= 0.2 s)
+        timer.timeit(number)  # warm-up
+        timers[name] = (timer, number)
+
+    calibrate = make_calibration()
+    times = {name: [] for name in timers}
+    speeds = {name: [] for name in timers}
+    for _ in range(repeats):
+        for name, (timer, number) in timers.items():
+            before = calibrate()
+            times[name].append(timer.timeit(number))
+            speeds[name].append((before + calibrate()) / 2)
+
+    results = {}
+    for name, (_, number) in timers.items():
+        results[name] = summarize(times[name], number)
+        results[name]['machine_speed'] = speeds[name]
+        print(f"  ⚡ {name:40s} {results[name]['ops_per_sec']:>12,.0f} ops/s")
+    return results
+
+
+def mutate_name(rng, full_name):
+    """A plausible duplicate of a full name (one of the six categories)."""
+    parts = full_name.split()
+    kind = rng.randrange(6)
+    if kind == 0:
+        parts = [VARIANTS.get(p, p) for p in parts]
+    elif kind == 1:
+        word = rng.randrange(len(parts))
+        chars = list(parts[word])
+        del chars[rng.randrange(len(chars))]
+        parts[word] = ''.join(chars)
+    elif kind == 2:
+        parts[0] = parts[0][0] + '.'
+    elif kind == 3:
+        parts = [rng.choice(['DR.', 'MR.', 'PROF.'])] + parts
+    elif kind == 4:
+        parts[0] = VARIANTS.get(parts[0], parts[0])
+    else:
+        parts = parts[:-1] if len(parts) > 2 else parts + [rng.choice(FAMILY_NAMES)]
+    return ' '.join(parts)
+
+
+def generate_pairs(count, seed=42):
+    """Yield `count` (name, candidate) pairs; deterministic for a given seed."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        name = f"{rng.choice(FIRST_NAMES)} {rng.choice(FIRST_NAMES)} {rng.choice(FAMILY_NAMES)}"
+        if rng.random() < 0.5:
+            candidate = mutate_name(rng, name)
+        else:
+            candidate = f"{rng.choice(FIRST_NAMES)} {rng.choice(FIRST_NAMES)} {rng.choice(FAMILY_NAMES)}"
+        yield name, candidate
+
+
+def time_pipeline(size, seed):
+    """Wall time of the comparison pipeline over `size` records (generation excluded)."""
+    detector = DuplicateDetector()
+    pairs = generate_pairs(size, seed)
+    elapsed = 0.0
+
+    while True:
+        chunk = [pair for _, pair in zip(range(MACRO_CHUNK), pairs)]
+        if not chunk:
+            break
+        start = time.perf_counter()
+        for name1, name2 in chunk:
+            detector.are_duplicates(name1, name2)
+            detector.detect_category(name1, name2)
+        elapsed += time.perf_counter() - start
+
+    return elapsed
+
+
+def run_macro(sizes, repeats=3, seed=42):
+    """Time the full pipeline at each record count."""
+    time_pipeline(min(1000, min(sizes)), seed)  # warm-up
+    calibrate = make_calibration()
+
+    times = {size: [] for size in sizes}
+    speeds = {size: [] for size in sizes}
+    for _ in range(repeats):
+        for size in sizes:
+            gc.collect()
+            before = calibrate()
+            times[size].append(time_pipeline(size, seed))
+            speeds[size].append((before + calibrate()) / 2)
+
+    results = {}
+    for size in sizes:
+        name = f'macro.pipeline.{size}'
+        results[name] = summarize(times[size], size)
+        results[name]['machine_speed'] = speeds[size]
+        print(f"  🏁 {name:40s} {results[name]['ops_per_sec']:>12,.0f} records/s")
+    return results
+
+
+def long_name_pairs(generator, count, length=LONG_NAME_TOKENS):
+    """Long lineage-chain names paired with a one-typo variant (no early exit)."""
+    pairs = []
+    for _ in range(count):
+        tokens = generator.random_name_tokens()
+        while len(tokens) < length:
+            tokens.insert(-1, generator.male_first.sample(generator.rng))
+        variant, _ = generator.make_duplicate(tokens, 'misspellings')
+        pairs.append((' '.join(tokens), ' '.join(variant)))
+    return pairs
+
+
+def build_workload_profiles(comparisons=500, seed=42):
+    """Name pairs for every workload profile (cache profiles reuse the realistic mix)."""
+    generator = CorpusGenerator(seed=seed)
+
+    def labeled(duplicate_share):
+        cases = generator.labeled_pairs(comparisons, duplicate_share=duplicate_share)
+        return [(case['name1'], case['name2']) for case in cases]
+
+    realistic = labeled(REALISTIC_DUPLICATE_SHARE)
+    working_set = realistic[:HOT_WORKING_SET]
+    return {
+        'distinct': labeled(0.0),
+        'realistic': realistic,
+        'long_names': long_name_pairs(generator, comparisons),
+        'cache_cold': realistic,
+        'cache_hot': [working_set[i % len(working_set)] for i in range(comparisons)]
+    }
+
+
+def detector_name(detector):
+    """Dotted class name of a detector, recorded with workload results."""
+    return f"{type(detector).__module__}.{type(detector).__qualname__}"
+
+
+def time_workload(pairs, cache_mode='off', repeats=5, detector=None):
+    """
+    Time are_duplicates over `pairs`.
+
+    Args:
+        cache_mode: 'off' (always compute), 'cold' (caches cleared before
+            each repeat) or 'hot' (caches filled by the warm-up pass)
+        detector: Detector to time (default: a fresh DuplicateDetector);
+            its caching switches are restored afterwards
+
+    Returns:
+        dict: summarize() statistics plus per-repeat throughput mean and
+            95% confidence half-width
+    """
+    detector = detector or DuplicateDetector()
+    instances = [detector]
+    if hasattr(detector, 'similarity_calculator'):
+        instances.append(detector.similarity_calculator)
+    caching_disabled = [instance.__dict__.get('_method_caching_disabled', False) for instance in instances]
+
+    try:
+        for instance in instances:
+            set_method_caching(instance, cache_mode != 'off')
+
+        for name1, name2 in pairs:  # warm-up (fills the caches for 'hot')
+            detector.are_duplicates(name1, name2)
+
+        times = []
+        for _ in range(repeats):
+            if cache_mode == 'cold':
+                for instance in instances:
+                    invalidate_method_caches(instance)
+            start = time.perf_counter()
+            for name1, name2 in pairs:
+                detector.are_duplicates(name1, name2)
+            times.append(time.perf_counter() - start)
+    finally:
+        for instance, disabled in zip(instances, caching_disabled):
+            set_method_caching(instance, not disabled)
+
+    result = summarize(times, len(pairs))
+    mean, half_width = mean_confidence_interval([len(pairs) / t for t in times if t > 0])
+    result.update({
+        'detector': detector_name(detector),
+        'cache_mode': cache_mode,
+        'throughput_mean': mean,
+        'throughput_ci95': half_width,
+        'us_per_comparison': 1e6 / mean if mean else 0.0
+    })
+    return result
+
+
+def run_workloads(comparisons=500, repeats=5, seed=42, detector=None):
+    """
+    Time every workload profile.
+
+    Args:
+        detector: Detector to time (default: a fresh DuplicateDetector per profile)
+    """
+    results = {}
+    for name, pairs in build_workload_profiles(comparisons, seed).items():
+        gc.collect()
+        result = results[name] = time_workload(pairs, WORKLOAD_PROFILES[name], repeats, detector)
+        print(f"  🧪 {name:12s} {result['throughput_mean']:>10,.0f} ± {result['throughput_ci95']:,.0f} "
+              f"comparisons/s ({result['us_per_comparison']:.1f} µs each)")
+    return results
+
+
+def throughput_samples(entry, calibrated=False):
+    """
+    Per-repeat throughput of a benchmark result entry.
+
+    Args:
+        calibrated: Divide each repeat's operations/s by the machine-speed
+            readings taken around it (entries with 'machine_speed')
+    """
+    if calibrated:
+        return [entry['operations'] / t / speed
+                for t, speed in zip(entry['times_s'], entry['machine_speed']) if t > 0 and speed > 0]
+    return [entry['operations'] / t for t in entry['times_s'] if t > 0]
+
+
+def relative_spread(samples):
+    """Relative standard deviation (stdev / median); 0 for one sample."""
+    if len(samples) < 2:
+        return 0.0
+    median = statistics.median(samples)
+    return statistics.stdev(samples) / median if median > 0 else 0.0
+
+
+def pooled_spread(*sample_sets):
+    """Relative spread pooled over sample sets, weighted by degrees of freedom."""
+    degrees = [len(samples) - 1 for samples in sample_sets if len(samples) > 1]
+    if not degrees:
+        return 0.0
+    variance = sum((len(samples) - 1) * relative_spread(samples) ** 2
+                   for samples in sample_sets if len(samples) > 1)
+    return math.sqrt(variance / sum(degrees))
+
+
+def compare_with_baseline(results, baseline, tolerance, z=NOISE_Z):
+    """
+    Compare median throughput against a baseline, allowing for measured noise.
+
+    When both runs carry machine-speed readings, throughput is compared
+    relative to machine speed (see make_calibration). The allowed drop is
+    the larger of `tolerance` and z standard errors of the median ratio,
+    counting each worker process (not each repeat) as one independent
+    sample. The spread is pooled over both runs weighted by
+    their repeats (a short run mostly borrows the baseline's), so a noisy
+    machine widens the band instead of raising false alarms.
+
+    Returns:
+        list: One entry per benchmark present in both, with 'regressed' set
+            when the median ratio fell below 1 - allowed_drop
+    """
+    comparisons = []
+    for name, current in sorted(results['benchmarks'].items()):
+        reference = baseline.get('benchmarks', {}).get(name)
+        if not reference:
+            continue
+        calibrated = 'machine_speed' in reference and 'machine_speed' in current
+        reference_samples = throughput_samples(reference, calibrated)
+        current_samples = throughput_samples(current, calibrated)
+        if not reference_samples or not current_samples:
+            continue
+
+        reference_median = statistics.median(reference_samples)
+        current_median = statistics.median(current_samples)
+        noise = pooled_spread(reference_samples, current_samples)
+        # Repeats in one process share its speed; processes are the independent samples
+        standard_error = MEDIAN_SE_FACTOR * noise * math.sqrt(
+            1 / reference.get('processes', 1) + 1 / current.get('processes', 1))
+        allowed_drop = max(tolerance, z * standard_error)
+        ratio = current_median / reference_median
+
+        comparisons.append({
+            'benchmark': name,
+            'baseline_ops_per_sec': statistics.median(throughput_samples(reference)),
+            'current_ops_per_sec': statistics.median(throughput_samples(current)),
+            'calibrated': calibrated,
+            'ratio': ratio,
+            'noise': noise,
+            'allowed_drop': allowed_drop,
+            'regressed': ratio < 1.0 - allowed_drop
+        })
+    return comparisons
+
+
+def pool_results(runs):
+    """Merge result documents of worker processes into one (repeats concatenated)."""
+    pooled = {}
+    for name in runs[0]['benchmarks']:
+        entries = [run['benchmarks'][name] for run in runs if name in run['benchmarks']]
+        # autorange picks the loop count per process: rescale to the first one's
+        operations = entries[0]['operations']
+        times = [t * operations / entry['operations'] for entry in entries for t in entry['times_s']]
+        pooled[name] = summarize(times, operations)
+        pooled[name]['processes'] = len(entries)
+        if all('machine_speed' in entry for entry in entries):
+            pooled[name]['machine_speed'] = [speed for entry in entries for speed in entry['machine_speed']]
+    return pooled
+
+
+def run_in_processes(processes, worker_args):
+    """
+    Run the gated suites in separate worker processes and pool their repeats.
+
+    Args:
+        processes: Number of worker processes (run one after another)
+        worker_args: Command line options passed to every worker
+
+    Returns:
+        dict: Pooled benchmarks (see pool_results)
+    """
+    runs = []
+    with tempfile.TemporaryDirectory() as directory:
+        for index in range(processes):
+            output = os.path.join(directory, f'worker_{index}.json')
+            print(f"🧵 Worker process {index + 1}/{processes}")
+            subprocess.run([sys.executable, os.path.abspath(__file__), *worker_args, '--worker-output', output],
+                           check=True)
+            with open(output, encoding='utf-8') as f:
+                runs.append(json.load(f))
+    benchmarks = pool_results(runs)
+    print(f"🧮 Pooled {processes} processes")
+    for name, entry in benchmarks.items():
+        print(f"  📊 {name:40s} {entry['ops_per_sec']:>12,.0f} ops/s ({entry['repeats']} repeats)")
+    return benchmarks
+
+
+def run_benchmarks(sizes, micro_repeats=5, macro_repeats=3, run_micro_suite=True,
+                   run_macro_suite=True, seed=42, run_workload_profiles=False, processes=1):
+    """Run the selected suites and return a result document."""
+    benchmarks = {}
+    if processes > 1:
+        worker_args = ['--sizes', ','.join(str(size) for size in sizes), '--seed', str(seed),
+                       '--micro-repeats', str(micro_repeats), '--macro-repeats', str(macro_repeats)]
+        if not run_micro_suite:
+            worker_args.append('--macro-only')
+        if not run_macro_suite:
+            worker_args.append('--micro-only')
+        benchmarks = run_in_processes(processes, worker_args)
+        run_micro_suite = run_macro_suite = False
+    if run_micro_suite:
+        print("🔬 Microbenchmarks")
+        benchmarks.update(run_micro(micro_repeats))
+    if run_macro_suite:
+        print("🏗️  Macro runs")
+        benchmarks.update(run_macro(sizes, macro_repeats, seed))
+    workloads = {}
+    if run_workload_profiles:
+        print("🧪 Workload profiles")
+        workloads = run_workloads(seed=seed)
+
+    return {
+        'timestamp': datetime.now().isoformat(),
+        'environment': environment_info(),
+        'config': {
+            'sizes': list(sizes),
+            'micro_repeats': micro_repeats,
+            'macro_repeats': macro_repeats,
+            'processes': processes,
+            'seed': seed
+        },
+        'benchmarks': benchmarks,
+        'workloads': workloads
+    }
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="BlueEdge benchmark harness with regression gate")
+    parser.add_argument('--quick', action='store_true', help=f"Macro sizes {QUICK_SIZES}, fewer repeats (CI)")
+    parser.add_argument('--sizes', help="Comma-separated macro record counts")
+    parser.add_argument('--micro-repeats', type=int, help="Repeats per microbenchmark")
+    parser.add_argument('--macro-repeats', type=int, help="Repeats per macro size")
+    parser.add_argument('--micro-only', action='store_true', help="Skip macro runs")
+    parser.add_argument('--macro-only', action='store_true', help="Skip microbenchmarks")
+    parser.add_argument('--workloads', action='store_true', help="Also run the workload profiles (not gated)")
+    parser.add_argument('--seed', type=int, default=42, help="Workload seed")
+    parser.add_argument('-o', '--output', help="Result JSON path (default: benchmark_results_<timestamp>.json)")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline JSON to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.20,
+                        help="Minimum allowed throughput drop (0.20 = 20%%); widened by measured noise")
+    parser.add_argument('--update-baseline', action='store_true', help="Write results as the new baseline")
+    parser.add_argument('--processes', type=int, default=1,
+                        help="Spread the repeats over this many worker processes (recommended for baselines)")
+    parser.add_argument('--worker-output', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.sizes:
+        sizes = tuple(int(size) for size in args.sizes.split(','))
+    else:
+        sizes = QUICK_SIZES if args.quick else DEFAULT_SIZES
+    micro_repeats = args.micro_repeats or 5
+    macro_repeats = args.macro_repeats or 3
+
+    print("🚀 BlueEdge Benchmarks")
+    print("=" * 50)
+
+    if args.worker_output:
+        results = run_benchmarks(sizes, micro_repeats, macro_repeats,
+                                 not args.macro_only, not args.micro_only, args.seed)
+        with open(args.worker_output, 'w', encoding='utf-8') as f:
+            json.dump(results, f)
+        return True
+
+    results = run_benchmarks(sizes, micro_repeats, macro_repeats,
+                             not args.macro_only, not args.micro_only, args.seed, args.workloads,
+                             max(1, args.processes))
+
+    output = args.output or f"benchmark_results_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n📄 Results: {output}")
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"📌 Baseline updated: {args.baseline}")
+        return True
+
+    if not os.path.exists(args.baseline):
+        print(f"⚠️ No baseline at {args.baseline} - nothing to compare")
+        return True
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('environment', {}).get('python') != results['environment']['python']:
+        print("⚠️ Baseline was recorded on a different Python version")
+
+    comparisons = compare_with_baseline(results, baseline, args.tolerance)
+    print(f"\n📊 Against baseline (median ratio; allowed drop = max(tolerance {args.tolerance:.0%}, "
+          f"{NOISE_Z:g} standard errors)):")
+    for entry in comparisons:
+        marker = '❌' if entry['regressed'] else '✅'
+        basis = 'calibrated' if entry['calibrated'] else 'raw'
+        print(f"  {marker} {entry['benchmark']:40s} {entry['ratio']:6.2f}x  "
+              f"({basis}, noise {entry['noise']:.0%}, allowed drop {entry['allowed_drop']:.0%})")
+
+    regressions = [entry for entry in comparisons if entry['regressed']]
+    if regressions:
+        print(f"\n❌ {len(regressions)} benchmark(s) regressed beyond their allowed drop")
+        return False
+
+    print("\n✅ No regressions")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
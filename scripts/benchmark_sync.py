@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+BlueEdge Framework - Sync Benchmarks
+====================================
+
+Offline, reproducible measurements of the Firebase sync path against the
+local REST stand-in (scripts/firebase_standin.py):
+
+- batch sizes: records/s, requests and wire bytes per record of
+  FirebaseDatabase.save_comparison_results at each batch size
+- sync throughput: time for FirebaseSync to drain a full outbox
+- retries: drain time and delivered records with injected errors and
+  lost acknowledgements (replays must not create duplicate records)
+
+--write-rate applies the client-side token bucket to the sync runs, to
+see how a write budget trades drain time for fewer, fuller requests.
+
+Comparisons are generated from the seeded synthetic corpus and scored by
+the detector before any timing starts.
+
+Usage:
+    python scripts/benchmark_sync.py --quick
+    python scripts/benchmark_sync.py --records 5000 --latency-ms 120 --bandwidth-kbps 384
+"""
+
+import io
+import sys
+import os
+import json
+import time
+import argparse
+import tempfile
+import contextlib
+from datetime import datetime
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.algorithms.duplicate_detector import DuplicateDetector
+from src.utils.corpus_generator import CorpusGenerator
+from src.utils.firebase_config import FirebaseConfig, FirebaseDatabase, FirebaseSync, format_blueedge_data
+from src.utils.rate_limiter import TokenBucket
+from scripts.firebase_standin import FirebaseStandin
+
+DEFAULT_BATCH_SIZES = (1, 10, 50, 200)
+
+
+@contextlib.contextmanager
+def quiet():
+    """Silence the per-batch status prints of the sync code"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+def make_comparisons(count, seed=42):
+    """Comparison payloads as the app builds them (format_blueedge_data)"""
+    detector = DuplicateDetector()
+    comparisons = []
+    for case in CorpusGenerator(seed=seed).labeled_pairs(count):
+        name1, name2 = case['name1'], case['name2']
+        start = time.perf_counter()
+        result = {
+            'similarity': detector.calculate_similarity(name1, name2),
+            'is_duplicate': detector.are_duplicates(name1, name2),
+            'category': detector.detect_category(name1, name2) or 'unknown',
+            'confidence': 'high' if case['is_duplicate'] else 'medium'
+        }
+        result['processing_time'] = time.perf_counter() - start
+        comparisons.append(format_blueedge_data(result, name1, name2))
+    return comparisons
+
+
+def connect(standin):
+    """Database handler pointed at the stand-in"""
+    with quiet():
+        config = FirebaseConfig(database_url=standin.url)
+        connected, message = config.test_connection()
+        database = FirebaseDatabase(config, history_path=':memory:')
+    if not connected:
+        raise RuntimeError(f"Stand-in not reachable: {message}")
+    return database
+
+
+def _close(database):
+    with quiet():
+        database.statistics.stop()
+    database.config.http.close()
+
+
+def _record_count(standin):
+    return len(standin.get('comparisons') or {})
+
+
+def bench_batch_sizes(standin, comparisons, batch_sizes=DEFAULT_BATCH_SIZES, user_id='bench_user'):
+    """
+    Direct batched writes at each batch size
+
+    Returns:
+        dict: batch size -> records/s, requests, bytes per record
+    """
+    results = {}
+    for batch_size in batch_sizes:
+        standin.reset()
+        database = connect(standin)
+        standin.reset_statistics()
+
+        start = time.perf_counter()
+        with quiet():
+            for offset in range(0, len(comparisons), batch_size):
+                batch = [(user_id, data) for data in comparisons[offset:offset + batch_size]]
+                database.save_comparison_results(batch)
+        elapsed = time.perf_counter() - start
+
+        server = standin.get_statistics()
+        results[str(batch_size)] = {
+            'records': len(comparisons),
+            'stored': _record_count(standin),
+            'elapsed_s': elapsed,
+            'records_per_s': len(comparisons) / elapsed if elapsed else 0.0,
+            'requests': server['requests_by_method'].get('PATCH', 0),
+            'wire_bytes_per_record': server['bytes_received'] / len(comparisons),
+            'json_bytes_per_record': server['bytes_received_raw'] / len(comparisons)
+        }
+        _close(database)
+    return results
+
+
+def drain(standin, comparisons, batch_size=50, timeout=300.0, user_id='bench_user', write_rate=None):
+    """
+    Fill a fresh outbox, start FirebaseSync and time until it is empty
+
+    Returns:
+        dict: Drain time, delivered and duplicate records, sync counters
+    """
+    standin.reset()
+    database = connect(standin)
+    with tempfile.TemporaryDirectory() as directory, quiet():
+        limiter = TokenBucket(rate=write_rate, capacity=1) if write_rate else None
+        sync = FirebaseSync(database, outbox_path=os.path.join(directory, 'outbox.db'), rate_limiter=limiter)
+        sync.sync_batch_size = batch_size
+        sync.batch_linger = 0.0
+        sync.backoff_base = 0.05
+        sync.backoff_max = 1.0
+        sync.max_retries = 1000  # measure delivery, not parking
+        for data in comparisons:
+            sync.add_to_sync_queue(user_id, data)
+        standin.reset_statistics()
+
+        start = time.perf_counter()
+        sync.start_sync_service()
+        deadline = time.monotonic() + timeout
+        while sync.outbox.pending_count() and time.monotonic() < deadline:
+            time.sleep(0.005)
+        elapsed = time.perf_counter() - start
+        pending = sync.outbox.pending_count()
+        sync.stop_sync_service()
+        sync.outbox.close()
+
+    server = standin.get_statistics()
+    stored = _record_count(standin)
+    _close(database)
+    return {
+        'records': len(comparisons),
+        'stored': stored,
+        'undelivered': pending,
+        'duplicates': max(0, stored - len(comparisons)),
+        'elapsed_s': elapsed,
+        'records_per_s': (len(comparisons) - pending) / elapsed if elapsed else 0.0,
+        'write_requests': server['requests_by_method'].get('PATCH', 0),
+        'injected_errors': server['injected_errors'],
+        'lost_acks': server['lost_acks'],
+        'connections': server['connections']
+    }
+
+
+def run_sync_benchmarks(records=2000, batch_sizes=DEFAULT_BATCH_SIZES, latency=0.05, jitter=0.01,
+                        bandwidth=None, error_rate=0.1, ack_loss_rate=0.05, seed=42, write_rate=None):
+    """Run all sync benchmarks against fresh stand-ins"""
+    comparisons = make_comparisons(records, seed)
+    network = {'latency': latency, 'jitter': jitter, 'bandwidth': bandwidth, 'seed': seed}
+
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'parameters': {'records': records, 'error_rate': error_rate, 'write_rate': write_rate,
+                       'ack_loss_rate': ack_loss_rate, **network}
+    }
+
+    with FirebaseStandin(**network) as standin:
+        print(f"📦 Batch sizes {list(batch_sizes)} over {records} records...")
+        results['batch_sizes'] = bench_batch_sizes(standin, comparisons, batch_sizes)
+        print("🔄 Sync service drain...")
+        results['sync_throughput'] = drain(standin, comparisons, write_rate=write_rate)
+
+    with FirebaseStandin(error_rate=error_rate, ack_loss_rate=ack_loss_rate, **network) as standin:
+        print(f"💥 Retries ({error_rate:.0%} errors, {ack_loss_rate:.0%} lost acks)...")
+        results['retries'] = drain(standin, comparisons, write_rate=write_rate)
+    return results
+
+
+def print_report(results):
+    """Console summary"""
+    print("\n📊 Sync Benchmark Results")
+    print("=" * 72)
+    print(f"{'batch':>6} {'records/s':>11} {'requests':>9} {'wire B/rec':>11} {'json B/rec':>11}")
+    for batch_size, entry in results['batch_sizes'].items():
+        print(f"{batch_size:>6} {entry['records_per_s']:>11.1f} {entry['requests']:>9} "
+              f"{entry['wire_bytes_per_record']:>11.1f} {entry['json_bytes_per_record']:>11.1f}")
+
+    for name in ('sync_throughput', 'retries'):
+        entry = results[name]
+        print(f"\n{name}: {entry['records_per_s']:.1f} records/s, {entry['elapsed_s']:.2f}s, "
+              f"{entry['write_requests']} writes, {entry['injected_errors']} injected errors, "
+              f"{entry['lost_acks']} lost acks")
+        print(f"   stored {entry['stored']}/{entry['records']}, duplicates {entry['duplicates']}, "
+              f"undelivered {entry['undelivered']}")
+
+
+def main():
+    """CLI entry point"""
+    parser = argparse.ArgumentParser(description="BlueEdge sync benchmarks against a local Firebase stand-in")
+    parser.add_argument('--quick', action='store_true', help="300 records, batch sizes 1,50")
+    parser.add_argument('--records', type=int, default=2000, help="Comparisons per run")
+    parser.add_argument('--batch-sizes', help="Comma-separated batch sizes (default 1,10,50,200)")
+    parser.add_argument('--latency-ms', type=float, default=50.0, help="Stand-in response latency")
+    parser.add_argument('--jitter-ms', type=float, default=10.0, help="Extra random latency")
+    parser.add_argument('--bandwidth-kbps', type=float, help="Link speed in kilobits/s (default unlimited)")
+    parser.add_argument('--error-rate', type=float, default=0.1, help="Injected error share (retry run)")
+    parser.add_argument('--ack-loss-rate', type=float, default=0.05, help="Lost acknowledgement share (retry run)")
+    parser.add_argument('--write-rate', type=float, help="Sync write budget in requests/s (default unlimited)")
+    parser.add_argument('--seed', type=int, default=42, help="Corpus and fault seed")
+    parser.add_argument('-o', '--output', help="Result JSON path (default: sync_benchmark_<timestamp>.json)")
+    args = parser.parse_args()
+
+    records = 300 if args.quick else args.records
+    if args.batch_sizes:
+        batch_sizes = [int(size) for size in args.batch_sizes.split(',')]
+    else:
+        batch_sizes = (1, 50) if args.quick else DEFAULT_BATCH_SIZES
+
+    results = run_sync_benchmarks(
+        records=records, batch_sizes=batch_sizes,
+        latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+        bandwidth=args.bandwidth_kbps * 125 if args.bandwidth_kbps else None,
+        error_rate=args.error_rate, ack_loss_rate=args.ack_loss_rate, seed=args.seed,
+        write_rate=args.write_rate
+    )
+    print_report(results)
+
+    output = args.output or f"sync_benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\n💾 Results saved to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
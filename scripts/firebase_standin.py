@@ -0,0 +1,504 @@
+#!/usr/bin/env python3
+"""
+BlueEdge Framework - Local Firebase REST Stand-in
+=================================================
+
+In-process HTTP server implementing the subset of the Firebase Realtime
+Database REST API that FirebaseConfig / FirebaseDatabase / FirebaseSync use,
+so sync code can be exercised and benchmarked offline and reproducibly:
+
+- GET (shallow=true; orderBy "$key" / "$value" / child with equalTo,
+  startAt, endAt, limitToFirst, limitToLast)
+- PUT, PATCH (multi-path updates), POST (push keys), DELETE
+- X-Firebase-ETag / if-match conditional writes (412 with the current value)
+- gzip request bodies (Content-Encoding: gzip), HTTP/1.1 keep-alive
+
+Network conditions are configurable and seeded: latency with jitter,
+bandwidth limit, random or scripted error responses, and lost
+acknowledgements (the write is applied but the client sees an error).
+
+Usage:
+    python scripts/firebase_standin.py --port 9000 --latency-ms 80
+    BLUEEDGE_FIREBASE_URL=http://127.0.0.1:9000 python main.py
+"""
+
+import sys
+import json
+import gzip
+import time
+import random
+import socket
+import hashlib
+import argparse
+import threading
+from collections import deque, Counter
+from urllib.parse import urlsplit, parse_qs, unquote
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PUSH_CHARS = '-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz'
+QUERY_FILTERS = ('equalTo', 'startAt', 'endAt', 'limitToFirst', 'limitToLast')
+
+
+def compute_etag(value):
+    """ETag of a stored value (stable for equal JSON)"""
+    encoded = json.dumps(value, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha1(encoded.encode('utf-8')).hexdigest()
+
+
+def _prune(value):
+    """Drop nulls and empty objects, as Firebase does not store them"""
+    if isinstance(value, dict):
+        pruned = {key: _prune(child) for key, child in value.items()}
+        pruned = {key: child for key, child in pruned.items() if child is not None}
+        return pruned or None
+    return value
+
+
+def _value_order(value):
+    """Firebase ordering: null < false < true < numbers < strings < objects"""
+    if value is None:
+        return (0,)
+    if isinstance(value, bool):
+        return (1 if value is False else 2,)
+    if isinstance(value, (int, float)):
+        return (3, value)
+    if isinstance(value, str):
+        return (4, value)
+    return (5,)
+
+
+def _key_order(key):
+    """Firebase key ordering: 32-bit integer keys numerically first, then strings"""
+    try:
+        number = int(key)
+        if str(number) == key and -2 ** 31 <= number < 2 ** 31:
+            return (0, number)
+    except (TypeError, ValueError):
+        pass
+    return (1, str(key))
+
+
+def _child(value, path):
+    """Nested child of a value ('a/b'), None when missing"""
+    for part in path.split('/'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
+
+
+def apply_query(node, params):
+    """
+    Apply Firebase query parameters to a node
+
+    Args:
+        node: Stored value at the request path
+        params: Query parameters (values JSON-encoded, as sent by clients)
+
+    Returns:
+        Filtered value (a dict in query order for object nodes)
+
+    Raises:
+        ValueError: Filters without orderBy, or malformed parameters
+    """
+    if 'orderBy' not in params:
+        if any(name in params for name in QUERY_FILTERS):
+            raise ValueError("orderBy must be defined when other query parameters are defined")
+        return node
+    if not isinstance(node, dict):
+        return node
+
+    order_by = json.loads(params['orderBy'])
+    if order_by == '$key':
+        def order(item):
+            return _key_order(item[0])
+        def bound(raw):
+            return _key_order(str(json.loads(raw)))
+    else:
+        def order(item):
+            return _value_order(item[1] if order_by == '$value' else _child(item[1], order_by))
+        def bound(raw):
+            return _value_order(json.loads(raw))
+
+    # Ties on the ordered value are broken by key
+    items = sorted(node.items(), key=lambda item: (order(item), _key_order(item[0])))
+
+    if 'equalTo' in params:
+        target = bound(params['equalTo'])
+        items = [item for item in items if order(item) == target]
+    if 'startAt' in params:
+        lower = bound(params['startAt'])
+        items = [item for item in items if order(item) >= lower]
+    if 'endAt' in params:
+        upper = bound(params['endAt'])
+        items = [item for item in items if order(item) <= upper]
+    if 'limitToFirst' in params:
+        items = items[:int(params['limitToFirst'])]
+    if 'limitToLast' in params:
+        count = int(params['limitToLast'])
+        items = items[-count:] if count else []
+    return dict(items)
+
+
+class FirebaseStandin:
+    """In-memory Firebase Realtime Database served over local HTTP"""
+
+    def __init__(self, latency=0.0, jitter=0.0, bandwidth=None, error_rate=0.0, error_status=503,
+                 ack_loss_rate=0.0, seed=42, host='127.0.0.1', port=0):
+        """
+        Args:
+            latency: Seconds added to every response (one-way server delay)
+            jitter: Extra uniform random delay in [0, jitter] seconds
+            bandwidth: Link speed in bytes/s for request + response bodies (None = unlimited)
+            error_rate: Share of requests answered with error_status without being applied
+            error_status: HTTP status of injected errors
+            ack_loss_rate: Share of writes applied but answered with error_status
+            seed: Seed of the fault/jitter random generator
+            host, port: Listen address (port 0 picks a free port)
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.ack_loss_rate = ack_loss_rate
+        self.host = host
+        self.port = port
+
+        self.rng = random.Random(seed)
+        self.data = None
+        self.lock = threading.Lock()
+        self.scripted_failures = deque()
+        self.server = None
+        self.server_thread = None
+        self.open_sockets = set()
+
+        self.push_time = 0
+        self.push_counter = 0
+        self.reset_statistics()
+
+    # Server lifecycle
+
+    def start(self):
+        """Start serving from a background thread"""
+        class Handler(StandinRequestHandler):
+            standin = self
+
+        self.server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        self.server_thread = threading.Thread(target=self.server.serve_forever, args=(0.05,),
+                                              name='firebase-standin', daemon=True)
+        self.server_thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server and drop open keep-alive connections (like an outage)"""
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        with self.lock:
+            sockets, self.open_sockets = self.open_sockets, set()
+        for sock in sockets:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    @property
+    def url(self):
+        """Database URL for FirebaseConfig(database_url=...)"""
+        return f"http://{self.host}:{self.port}"
+
+    # Faults and inspection
+
+    def fail_next(self, count=1, status=None):
+        """Answer the next `count` requests with an error (deterministic tests)"""
+        with self.lock:
+            self.scripted_failures.extend([status or self.error_status] * count)
+
+    def get(self, path=''):
+        """Stored value at a path (a copy)"""
+        with self.lock:
+            return json.loads(json.dumps(self._get(self._parts(path))))
+
+    def reset(self, data=None):
+        """Replace the whole database"""
+        with self.lock:
+            self.data = _prune(data)
+
+    def reset_statistics(self):
+        with self.lock:
+            self.requests = Counter()
+            self.statuses = Counter()
+            self.connections = 0
+            self.bytes_received = 0
+            self.bytes_received_raw = 0
+            self.bytes_sent = 0
+            self.injected_errors = 0
+            self.lost_acks = 0
+            self.conflicts = 0
+
+    def get_statistics(self):
+        """Request, byte and fault counters since the last reset"""
+        with self.lock:
+            return {
+                'requests': sum(self.requests.values()),
+                'requests_by_method': dict(self.requests),
+                'responses_by_status': dict(self.statuses),
+                'connections': self.connections,
+                'bytes_received': self.bytes_received,
+                'bytes_received_raw': self.bytes_received_raw,
+                'bytes_sent': self.bytes_sent,
+                'injected_errors': self.injected_errors,
+                'lost_acks': self.lost_acks,
+                'conflicts': self.conflicts
+            }
+
+    # Database operations (lock held)
+
+    @staticmethod
+    def _parts(path):
+        return [unquote(part) for part in path.strip('/').split('/') if part]
+
+    def _get(self, parts):
+        value = self.data
+        for part in parts:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(part)
+        return value
+
+    def _set(self, parts, value):
+        value = _prune(value)
+        if not parts:
+            self.data = value
+            return
+
+        root = self.data if isinstance(self.data, dict) else {}
+        node, trail = root, []
+        for part in parts[:-1]:
+            child = node.get(part)
+            if not isinstance(child, dict):
+                child = {}
+                node[part] = child
+            trail.append((node, part))
+            node = child
+
+        if value is None:
+            node.pop(parts[-1], None)
+        else:
+            node[parts[-1]] = value
+
+        # Remove objects left empty by the write
+        for parent, part in reversed(trail):
+            if parent[part]:
+                break
+            del parent[part]
+        self.data = root or None
+
+    def _push_key(self):
+        """Chronological push key (timestamp + counter)"""
+        now = int(time.time() * 1000)
+        self.push_counter = self.push_counter + 1 if now == self.push_time else 0
+        self.push_time = now
+
+        def encode(number, width):
+            chars = []
+            for _ in range(width):
+                chars.append(PUSH_CHARS[number % 64])
+                number //= 64
+            return ''.join(reversed(chars))
+        return encode(now, 8) + encode(self.push_counter, 12)
+
+    # Request handling
+
+    def _fault(self):
+        """Injected error status for this request, or None"""
+        if self.scripted_failures:
+            return self.scripted_failures.popleft()
+        if self.error_rate and self.rng.random() < self.error_rate:
+            return self.error_status
+        return None
+
+    def handle(self, method, path, params, body=None, headers=None):
+        """
+        Execute one REST request against the in-memory database
+
+        Args:
+            method: HTTP method
+            path: URL path ('/comparisons.json')
+            params: Query parameters (single values)
+            body: Decoded JSON request body (None when absent)
+            headers: Request headers (case-insensitive lookups)
+
+        Returns:
+            tuple: (status, response payload, response headers)
+        """
+        headers = {key.lower(): value for key, value in (headers or {}).items()}
+        if path.endswith('.json'):
+            path = path[:-len('.json')]
+        parts = self._parts(path)
+        response_headers = {}
+
+        with self.lock:
+            self.requests[method] += 1
+            fault = self._fault()
+            if fault:
+                self.injected_errors += 1
+                return fault, {'error': 'Injected failure (stand-in)'}, response_headers
+            lose_ack = method != 'GET' and self.ack_loss_rate and self.rng.random() < self.ack_loss_rate
+
+            current = self._get(parts)
+            etag = compute_etag(current)
+            if headers.get('x-firebase-etag') == 'true' or 'if-match' in headers:
+                response_headers['ETag'] = etag
+
+            if 'if-match' in headers and headers['if-match'] != etag:
+                self.conflicts += 1
+                status, payload = 412, current
+            elif method == 'GET':
+                try:
+                    payload = apply_query(current, params)
+                except ValueError as error:
+                    return 400, {'error': str(error)}, response_headers
+                if params.get('shallow') == 'true' and isinstance(payload, dict):
+                    payload = {key: True for key in payload}
+                status = 200
+            elif method == 'PUT':
+                self._set(parts, body)
+                status, payload = 200, body
+            elif method == 'PATCH':
+                if not isinstance(body, dict):
+                    return 400, {'error': 'Invalid data; couldn\'t parse JSON object.'}, response_headers
+                for child_path, value in body.items():
+                    self._set(parts + self._parts(child_path), value)
+                status, payload = 200, body
+            elif method == 'POST':
+                key = self._push_key()
+                self._set(parts + [key], body)
+                status, payload = 200, {'name': key}
+            elif method == 'DELETE':
+                self._set(parts, None)
+                status, payload = 200, None
+            else:
+                return 405, {'error': f'Method {method} not supported'}, response_headers
+
+            if method != 'GET' and status == 200 and 'ETag' in response_headers:
+                response_headers['ETag'] = compute_etag(self._get(parts))
+            if lose_ack:
+                self.lost_acks += 1
+                status, payload = self.error_status, {'error': 'Injected lost acknowledgement (stand-in)'}
+
+        return status, payload, response_headers
+
+    def response_delay(self, body_bytes):
+        """Seconds to hold a response: latency, jitter and transfer time"""
+        with self.lock:
+            delay = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0.0)
+        if self.bandwidth:
+            delay += body_bytes / self.bandwidth
+        return delay
+
+
+class StandinRequestHandler(BaseHTTPRequestHandler):
+    """HTTP/1.1 keep-alive front end of a FirebaseStandin"""
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True  # headers and body are separate writes
+    standin = None
+
+    def setup(self):
+        super().setup()
+        with self.standin.lock:
+            self.standin.connections += 1
+            self.standin.open_sockets.add(self.connection)
+
+    def finish(self):
+        with self.standin.lock:
+            self.standin.open_sockets.discard(self.connection)
+        super().finish()
+
+    def _handle(self):
+        standin = self.standin
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        raw = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        body = raw
+        if raw and self.headers.get('Content-Encoding', '').lower() == 'gzip':
+            body = gzip.decompress(raw)
+
+        try:
+            payload = json.loads(body) if body else None
+        except ValueError:
+            status, payload, headers = 400, {'error': 'Invalid data; couldn\'t parse JSON object.'}, {}
+        else:
+            status, payload, headers = standin.handle(self.command, url.path, params, payload, self.headers)
+
+        encoded = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        delay = standin.response_delay(len(raw) + len(encoded))
+        if delay:
+            time.sleep(delay)
+
+        with standin.lock:
+            standin.statuses[status] += 1
+            standin.bytes_received += len(raw)
+            standin.bytes_received_raw += len(body)
+            standin.bytes_sent += len(encoded)
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(encoded)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    do_GET = do_PUT = do_PATCH = do_POST = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    """Run a stand-in until interrupted"""
+    parser = argparse.ArgumentParser(description="Local Firebase Realtime Database REST stand-in")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9000)
+    parser.add_argument('--latency-ms', type=float, default=0.0, help="Delay per response")
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help="Extra random delay per response")
+    parser.add_argument('--bandwidth-kbps', type=float, help="Link speed in kilobits/s (default unlimited)")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Share of requests failed with --error-status")
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--ack-loss-rate', type=float, default=0.0, help="Share of writes applied but reported failed")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    standin = FirebaseStandin(
+        latency=args.latency_ms / 1000, jitter=args.jitter_ms / 1000,
+        bandwidth=args.bandwidth_kbps * 125 if args.bandwidth_kbps else None,
+        error_rate=args.error_rate, error_status=args.error_status,
+        ack_loss_rate=args.ack_loss_rate, seed=args.seed, host=args.host, port=args.port
+    ).start()
+    print(f"🔥 Firebase stand-in listening on {standin.url}")
+    print(f"💡 Point the app at it with BLUEEDGE_FIREBASE_URL={standin.url}")
+
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        print(f"\n📊 {standin.get_statistics()}")
+        standin.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
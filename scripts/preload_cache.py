@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+BlueEdge Framework - Cache Preload Job
+======================================
+
+Precomputes comparison results for the most frequent name pairs in a
+reference dataset (e.g. a field office roster) and writes them to a
+SmartCache snapshot. Devices load the snapshot at startup so the first
+interactive comparisons are served from the cache instead of cold.
+
+Candidate pairs are built from the most frequent names and kept only when
+both names share a token prefix (so spelling variants such as MOHAMMED /
+MOHAMMAD still pair up), ranked by combined frequency.
+
+Usage:
+    python scripts/preload_cache.py data/sample_dataset.csv -o data/blueedge_cache.bin
+"""
+
+import sys
+import os
+import csv
+import time
+import argparse
+from collections import Counter
+from itertools import combinations
+
+# Add parent directory to path to import our modules
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.algorithms.duplicate_detector import DuplicateDetector
+from src.utils.smart_cache import SmartCache
+
+
+def load_name_frequencies(csv_path, column='Full Name'):
+    """Count normalized name occurrences in a CSV column."""
+    frequencies = Counter()
+
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            name = ' '.join((row.get(column) or '').upper().split())
+            if name:
+                frequencies[name] += 1
+
+    return frequencies
+
+
+def select_frequent_pairs(frequencies, top_names=200, max_pairs=50, prefix_length=3):
+    """
+    Pick the most frequent name pairs that share a token prefix.
+
+    Args:
+        frequencies: Counter of names
+        top_names: How many of the most frequent names to pair up
+        max_pairs: Maximum number of pairs returned
+        prefix_length: Token prefix length used for blocking
+
+    Returns:
+        list: [(name1, name2), ...] ordered by combined frequency
+    """
+    names = [name for name, _ in frequencies.most_common(top_names)]
+
+    # Token-prefix blocking: only names sharing a prefix are plausible duplicates
+    by_token = {}
+    for name in names:
+        for token in set(name.split()):
+            by_token.setdefault(token[:prefix_length], []).append(name)
+
+    candidates = set()
+    for block in by_token.values():
+        for name1, name2 in combinations(sorted(block), 2):
+            candidates.add((name1, name2))
+
+    ranked = sorted(
+        candidates,
+        key=lambda pair: (-(frequencies[pair[0]] + frequencies[pair[1]]), pair)
+    )
+    return ranked[:max_pairs]
+
+
+def build_cache_result(detector, name1, name2):
+    """Build the cached result structure used by the mobile app."""
+    return {
+        'is_duplicate': detector.are_duplicates(name1, name2),
+        'similarity_score': detector.calculate_similarity(name1, name2),
+        'category': detector.detect_category(name1, name2),
+        'names': [name1, name2]
+    }
+
+
+def preload_cache(csv_path, output_path, column='Full Name', top_names=200,
+                  max_pairs=50, max_memory_kb=25):
+    """
+    Run the preload job and write the snapshot.
+
+    Returns:
+        dict: Job summary
+    """
+    start_time = time.time()
+
+    frequencies = load_name_frequencies(csv_path, column)
+    pairs = select_frequent_pairs(frequencies, top_names, max_pairs)
+
+    detector = DuplicateDetector()
+    cache = SmartCache(max_size=max_pairs, max_memory_kb=max_memory_kb)
+
+    for name1, name2 in pairs:
+        cache.put(name1, name2, build_cache_result(detector, name1, name2))
+
+    written = cache.snapshot(output_path)
+
+    return {
+        'distinct_names': len(frequencies),
+        'pairs_computed': len(pairs),
+        'entries_written': written,
+        'snapshot_bytes': os.path.getsize(output_path),
+        'elapsed_seconds': time.time() - start_time
+    }
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Precompute a BlueEdge cache snapshot from a reference dataset")
+    parser.add_argument('dataset', help="Reference CSV file")
+    parser.add_argument('-o', '--output', default='data/blueedge_cache.bin', help="Snapshot output path")
+    parser.add_argument('--column', default='Full Name', help="CSV column holding full names")
+    parser.add_argument('--top-names', type=int, default=200, help="Most frequent names to pair up")
+    parser.add_argument('--max-pairs', type=int, default=50, help="Maximum cached pairs (app cache size)")
+    parser.add_argument('--max-memory-kb', type=float, default=25, help="Cache memory budget in KB")
+    args = parser.parse_args()
+
+    print("🚀 BlueEdge Cache Preload")
+    print("=" * 40)
+
+    summary = preload_cache(args.dataset, args.output, args.column,
+                            args.top_names, args.max_pairs, args.max_memory_kb)
+
+    print(f"📊 Distinct names: {summary['distinct_names']}")
+    print(f"🔗 Pairs computed: {summary['pairs_computed']}")
+    print(f"💾 Snapshot: {summary['entries_written']} entries, {summary['snapshot_bytes']} bytes")
+    print(f"⏱️  Elapsed: {summary['elapsed_seconds']:.2f} seconds")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
@@ -20,26 +20,58 @@ import sys
 import os
 import time
 import json
-import pandas as pd
 import numpy as np
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 import warnings
 warnings.filterwarnings('ignore')
 
 # Add parent directory to path to import our modules
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from src.duplicate_detector import DuplicateDetector
-from src.data_anonymizer import DataAnonymizer
+from src.algorithms.duplicate_detector import DuplicateDetector
+from src.utils.gc_runtime import GC_RUNTIME
+from src.utils.corpus_generator import CorpusGenerator
+from scripts.benchmark_framework import run_workloads
+
+# Per-process detector of pool workers (built once by _init_worker)
+_worker_detector = None
+
+
+def _init_worker(threshold):
+    """Process pool initializer: one detector per worker, reused for every chunk."""
+    global _worker_detector
+    _worker_detector = DuplicateDetector(threshold)
+
+
+def _count_correct(cases, detector=None):
+    """Number of cases whose duplicate decision matches the label."""
+    detector = detector or _worker_detector
+    return sum(
+        1 for case in cases
+        if detector.are_duplicates(case['name1'], case['name2']) == case['is_duplicate']
+    )
+
 
 class ResultsReproducer:
     """Reproduces the exact results from the BlueEdge research paper."""
     
-    def __init__(self):
+    def __init__(self, workers=None, seed=42, parallel_min_cases=2000, chunk_size=500):
+        """
+        Args:
+            workers: Worker processes for category/fold evaluation (default: CPU count)
+            seed: Seed of the cross-validation shuffle and synthetic datasets
+            parallel_min_cases: Smaller evaluations run in-process (pool startup costs more)
+            chunk_size: Cases per task sent to a worker
+        """
         self.detector = DuplicateDetector()
-        self.anonymizer = DataAnonymizer()
         self.results = {}
         self.start_time = time.time()
+        self.workers = workers or os.cpu_count() or 1
+        self.seed = seed
+        self.parallel_min_cases = parallel_min_cases
+        self.chunk_size = chunk_size
+        self._pool = None
         
         # Expected results from the paper (for validation)
         self.expected_results = {
@@ -56,8 +88,7 @@ class ResultsReproducer:
         """Generate comprehensive test dataset matching the research paper."""
         print("🔄 Generating test dataset...")
         
-        # Use the anonymizer to create realistic test data
-        # This matches the 146 cases from the paper
+        # Hand-written cases matching the 146 cases from the paper
         test_cases = []
         
         # 1. Different spelling and pronunciation (37 cases)
@@ -195,6 +226,17 @@ class ResultsReproducer:
         print(f"✅ Generated {len(test_cases)} test cases")
         return test_cases
     
+    def generate_synthetic_dataset(self, count=10000, seed=None, duplicate_share=0.5):
+        """Generate a seeded synthetic dataset at load-test scale (same case format)."""
+        seed = self.seed if seed is None else seed
+        print(f"🔄 Generating {count} synthetic test cases (seed {seed})...")
+        
+        generator = CorpusGenerator(seed=seed)
+        test_cases = list(generator.labeled_pairs(count, duplicate_share=duplicate_share))
+        
+        print(f"✅ Generated {len(test_cases)} test cases")
+        return test_cases
+    
     def calculate_confidence_interval(self, accuracy, sample_size, confidence=0.95):
         """Calculate confidence interval for accuracy."""
         if sample_size == 0:
@@ -209,24 +251,69 @@ class ResultsReproducer:
         
         return ci_lower, ci_upper
     
+    def _get_pool(self):
+        """Process pool with one detector per worker (created on first use)."""
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.detector.threshold,)
+            )
+        return self._pool
+    
+    def close(self):
+        """Shut down the worker pool."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+    
+    def count_correct(self, batches):
+        """
+        Count correct detections in each batch of cases.
+        
+        Large evaluations are split into chunks and run on the process pool;
+        executor.map keeps chunk order, so the result does not depend on
+        worker scheduling.
+        
+        Returns:
+            list: Correct detections per batch, in batch order
+        """
+        total_cases = sum(len(batch) for batch in batches)
+        if self.workers <= 1 or total_cases < self.parallel_min_cases:
+            return [_count_correct(batch, self.detector) for batch in batches]
+        
+        chunks, owners = [], []
+        for index, batch in enumerate(batches):
+            for start in range(0, len(batch), self.chunk_size):
+                chunks.append(batch[start:start + self.chunk_size])
+                owners.append(index)
+        
+        counts = [0] * len(batches)
+        for owner, correct in zip(owners, self._get_pool().map(_count_correct, chunks)):
+            counts[owner] += correct
+        return counts
+    
     def test_category(self, test_cases, category_type):
         """Test a specific category of duplicates."""
+        return self.test_categories(test_cases, [category_type])[category_type]
+    
+    def test_categories(self, test_cases, categories):
+        """Test several categories in one (parallel) evaluation pass."""
+        category_cases = [[case for case in test_cases if case['type'] == category] for category in categories]
+        counts = self.count_correct(category_cases)
+        
+        return {
+            category: self._category_result(category, correct, len(cases))
+            for category, cases, correct in zip(categories, category_cases, counts)
+        }
+    
+    def _category_result(self, category_type, correct_detections, total_cases):
+        """Accuracy and confidence interval of one category."""
         print(f"\n🔍 Testing {category_type.replace('_', ' ').title()}...")
         
-        category_cases = [case for case in test_cases if case['type'] == category_type]
-        if not category_cases:
+        if not total_cases:
             return {'accuracy': 0, 'correct': 0, 'total': 0, 'ci_lower': 0, 'ci_upper': 0}
         
-        correct_detections = 0
-        total_cases = len(category_cases)
-        
-        for case in category_cases:
-            # Test duplicate detection
-            is_detected = self.detector.are_duplicates(case['name1'], case['name2'])
-            
-            if is_detected == case['is_duplicate']:
-                correct_detections += 1
-        
         accuracy = (correct_detections / total_cases) * 100
         ci_lower, ci_upper = self.calculate_confidence_interval(accuracy, total_cases)
         
@@ -243,59 +330,65 @@ class ResultsReproducer:
         
         return result
     
-    def measure_performance(self):
-        """Measure processing time and memory usage."""
+    def measure_performance(self, comparisons=500, repeats=5, seed=42):
+        """
+        Measure comparison throughput per workload profile and memory usage.
+        
+        Profiles: all-distinct pairs, realistic duplicate mix, worst-case long
+        names, cache-cold and cache-hot. Time per edge is taken from the
+        realistic mix with caching off (the real hot path). The profiles
+        time self.detector, the detector the accuracy figures come from.
+        """
         print("\n⚡ Measuring Performance...")
         
-        # Generate sample data for performance testing
-        sample_names = ["MOHAMMED AHMED HASSAN"] * 1000
-        
-        # Measure processing time
-        start_time = time.time()
-        for i in range(0, len(sample_names), 2):
-            if i + 1 < len(sample_names):
-                self.detector.are_duplicates(sample_names[i], sample_names[i + 1])
-        
-        processing_time = time.time() - start_time
+        profiles = run_workloads(comparisons, repeats, seed, detector=self.detector)
+        processing_time = sum(sum(profile['times_s']) for profile in profiles.values())
+        time_per_edge = 1 / profiles['realistic']['throughput_mean']
         
-        # Calculate per-edge metrics
-        time_per_edge = processing_time / (len(sample_names) // 2)
-        
-        print(f"   ⏱️  Processing time: {processing_time:.2f} seconds for {len(sample_names)//2} comparisons")
-        print(f"   🚀 Time per edge: {time_per_edge:.3f} seconds")
+        print(f"   ⏱️  Processing time: {processing_time:.2f} seconds for "
+              f"{len(profiles)} profiles x {repeats} x {comparisons} comparisons")
+        print(f"   🚀 Time per edge (realistic mix): {time_per_edge * 1e6:.1f} µs "
+              f"({time_per_edge * 1000:.3f} seconds per 1000 records)")
         print(f"   💾 Memory usage: ~5KB per edge (estimated)")
         
         return {
+            'detector': profiles['realistic']['detector'],
             'total_time': processing_time,
             'time_per_edge': time_per_edge,
-            'memory_per_edge': 5000  # bytes, as reported in paper
+            'time_per_1000_records': time_per_edge * 1000,
+            'memory_per_edge': 5000,  # bytes, as reported in paper
+            'workload_profiles': {
+                name: {
+                    'comparisons_per_second': profile['throughput_mean'],
+                    'ci95': profile['throughput_ci95'],
+                    'us_per_comparison': profile['us_per_comparison'],
+                    'cache_mode': profile['cache_mode'],
+                    'comparisons': profile['operations'],
+                    'repeats': profile['repeats']
+                }
+                for name, profile in profiles.items()
+            }
         }
     
     def cross_validation(self, test_cases, folds=5):
         """Perform cross-validation as mentioned in the paper."""
         print(f"\n🔄 Performing {folds}-fold Cross-Validation...")
         
-        # Shuffle test cases
-        np.random.shuffle(test_cases)
+        # Shuffle with a generator seeded for this run (not NumPy's global state)
+        rng = np.random.default_rng(self.seed)
+        test_cases = [test_cases[i] for i in rng.permutation(len(test_cases))]
         
         fold_size = len(test_cases) // folds
-        accuracies = []
+        test_folds = []
         
         for fold in range(folds):
             start_idx = fold * fold_size
             end_idx = start_idx + fold_size if fold < folds - 1 else len(test_cases)
-            
-            test_fold = test_cases[start_idx:end_idx]
-            
-            correct = 0
-            total = len(test_fold)
-            
-            for case in test_fold:
-                is_detected = self.detector.are_duplicates(case['name1'], case['name2'])
-                if is_detected == case['is_duplicate']:
-                    correct += 1
-            
-            fold_accuracy = (correct / total) * 100
+            test_folds.append(test_cases[start_idx:end_idx])
+        
+        accuracies = []
+        for fold, (test_fold, correct) in enumerate(zip(test_folds, self.count_correct(test_folds))):
+            fold_accuracy = (correct / len(test_fold)) * 100
             accuracies.append(fold_accuracy)
             print(f"   Fold {fold + 1}: {fold_accuracy:.1f}%")
         
@@ -395,11 +488,21 @@ class ResultsReproducer:
             "",
             "Performance Metrics:",
             "-" * 20,
-            f"Processing time per edge: {performance.get('time_per_edge', 0):.3f} seconds",
+            f"Processing time per edge: {performance.get('time_per_edge', 0) * 1e6:.1f} µs "
+            f"({performance.get('time_per_1000_records', 0):.3f} seconds per 1000 records)",
             f"Memory usage per edge: {performance.get('memory_per_edge', 0)} bytes",
-            f"Cross-validation: {cv_results.get('mean_accuracy', 0):.1f}% ± {cv_results.get('std_accuracy', 0):.1f}%"
+            f"Cross-validation: {cv_results.get('mean_accuracy', 0):.1f}% ± {cv_results.get('std_accuracy', 0):.1f}%",
+            "",
+            "Workload Profiles (comparisons/s, 95% CI):",
+            "-" * 20
         ])
         
+        for name, profile in performance.get('workload_profiles', {}).items():
+            summary_lines.append(
+                f"{name.replace('_', ' ').title():20}: {profile['comparisons_per_second']:>10,.0f} "
+                f"± {profile['ci95']:,.0f} ({profile['us_per_comparison']:.1f} µs each)"
+            )
+        
         summary_text = '\n'.join(summary_lines)
         
         with open('results/summary.txt', 'w') as f:
@@ -434,28 +537,31 @@ class ResultsReproducer:
             'split_names'
         ]
         
-        for category in categories:
-            results[category] = self.test_category(test_cases, category)
-        
-        # Calculate overall performance
-        total_correct = sum(r['correct'] for r in results.values())
-        total_cases = sum(r['total'] for r in results.values())
-        overall_accuracy = (total_correct / total_cases) * 100 if total_cases > 0 else 0
-        ci_lower, ci_upper = self.calculate_confidence_interval(overall_accuracy, total_cases)
+        # Batch GC policy: freeze the warmed-up detector, collect young objects less often
+        with GC_RUNTIME.batch_mode():
+            results.update(self.test_categories(test_cases, categories))
+        
+            # Calculate overall performance
+            total_correct = sum(r['correct'] for r in results.values())
+            total_cases = sum(r['total'] for r in results.values())
+            overall_accuracy = (total_correct / total_cases) * 100 if total_cases > 0 else 0
+            ci_lower, ci_upper = self.calculate_confidence_interval(overall_accuracy, total_cases)
+        
+            results['overall'] = {
+                'accuracy': overall_accuracy,
+                'correct': total_correct,
+                'total': total_cases,
+                'ci_lower': ci_lower,
+                'ci_upper': ci_upper
+            }
         
-        results['overall'] = {
-            'accuracy': overall_accuracy,
-            'correct': total_correct,
-            'total': total_cases,
-            'ci_lower': ci_lower,
-            'ci_upper': ci_upper
-        }
+            # Measure performance
+            performance = self.measure_performance()
         
-        # Measure performance
-        performance = self.measure_performance()
+            # Cross-validation
+            cv_results = self.cross_validation(test_cases)
         
-        # Cross-validation
-        cv_results = self.cross_validation(test_cases.copy())
+        self.close()
         
         # Compare with expected results
         validation_passed = self.compare_with_expected(results)
@@ -8,11 +8,40 @@ Main module for Arabic name duplicate detection with proper formatting.
 
 import os
 import sys
+import time
+import tracemalloc
 
 # Add current directory to path for imports
 current_dir = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, current_dir)
 
+# Shared caching utilities live in src/utils
+try:
+    from src.utils.smart_cache import cached, canonical_pair
+    from src.utils.tracing import traced
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(current_dir), 'utils'))
+    try:
+        from smart_cache import cached, canonical_pair
+        from tracing import traced
+    except ImportError:
+        canonical_pair = None
+        
+        def cached(policy=None, key=None, depends_on=()):
+            """No-op stand-in when smart_cache is unavailable."""
+            return lambda method: method
+        
+        def traced(name=None):
+            """No-op stand-in when tracing is unavailable."""
+            return lambda method: method
+
+# Detector results are invalidated when the threshold or a lexicon changes
+# (its own or the similarity calculator's, including in-place edits)
+DETECTOR_CACHE_DEPENDENCIES = (
+    'threshold', 'honorifics', 'nickname_map',
+    'similarity_calculator.threshold', 'similarity_calculator.honorifics', 'similarity_calculator.nicknames'
+)
+
 try:
     from similarity import NameSimilarityCalculator
     print("✅ Successfully imported NameSimilarityCalculator")
@@ -158,6 +187,9 @@ class DuplicateDetector:
         self.threshold = threshold
         self.similarity_calculator = NameSimilarityCalculator(threshold)
         
+        # Optional first-tier cache of prepared names (see attach_name_cache)
+        self.name_cache = None
+        
         # Common Arabic nicknames mapping
         self.nickname_map = {
             'MOHAMMED': ['HAMADA', 'HAMMOUDA', 'MOHAMED', 'MOHAMMAD'],
@@ -205,27 +237,60 @@ class DuplicateDetector:
         
         return ' '.join(filtered_words)
     
-    def split_name_components(self, name):
+    def attach_name_cache(self, name_cache):
         """
-        Split name into components (first, middle, last).
+        Share a prepared-name cache with this detector and its similarity calculator.
         
         Args:
-            name (str): Full name
+            name_cache: PreparedNameCache instance (e.g. SmartCache.name_cache), or None to detach
+        """
+        self.name_cache = name_cache
+        if hasattr(self.similarity_calculator, 'name_cache'):
+            self.similarity_calculator.name_cache = name_cache
+    
+    @traced()
+    def prepare_name(self, name):
+        """
+        Normalize and tokenize a name once, using the name cache when attached.
+        
+        Args:
+            name (str): Input name
             
         Returns:
-            tuple: (first_name, middle_name, last_name)
+            dict: {'normalized': str, 'components': (first, middle, last)}
         """
+        if self.name_cache is not None:
+            return self.name_cache.get_or_prepare(name, self._prepare_name_uncached, kind='detector')
+        return self._prepare_name_uncached(name)
+    
+    def _prepare_name_uncached(self, name):
+        """Build the prepared form of a name without consulting the cache."""
         normalized = self.normalize_name(name)
         parts = normalized.split()
         
         if len(parts) == 1:
-            return parts[0], "", ""
+            components = (parts[0], "", "")
         elif len(parts) == 2:
-            return parts[0], "", parts[1]
+            components = (parts[0], "", parts[1])
         elif len(parts) >= 3:
-            return parts[0], ' '.join(parts[1:-1]), parts[-1]
+            components = (parts[0], ' '.join(parts[1:-1]), parts[-1])
         else:
-            return "", "", ""
+            components = ("", "", "")
+        
+        return {'normalized': normalized, 'components': components}
+    
+    @traced()
+    def split_name_components(self, name):
+        """
+        Split name into components (first, middle, last).
+        
+        Args:
+            name (str): Full name
+            
+        Returns:
+            tuple: (first_name, middle_name, last_name)
+        """
+        return self.prepare_name(name)['components']
     
     def safe_similarity_extract(self, similarity_result):
         """
@@ -244,6 +309,7 @@ class DuplicateDetector:
         else:
             return float(similarity_result)
     
+    @cached(key=canonical_pair, depends_on=DETECTOR_CACHE_DEPENDENCIES)
     def calculate_similarity(self, name1, name2):
         """
         Calculate similarity score between two names.
@@ -258,6 +324,7 @@ class DuplicateDetector:
         result = self.similarity_calculator.calculate_name_similarity(name1, name2)
         return self.safe_similarity_extract(result)
     
+    @cached(key=canonical_pair, depends_on=DETECTOR_CACHE_DEPENDENCIES)
     def are_duplicates(self, name1, name2):
         """
         Determine if two names are duplicates based on comprehensive analysis.
@@ -273,15 +340,17 @@ class DuplicateDetector:
             return False
         
         # Normalize names
-        norm1 = self.normalize_name(name1)
-        norm2 = self.normalize_name(name2)
+        prepared1 = self.prepare_name(name1)
+        prepared2 = self.prepare_name(name2)
+        norm1 = prepared1['normalized']
+        norm2 = prepared2['normalized']
         
         if norm1 == norm2:
             return True
         
         # Split into components
-        first1, middle1, last1 = self.split_name_components(name1)
-        first2, middle2, last2 = self.split_name_components(name2)
+        first1, middle1, last1 = prepared1['components']
+        first2, middle2, last2 = prepared2['components']
         
         # Calculate similarity for each component safely
         first_sim = 0.0
@@ -348,6 +417,8 @@ class DuplicateDetector:
             return name1.startswith(name2[0])
         return False
     
+    @traced()
+    @cached(key=canonical_pair, depends_on=DETECTOR_CACHE_DEPENDENCIES)
     def detect_category(self, name1, name2):
         """
         Detect the category of duplicate based on the type of variation.
@@ -360,7 +431,8 @@ class DuplicateDetector:
             str: Category of duplicate
         """
         # Normalize first
-        norm1, norm2 = self.normalize_name(name1), self.normalize_name(name2)
+        prepared1, prepared2 = self.prepare_name(name1), self.prepare_name(name2)
+        norm1, norm2 = prepared1['normalized'], prepared2['normalized']
         
         # Check for honorific prefixes
         orig1, orig2 = name1.upper(), name2.upper()
@@ -379,8 +451,8 @@ class DuplicateDetector:
                     return "name_abbreviations"
         
         # Check for nicknames
-        first1, _, _ = self.split_name_components(name1)
-        first2, _, _ = self.split_name_components(name2)
+        first1 = prepared1['components'][0]
+        first2 = prepared2['components'][0]
         if first1 and first2:
             nickname_result = self.similarity_calculator.calculate_name_similarity(first1, first2)
             if isinstance(nickname_result, dict) and nickname_result.get('is_nickname', False):
@@ -401,22 +473,81 @@ class DuplicateDetector:
         # Default to different spelling/pronunciation
         return "different_spelling"
     
-    def get_performance_metrics(self):
+    def get_performance_metrics(self, sample_pairs=None):
         """
-        Get performance metrics for the detector.
+        Measure performance metrics for the detector.
+        
+        Runs a full comparison (are_duplicates, calculate_similarity,
+        detect_category) per pair on fresh detectors with the same
+        threshold, so results cached on this instance do not skew timing.
+        Timing and tracemalloc passes are separate because allocation
+        tracing slows the code it observes.
         
+        Args:
+            sample_pairs (list): (name1, name2) pairs to measure; defaults to
+                one pair per duplicate category
+            
         Returns:
             dict: Performance metrics
         """
+        if not sample_pairs:
+            sample_pairs = PERFORMANCE_SAMPLE_PAIRS
+        
+        def compare(detector, name1, name2):
+            detector.are_duplicates(name1, name2)
+            detector.calculate_similarity(name1, name2)
+            detector.detect_category(name1, name2)
+        
+        # Timing pass
+        probe = DuplicateDetector(self.threshold)
+        wall_start = time.perf_counter_ns()
+        cpu_start = time.process_time_ns()
+        for name1, name2 in sample_pairs:
+            compare(probe, name1, name2)
+        wall_ns = time.perf_counter_ns() - wall_start
+        cpu_ns = time.process_time_ns() - cpu_start
+        
+        # Memory pass
+        probe = DuplicateDetector(self.threshold)
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        
+        peak_bytes = []
+        for name1, name2 in sample_pairs:
+            tracemalloc.reset_peak()
+            base_memory = tracemalloc.get_traced_memory()[0]
+            compare(probe, name1, name2)
+            peak_bytes.append(max(0, tracemalloc.get_traced_memory()[1] - base_memory))
+        
+        if started_tracing:
+            tracemalloc.stop()
+        
+        comparisons = len(sample_pairs)
         return {
-            'memory_per_edge_kb': 5,
-            'processing_time_seconds': 1,
+            'memory_per_edge_kb': sum(peak_bytes) / comparisons / 1024,
+            'max_memory_per_edge_kb': max(peak_bytes) / 1024,
+            'processing_time_seconds': wall_ns / comparisons / 1e9,
+            'cpu_time_seconds': cpu_ns / comparisons / 1e9,
+            'comparisons_measured': comparisons,
+            'measured_with_tracemalloc': True,
             'method': 'Levenshtein Distance + Pattern Recognition',
             'categories_supported': 6,
             'accuracy_range': '72% - 95%'
         }
 
 
+# One representative pair per duplicate category, used by get_performance_metrics
+PERFORMANCE_SAMPLE_PAIRS = [
+    ("MOHAMMED AHMED HASSAN", "MOHAMMAD AHMAD HASAN"),
+    ("AHMED MOHMMED ALI", "AHMED MOHAMMED ALI"),
+    ("FATIMA HASSAN OMAR", "F. HASSAN OMAR"),
+    ("DR. AHMED OMAR SALEM", "AHMED OMAR SALEM"),
+    ("SARA MOHAMMED HASSAN", "SOSO MOHAMMED HASSAN"),
+    ("MOHAMMED AHMED ALI HASSAN", "MOHAMMED-AHMED ALI HASSAN"),
+]
+
+
 def main():
     """Test the duplicate detector with sample data."""
     print("🔵 BlueEdge Duplicate Detector - Test")
@@ -9,23 +9,47 @@ Based on research paper: BlueEdge Framework
 Author: Generated for Reproduction Package
 """
 
+import os
 import re
+import sys
 from typing import Tuple, List, Dict, Union
 
+# أدوات التخزين المؤقت المشتركة موجودة في src/utils
+try:
+    from src.utils.smart_cache import cached, ordered_pair
+    from src.utils.tracing import traced
+except ImportError:
+    sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'utils'))
+    try:
+        from smart_cache import cached, ordered_pair
+        from tracing import traced
+    except ImportError:
+        ordered_pair = None
+        
+        def cached(policy=None, key=None, depends_on=()):
+            """بديل بدون تخزين مؤقت عند عدم توفر smart_cache"""
+            return lambda method: method
+        
+        def traced(name=None):
+            """بديل بدون تتبع عند عدم توفر tracing"""
+            return lambda method: method
+
 class NameSimilarityCalculator:
     """
     حاسبة التشابه بين الأسماء العربية
     تطبق خوارزمية Levenshtein Distance مع تحسينات للأسماء العربية
     """
     
-    def __init__(self, threshold: float = 0.25):
+    def __init__(self, threshold: float = 0.25, name_cache=None):
         """
         تهيئة الحاسبة
         
         Args:
             threshold (float): عتبة التشابه (default: 0.25 كما في البحث)
+            name_cache: ذاكرة مؤقتة اختيارية للأسماء المجهزة (PreparedNameCache)
         """
         self.threshold = threshold
+        self.name_cache = name_cache
         self.honorifics = {
             'DR.', 'DR', 'DOCTOR', 'PROF.', 'PROF', 'PROFESSOR',
             'MR.', 'MR', 'MRS.', 'MRS', 'MISS', 'MS.', 'MS', 
@@ -43,6 +67,7 @@ class NameSimilarityCalculator:
             'HASSAN': ['HASO']
         }
     
+    @traced()
     def levenshtein_distance(self, s1: str, s2: str) -> int:
         """
         حساب Levenshtein Distance بين نصين
@@ -90,6 +115,7 @@ class NameSimilarityCalculator:
         similarity = 1 - (distance / max_length)
         return max(0.0, min(1.0, similarity))
     
+    @traced()
     def preprocess_name(self, name: str) -> str:
         """
         تنظيف وتجهيز الاسم للمقارنة
@@ -120,6 +146,7 @@ class NameSimilarityCalculator:
         
         return name
     
+    @traced()
     def expand_abbreviations(self, name: str) -> str:
         """
         توسيع الاختصارات
@@ -145,6 +172,27 @@ class NameSimilarityCalculator:
         
         return name
     
+    def prepare_name(self, name: str) -> Tuple[str, str]:
+        """
+        تجهيز الاسم للمقارنة (تنظيف + توسيع الاختصارات)
+        يستخدم ذاكرة الأسماء المؤقتة إن وجدت
+        
+        Args:
+            name: الاسم الأصلي
+            
+        Returns:
+            tuple: (الاسم بعد التنظيف, الاسم بعد توسيع الاختصارات)
+        """
+        if self.name_cache is not None:
+            return self.name_cache.get_or_prepare(name, self._prepare_name_uncached, kind='similarity')
+        return self._prepare_name_uncached(name)
+    
+    def _prepare_name_uncached(self, name: str) -> Tuple[str, str]:
+        """تجهيز الاسم بدون ذاكرة مؤقتة"""
+        clean = self.preprocess_name(name)
+        return clean, self.expand_abbreviations(clean)
+    
+    @traced()
     def check_nicknames(self, name1: str, name2: str) -> bool:
         """
         فحص الأسماء المستعارة
@@ -161,6 +209,7 @@ class NameSimilarityCalculator:
                 return True
         return False
     
+    @cached(key=ordered_pair, depends_on=('threshold', 'honorifics', 'nicknames'))
     def calculate_name_similarity(self, name1: str, name2: str) -> Dict[str, Union[float, bool]]:
         """
         حساب التشابه بين اسمين مع التفاصيل
@@ -171,13 +220,9 @@ class NameSimilarityCalculator:
         Returns:
             dict: نتيجة مفصلة للمقارنة
         """
-        # تنظيف الأسماء
-        clean1 = self.preprocess_name(name1)
-        clean2 = self.preprocess_name(name2)
-        
-        # توسيع الاختصارات
-        expanded1 = self.expand_abbreviations(clean1)
-        expanded2 = self.expand_abbreviations(clean2)
+        # تنظيف الأسماء وتوسيع الاختصارات
+        clean1, expanded1 = self.prepare_name(name1)
+        clean2, expanded2 = self.prepare_name(name2)
         
         # فحص الأسماء المستعارة
         is_nickname = self.check_nicknames(expanded1, expanded2)
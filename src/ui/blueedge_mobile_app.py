@@ -24,6 +24,7 @@ project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(_
 sys.path.append(project_root)
 import json
 import time
+from contextlib import nullcontext
 from datetime import datetime
 
 # Add src directory to path
@@ -95,6 +96,23 @@ try:
         print("App will run without result caching")
         SMART_CACHE_AVAILABLE = False
     
+    # Import GC runtime policy
+    try:
+        from gc_runtime import GC_RUNTIME
+        GC_RUNTIME_AVAILABLE = True
+    except ImportError as e:
+        print(f"⚠️ GC runtime not available: {e}")
+        GC_RUNTIME_AVAILABLE = False
+    
+    # Import Metrics exposition (OpenMetrics endpoint / textfile)
+    try:
+        from metrics_registry import MetricsRegistry, bind_blueedge_metrics, start_http_server, TextfileExporter
+        from tracing import TRACER
+        METRICS_AVAILABLE = True
+    except ImportError as e:
+        print(f"⚠️ Metrics export not available: {e}")
+        METRICS_AVAILABLE = False
+    
 except ImportError as e:
     print(f"❌ KIVY import error: {e}")
     print("Please install KIVY: pip install kivy[base]")
@@ -164,6 +182,22 @@ class BlueEdgeApp(App):
                 print("🧠 Initializing Smart Cache...")
                 self.smart_cache = SmartCache(max_size=50, max_memory_kb=25)
                 self.cache_enabled = True
+                
+                # Share the prepared-name tier with the detector
+                if hasattr(self.detector, 'attach_name_cache'):
+                    self.detector.attach_name_cache(self.smart_cache.name_cache)
+                
+                # Warm the cache from a preloaded snapshot (see scripts/preload_cache.py)
+                snapshot_path = os.environ.get(
+                    'BLUEEDGE_CACHE_SNAPSHOT',
+                    os.path.join(project_root, 'data', 'blueedge_cache.bin')
+                )
+                if os.path.exists(snapshot_path):
+                    try:
+                        self.smart_cache.load(snapshot_path)
+                    except Exception as e:
+                        print(f"⚠️ Cache snapshot not loaded: {e}")
+                
                 print("✅ Smart caching enabled!")
                 
             except Exception as e:
@@ -190,6 +224,39 @@ class BlueEdgeApp(App):
         else:
             print("📱 Running in offline mode - Firebase not available")
         
+        self._initialize_metrics_export()
+        
+        # Warm-up done: detector lexicons, caches and services are long-lived
+        if GC_RUNTIME_AVAILABLE:
+            frozen = GC_RUNTIME.freeze()
+            print(f"♻️ Froze {frozen} long-lived objects out of GC scans")
+    
+    def _initialize_metrics_export(self):
+        """Expose metrics for scraping when BLUEEDGE_METRICS_PORT or BLUEEDGE_METRICS_TEXTFILE is set"""
+        metrics_port = os.environ.get('BLUEEDGE_METRICS_PORT')
+        metrics_textfile = os.environ.get('BLUEEDGE_METRICS_TEXTFILE')
+        if not METRICS_AVAILABLE or not (metrics_port or metrics_textfile):
+            return
+        
+        try:
+            self.metrics_registry = bind_blueedge_metrics(
+                MetricsRegistry(),
+                monitor=self.performance_monitor,
+                cache=self.smart_cache,
+                sync=self.firebase_service['sync'] if self.firebase_service else None,
+                tracer=TRACER,
+                io=self.firebase_service['io'] if self.firebase_service else None
+            )
+            if metrics_port:
+                self.metrics_server = start_http_server(self.metrics_registry, port=int(metrics_port))
+                print(f"📡 Metrics endpoint on http://127.0.0.1:{metrics_port}/metrics")
+            if metrics_textfile:
+                self.metrics_exporter = TextfileExporter(self.metrics_registry, metrics_textfile)
+                self.metrics_exporter.start()
+                print(f"📡 Metrics textfile: {metrics_textfile}")
+        except Exception as e:
+            print(f"❌ Metrics export initialization failed: {e}")
+        
     def build(self):
         """Build the enhanced application interface with performance dashboard"""
         # Set window properties
@@ -719,64 +786,61 @@ class BlueEdgeApp(App):
             return
         
         try:
-            # Start performance timing
-            start_time = time.time()
-            
-            print(f"🚀 Enhanced comparing: {name1} vs {name2}")
+            # Start performance timing (the monitor measures wall, CPU and sampled peak memory)
+            start_time = time.perf_counter()
+            measurement_context = self.performance_monitor.measure() if self.performance_enabled else nullcontext({})
             
-            # Check cache first
-            cache_hit = False
-            cached_result = None
-            
-            if self.cache_enabled:
-                found, cached_result = self.smart_cache.get(name1, name2)
-                if found:
-                    cache_hit = True
-                    self.cache_hits += 1
-                    print(f"💾 Cache HIT - using cached result")
-                else:
-                    self.cache_misses += 1
-                    print(f"❌ Cache MISS - performing new comparison")
-            
-            # Perform comparison (either from cache or fresh)
-            if cache_hit and cached_result:
-                is_duplicate = cached_result.get('is_duplicate', False)
-                similarity = cached_result.get('similarity_score', 0.0)
-                category = cached_result.get('category', 'unknown')
-                processing_time = 0.001  # Cached results are instant
-            else:
-                # Fresh comparison
-                is_duplicate = self.detector.are_duplicates(name1, name2)
-                similarity_result = self.detector.calculate_similarity(name1, name2)
-                category = self.detector.detect_category(name1, name2)
-                
-                # Handle dict return from similarity
-                if isinstance(similarity_result, dict):
-                    similarity = similarity_result.get('similarity_score', 0.0)
-                else:
-                    similarity = float(similarity_result)
+            with measurement_context as measurement:
+                print(f"🚀 Enhanced comparing: {name1} vs {name2}")
                 
-                processing_time = time.time() - start_time
+                # Check cache first
+                cache_hit = False
+                cached_result = None
                 
-                # Cache the result for future use
                 if self.cache_enabled:
-                    result_to_cache = {
-                        'is_duplicate': is_duplicate,
-                        'similarity_score': similarity,
-                        'category': category,
-                        'names': [name1, name2]
-                    }
-                    self.smart_cache.put(name1, name2, result_to_cache)
+                    found, cached_result = self.smart_cache.get(name1, name2)
+                    if found:
+                        cache_hit = True
+                        self.cache_hits += 1
+                        print(f"💾 Cache HIT - using cached result")
+                    else:
+                        self.cache_misses += 1
+                        print(f"❌ Cache MISS - performing new comparison")
+                
+                # Perform comparison (either from cache or fresh)
+                if cache_hit and cached_result:
+                    is_duplicate = cached_result.get('is_duplicate', False)
+                    similarity = cached_result.get('similarity_score', 0.0)
+                    category = cached_result.get('category', 'unknown')
+                    processing_time = time.perf_counter() - start_time
+                else:
+                    # Fresh comparison
+                    is_duplicate = self.detector.are_duplicates(name1, name2)
+                    similarity_result = self.detector.calculate_similarity(name1, name2)
+                    category = self.detector.detect_category(name1, name2)
+                    
+                    # Handle dict return from similarity
+                    if isinstance(similarity_result, dict):
+                        similarity = similarity_result.get('similarity_score', 0.0)
+                    else:
+                        similarity = float(similarity_result)
+                    
+                    processing_time = time.perf_counter() - start_time
+                    
+                    # Cache the result for future use
+                    if self.cache_enabled:
+                        result_to_cache = {
+                            'is_duplicate': is_duplicate,
+                            'similarity_score': similarity,
+                            'category': category,
+                            'names': [name1, name2]
+                        }
+                        self.smart_cache.put(name1, name2, result_to_cache)
+                
+                measurement['cache_hit'] = cache_hit
             
             print(f"✅ Results: duplicate={is_duplicate}, similarity={similarity:.2f}, category={category}")
             
-            # Record performance metrics
-            if self.performance_enabled:
-                self.performance_monitor.record_comparison(
-                    processing_time=processing_time,
-                    cache_hit=cache_hit
-                )
-            
             # Update session statistics
             self.total_comparisons += 1
             
@@ -792,8 +856,8 @@ class BlueEdgeApp(App):
             # Update performance dashboard
             self.update_performance_dashboard()
             
-            # Auto-sync to cloud if enabled
-            if self.auto_cloud_sync and self.firebase_connected:
+            # Auto-sync to cloud if enabled (queued durably, so offline too)
+            if self.auto_cloud_sync and self.firebase_service and self.firebase_service['sync']:
                 self.auto_sync_to_cloud(name1, name2, is_duplicate, similarity, category, processing_time)
             
             # Show enhanced success popup
@@ -960,34 +1024,43 @@ class BlueEdgeApp(App):
             self.show_popup("❌ Sync Error", "Firebase not connected!")
             return
         
-        # Sync recent history to cloud
-        sync_count = 0
-        for entry in self.results_history[:3]:  # Sync last 3 entries
-            try:
-                if self.firebase_service:
-                    success, key = self.firebase_service['database'].save_comparison_result(
-                        f"user_{datetime.now().strftime('%Y%m%d')}",
-                        {
-                            'name1': entry['name1'],
-                            'name2': entry['name2'],
-                            'similarity_score': entry['similarity'],
-                            'is_duplicate': entry['is_duplicate'],
-                            'category': entry['category'],
-                            'processing_time': entry.get('processing_time_ms', 0) / 1000,
-                            'cache_hit': entry.get('cache_hit', False)
-                        }
-                    )
-                    if success:
-                        sync_count += 1
-            except Exception as e:
-                print(f"❌ Sync error: {e}")
+        # Sync recent history to cloud (one batched write)
+        user_id = f"user_{datetime.now().strftime('%Y%m%d')}"
+        batch = [
+            (user_id, {
+                'name1': entry['name1'],
+                'name2': entry['name2'],
+                'similarity_score': entry['similarity'],
+                'is_duplicate': entry['is_duplicate'],
+                'category': entry['category'],
+                'processing_time': entry.get('processing_time_ms', 0) / 1000,
+                'cache_hit': entry.get('cache_hit', False)
+            })
+            for entry in self.results_history[:3]  # Sync last 3 entries
+        ]
+        
+        def show_result(sync_count):
+            self.show_popup("☁️ Manual Sync", f"Synced {sync_count} comparisons to cloud!")
+        
+        # Runs on the I/O loop thread: the popup is shown from the Kivy clock
+        def synced(success, keys):
+            sync_count = len(keys) if success else 0
+            Clock.schedule_once(lambda dt: show_result(sync_count))
+        
+        try:
+            if self.firebase_service and self.firebase_service['io']:
+                # Non-blocking: the write runs on the shared I/O loop, not the UI thread
+                self.firebase_service['io'].save_comparison_results_nowait(batch, callback=synced)
+                return
+        except Exception as e:
+            print(f"❌ Sync error: {e}")
         
-        self.show_popup("☁️ Manual Sync", f"Synced {sync_count} comparisons to cloud!")
+        show_result(0)
     
     def auto_sync_to_cloud(self, name1, name2, is_duplicate, similarity, category, processing_time):
-        """Auto sync comparison to cloud"""
+        """Auto sync comparison to cloud through the durable sync outbox"""
         try:
-            if self.firebase_service:
+            if self.firebase_service and self.firebase_service['sync']:
                 comparison_data = {
                     'name1': name1,
                     'name2': name2,
@@ -999,21 +1072,14 @@ class BlueEdgeApp(App):
                     'auto_synced': True
                 }
                 
-                # Async sync (don't block UI)
-                import threading
-                def async_sync():
-                    try:
-                        success, key = self.firebase_service['database'].save_comparison_result(
-                            f"user_{datetime.now().strftime('%Y%m%d')}",
-                            comparison_data
-                        )
-                        if success:
-                            print(f"✅ Auto-synced to cloud: {key}")
-                    except Exception as e:
-                        print(f"❌ Auto-sync failed: {e}")
-                
-                thread = threading.Thread(target=async_sync, daemon=True)
-                thread.start()
+                # The outbox persists the item before returning (a local SQLite
+                # insert); the sync loop batches it and retries through outages
+                key = self.firebase_service['sync'].add_to_sync_queue(
+                    f"user_{datetime.now().strftime('%Y%m%d')}",
+                    comparison_data
+                )
+                if key is None:
+                    print("⚠️ Auto-sync skipped - sync queue over budget")
                 
         except Exception as e:
             print(f"❌ Auto-sync error: {e}")
@@ -1040,7 +1106,10 @@ class BlueEdgeApp(App):
 ⚡ Performance Metrics:
 • Average Speed: {report['performance_metrics']['processing_speed']['average_ms']}ms
 • Fastest: {report['performance_metrics']['processing_speed']['fastest_ms']}ms
+• p95 / p99: {report['performance_metrics']['processing_speed']['percentiles_ms']['p95']:.1f}ms / {report['performance_metrics']['processing_speed']['percentiles_ms']['p99']:.1f}ms
 • Target Met: {'✅' if report['performance_metrics']['processing_speed']['meets_target'] else '❌'}
+• GC Pauses: {report['performance_metrics']['garbage_collection']['total_pause_ms']:.1f}ms total, {report['performance_metrics']['garbage_collection']['max_pause_ms']:.1f}ms max
+{self._format_profiling_status(report['performance_metrics']['profiling'])}
 
 💾 Cache Performance:
 • Hit Rate: {report['performance_metrics']['cache_efficiency']['hit_rate_percent']}%
@@ -1051,7 +1120,11 @@ class BlueEdgeApp(App):
 • Overall: {'✅ Compliant' if report['blueedge_compliance']['overall_compliant'] else '❌ Non-compliant'}
 • Score: {report['blueedge_compliance']['compliance_score']:.0f}/100"""
             
-            self.show_popup("📊 Performance Report", report_text)
+            if self.performance_monitor.profiling_session is None:
+                action = ('🔬 Profile next 100', self.start_profiling)
+            else:
+                action = ('⏹️ Stop profiling', self.stop_profiling)
+            self.show_popup("📊 Performance Report", report_text, action=action)
             
             # Export report to file
             filename = self.performance_monitor.export_report()
@@ -1103,8 +1176,34 @@ class BlueEdgeApp(App):
         # Auto-compare after delay
         Clock.schedule_once(lambda dt: self.enhanced_compare_names(None), 2.0)
     
-    def show_popup(self, title, message):
-        """Show popup message with professional styling"""
+    def _format_profiling_status(self, profiling):
+        """One report line describing the profiler state"""
+        if profiling['active']:
+            return "• Profiling: 🔬 running"
+        if profiling['last_profile']:
+            last = profiling['last_profile']
+            return f"• Last Profile: {last['pstats_path'] or last['collapsed_path']}"
+        return "• Profiling: off"
+    
+    def start_profiling(self, instance=None):
+        """Profile the next 100 comparisons (runs on the UI thread that compares)"""
+        if self.performance_monitor:
+            self.performance_monitor.start_profiling(comparisons=100)
+    
+    def stop_profiling(self, instance=None):
+        """Finish profiling early and show where the output landed"""
+        if self.performance_monitor:
+            result = self.performance_monitor.stop_profiling()
+            if result:
+                self.show_popup("🔬 Profile Saved", f"{result['comparisons']} comparisons profiled\n\n"
+                                f"pstats: {result['pstats_path']}\nstacks: {result['collapsed_path']}")
+    
+    def show_popup(self, title, message, action=None):
+        """Show popup message with professional styling
+        
+        Args:
+            action: Optional (button_text, callback) shown next to OK
+        """
         popup_layout = BoxLayout(
             orientation='vertical',
             padding=20,
@@ -1130,7 +1229,22 @@ class BlueEdgeApp(App):
         )
         
         popup_layout.add_widget(popup_label)
-        popup_layout.add_widget(popup_button)
+        
+        action_button = None
+        if action:
+            buttons_layout = BoxLayout(orientation='horizontal', size_hint=(1, 0.3), spacing=10)
+            action_button = Button(
+                text=action[0],
+                background_color=self.accent_color,
+                color=(1, 1, 1, 1),
+                font_size='14sp'
+            )
+            popup_button.size_hint = (1, 1)
+            buttons_layout.add_widget(action_button)
+            buttons_layout.add_widget(popup_button)
+            popup_layout.add_widget(buttons_layout)
+        else:
+            popup_layout.add_widget(popup_button)
         
         popup = Popup(
             title=title,
@@ -1141,6 +1255,9 @@ class BlueEdgeApp(App):
         )
         
         popup_button.bind(on_press=popup.dismiss)
+        if action_button is not None:
+            action_button.bind(on_press=popup.dismiss)
+            action_button.bind(on_release=action[1])
         popup.open()
 
 def main():
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Async Firebase Client for BlueEdge Framework
+============================================
+asyncio front end of FirebaseDatabase with bounded concurrency
+Features:
+- One event loop and a fixed I/O pool instead of a thread per save
+- Semaphore-bounded requests in flight (sized to the keep-alive pool)
+- Write pipelining: saves issued while batches are in flight are
+  coalesced into the next multi-path PATCH
+- Cancellation: cancelled saves that have not been sent are dropped
+- Optional shared TokenBucket write budget; saves beyond max_queued
+  are shed instead of queueing without bound
+- Synchronous facade (FirebaseIO) for the existing blocking callers
+
+Requests still go through the shared HTTPClient (pooled keep-alive
+session, retries, gzip); the pool threads only wait on sockets.
+"""
+
+import asyncio
+import threading
+import functools
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class AsyncFirebaseClient:
+    """Coroutine API over FirebaseDatabase with at most max_concurrency requests in flight"""
+
+    def __init__(self, database, max_concurrency=4, max_batch=50, rate_limiter=None, max_queued=1000):
+        """
+        Args:
+            database: FirebaseDatabase to send through
+            max_concurrency: Requests in flight (also the I/O pool size)
+            max_batch: Comparisons per coalesced write
+            rate_limiter: TokenBucket charged one token per write (None = unlimited)
+            max_queued: Saves waiting to be sent before new ones are shed
+        """
+        self.database = database
+        self.max_concurrency = max_concurrency
+        self.max_batch = max_batch
+        self.rate_limiter = rate_limiter
+        self.max_queued = max_queued
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix='blueedge-io')
+
+        # Created on first use, inside the running loop
+        self.semaphore = None
+        self.write_queue = deque()
+        self.writer = None
+        self.write_tasks = set()
+
+        # Statistics
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = 0
+        self.write_batches = 0
+        self.cancelled = 0
+        self.shed = 0
+        self.throttle_waits = 0
+
+    def _ensure_loop_state(self):
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def _call(self, function, *args, **kwargs):
+        """Run a blocking call on the I/O pool (slot already held)"""
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        self.requests += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, functools.partial(function, *args, **kwargs))
+        finally:
+            self.in_flight -= 1
+
+    async def _throttle(self):
+        """Wait for a write token (saves queued meanwhile join the next batch)"""
+        if self.rate_limiter is None:
+            return
+        while not self.rate_limiter.try_acquire():
+            self.throttle_waits += 1
+            await asyncio.sleep(self.rate_limiter.time_until())
+
+    async def run(self, function, *args, **kwargs):
+        """Run a blocking Firebase call once a concurrency slot is free"""
+        self._ensure_loop_state()
+        async with self.semaphore:
+            return await self._call(function, *args, **kwargs)
+
+    async def request(self, method, url, **kwargs):
+        """HTTP request over the shared pooled client"""
+        return await self.run(self.database.config.http.request, method, url, **kwargs)
+
+    async def save_comparison_result(self, user_id, comparison_data):
+        """
+        Save one comparison; concurrent saves share multi-path writes
+
+        Returns:
+            tuple: (success, Firebase key or None); (False, None) when shed
+        """
+        self._ensure_loop_state()
+        if len(self.write_queue) >= self.max_queued:
+            self.shed += 1
+            return False, None
+        future = asyncio.get_running_loop().create_future()
+        self.write_queue.append((user_id, comparison_data, future))
+        if self.writer is None or self.writer.done():
+            self.writer = asyncio.ensure_future(self._drain_writes())
+        return await future
+
+    async def save_comparison_results(self, batch):
+        """Save a batch in one write (see FirebaseDatabase.save_comparison_results)"""
+        self._ensure_loop_state()
+        async with self.semaphore:
+            await self._throttle()
+            return await self._call(self.database.save_comparison_results, batch)
+
+    async def _drain_writes(self):
+        """Send queued saves in batches, up to max_concurrency batches in flight"""
+        while self.write_queue:
+            # While every slot is busy or the budget is spent, new saves keep joining the queue
+            await self.semaphore.acquire()
+            try:
+                await self._throttle()
+            except asyncio.CancelledError:
+                self.semaphore.release()
+                raise
+            items = []
+            while self.write_queue and len(items) < self.max_batch:
+                item = self.write_queue.popleft()
+                if item[2].cancelled():
+                    self.cancelled += 1
+                else:
+                    items.append(item)
+            if not items:
+                self.semaphore.release()
+                break
+
+            task = asyncio.ensure_future(self._write_batch(items))
+            self.write_tasks.add(task)
+            task.add_done_callback(self.write_tasks.discard)
+
+    async def _write_batch(self, items):
+        """One multi-path write for queued saves (slot held by the caller)"""
+        try:
+            self.write_batches += 1
+            success, keys = await self._call(
+                self.database.save_comparison_results,
+                [(user_id, data) for user_id, data, _ in items]
+            )
+            for index, (_, _, future) in enumerate(items):
+                if not future.done():
+                    future.set_result((success, keys[index] if success else None))
+        except Exception as e:
+            for _, _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self.semaphore.release()
+
+    async def get_user_history(self, user_id, limit=10, refresh=True):
+        """User history (see FirebaseDatabase.get_user_history)"""
+        return await self.run(self.database.get_user_history, user_id, limit, refresh)
+
+    async def get_histories(self, user_ids, limit=10):
+        """Histories of several users, fetched concurrently"""
+        results = await asyncio.gather(*(self.get_user_history(user_id, limit) for user_id in user_ids))
+        return dict(zip(user_ids, results))
+
+    def cancel_pending(self):
+        """Cancel saves that have not been sent yet"""
+        cancelled = 0
+        while self.write_queue:
+            future = self.write_queue.popleft()[2]
+            if future.cancel():
+                cancelled += 1
+        self.cancelled += cancelled
+        return cancelled
+
+    def get_statistics(self):
+        return {
+            'max_concurrency': self.max_concurrency,
+            'in_flight': self.in_flight,
+            'peak_in_flight': self.peak_in_flight,
+            'queued_saves': len(self.write_queue),
+            'requests': self.requests,
+            'write_batches': self.write_batches,
+            'cancelled': self.cancelled,
+            'shed': self.shed,
+            'throttle_waits': self.throttle_waits
+        }
+
+    def close(self):
+        """Shut down the I/O pool (waits for calls already running)"""
+        self.executor.shutdown(wait=True)
+
+
+class FirebaseIO:
+    """Synchronous facade: one background event loop running an AsyncFirebaseClient"""
+
+    def __init__(self, database, max_concurrency=4, max_batch=50, rate_limiter=None, max_queued=1000):
+        self.client = AsyncFirebaseClient(database, max_concurrency, max_batch, rate_limiter, max_queued)
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name='blueedge-firebase-io', daemon=True)
+        self.thread.start()
+
+    def submit(self, coroutine):
+        """Schedule a coroutine on the I/O loop (returns a concurrent.futures.Future)"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def save_comparison_result(self, user_id, comparison_data, timeout=None):
+        """Blocking save (drop-in for FirebaseDatabase.save_comparison_result)"""
+        return self.submit(self.client.save_comparison_result(user_id, comparison_data)).result(timeout)
+
+    def save_comparison_result_nowait(self, user_id, comparison_data, callback=None):
+        """
+        Non-blocking save for UI code
+
+        Not durable: shed, failed or unsent saves are lost. Saves that must
+        reach the cloud go through FirebaseSync.add_to_sync_queue.
+
+        Args:
+            callback: Called with (success, key) on the I/O loop thread
+                ((False, None) if the save raised; not called if cancelled)
+
+        Returns:
+            concurrent.futures.Future: cancel() drops the save if not yet sent
+        """
+        future = self.submit(self.client.save_comparison_result(user_id, comparison_data))
+        return self._notify(future, callback, (False, None))
+
+    def save_comparison_results(self, batch, timeout=None):
+        """Blocking batched save"""
+        return self.submit(self.client.save_comparison_results(batch)).result(timeout)
+
+    def save_comparison_results_nowait(self, batch, callback=None):
+        """
+        Non-blocking batched save for UI code (see save_comparison_result_nowait)
+
+        Args:
+            callback: Called with (success, keys) on the I/O loop thread
+                ((False, []) if the save raised; not called if cancelled)
+
+        Returns:
+            concurrent.futures.Future
+        """
+        return self._notify(self.submit(self.client.save_comparison_results(batch)), callback, (False, []))
+
+    @staticmethod
+    def _notify(future, callback, failed):
+        """Call callback with the future's result (or `failed` if it raised) once it completes"""
+        if callback:
+            def done(completed):
+                if completed.cancelled():
+                    return
+                callback(*(completed.result() if completed.exception() is None else failed))
+            future.add_done_callback(done)
+        return future
+
+    def get_user_history(self, user_id, limit=10, refresh=True, timeout=None):
+        """Blocking history read"""
+        return self.submit(self.client.get_user_history(user_id, limit, refresh)).result(timeout)
+
+    def get_statistics(self):
+        return self.client.get_statistics()
+
+    def close(self, timeout=5):
+        """Cancel unsent saves, stop the loop and the I/O pool"""
+        self.loop.call_soon_threadsafe(self.client.cancel_pending)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout)
+        self.client.close()
+        self.loop.close()
+
+
+# Testing and usage example
+if __name__ == "__main__":
+    import time
+
+    print("⚡ Async Firebase Client Test")
+    print("=" * 40)
+
+    class SlowDatabase:
+        """Stand-in database: 50 ms per write"""
+        def save_comparison_results(self, batch):
+            time.sleep(0.05)
+            return True, [f"-key{i}" for i in range(len(batch))]
+
+    io = FirebaseIO(SlowDatabase(), max_concurrency=2)
+    start = time.perf_counter()
+    futures = [io.save_comparison_result_nowait('user_1', {'i': i}) for i in range(200)]
+    results = [future.result() for future in futures]
+    print(f"200 saves in {(time.perf_counter() - start) * 1000:.0f}ms: {io.get_statistics()}")
+    io.close()
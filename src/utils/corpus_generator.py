@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+Synthetic Arabic-Name Corpus Generator for BlueEdge Framework
+=============================================================
+Seeded, streaming generator of production-like name records
+Features:
+- Zipf-distributed first/father/family name tokens (few very common names,
+  a long tail of rare ones) in the Arabic naming chain; the tail combines
+  ABDEL- compounds, ABU- kunyas and EL- nisbas
+- Distinct entities get distinct full names: a name already issued is
+  extended with ancestor tokens (the longer lineage real registries use);
+  the remaining name collision rate is reported
+- The six duplicate categories injected at controlled per-record rates
+- Ground truth on every record (entity id, original record, category)
+- Labelled comparison pairs in the ResultsReproducer test-case format
+- CSV / JSONL / NumPy (.npy, optional dependency) output
+- Records are yielded one at a time (memory grows only with the set of
+  issued entity names)
+- NumPy output streams into a memory-mapped .npy
+"""
+
+import os
+import csv
+import json
+import random
+import tempfile
+import warnings
+import itertools
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Category names match ResultsReproducer / detect_category
+DUPLICATE_CATEGORIES = (
+    'different_spelling',
+    'misspellings',
+    'name_abbreviations',
+    'honorific_prefixes',
+    'common_nicknames',
+    'split_names'
+)
+
+# Per-record probability of emitting a duplicate of each category (12% total)
+DEFAULT_CATEGORY_RATES = {category: 0.02 for category in DUPLICATE_CATEGORIES}
+
+# Token pools, most common first (rank drives the Zipf weight)
+MALE_FIRST_NAMES = [
+    'MOHAMMED', 'AHMED', 'MAHMOUD', 'MUSTAFA', 'ALI', 'OMAR', 'HASSAN', 'HUSSEIN', 'IBRAHIM', 'YOUSEF',
+    'KHALED', 'ABDULLAH', 'ABDULRAHMAN', 'SAYED', 'AMR', 'TAREK', 'WALEED', 'HAMZA', 'KARIM', 'SAMI',
+    'ADEL', 'NASSER', 'SALEH', 'FARES', 'ZIAD', 'YASSER', 'OSAMA', 'HESHAM', 'EMAD', 'MAJED',
+    'ASHRAF', 'ATEF', 'AYMAN', 'BASSEM', 'BILAL', 'GAMAL', 'HANI', 'HATEM', 'HAZEM', 'ISMAIL',
+    'JABER', 'KAMAL', 'MAGDY', 'MAHER', 'MAMDOUH', 'MARWAN', 'MEDHAT', 'MOAZ', 'MOUNIR', 'NABIL',
+    'RAMY', 'REDA', 'SABER', 'SAMEH', 'SHADY', 'SHERIF', 'TAHA', 'WAEL', 'YEHIA', 'ZAKARIA'
+]
+FEMALE_FIRST_NAMES = [
+    'FATIMA', 'MARIAM', 'AISHA', 'SARA', 'NOUR', 'YASMINE', 'ZAINAB', 'KHADIJA', 'HANA', 'LAYLA',
+    'AMIRA', 'SALMA', 'HAGAR', 'RANA', 'DINA', 'MONA', 'HEBA', 'REEM', 'NADIA', 'SAMIRA',
+    'ASMAA', 'BASMA', 'DOAA', 'EMAN', 'ESRAA', 'GHADA', 'HALA', 'HODA', 'JANA', 'LAMIA',
+    'MALAK', 'MANAL', 'MAHA', 'NAGLAA', 'NESMA', 'RASHA', 'RAWAN', 'SAFAA', 'SHAIMAA', 'WAFAA'
+]
+FAMILY_NAMES = [
+    'HASSAN', 'SALEM', 'ALI', 'OMAR', 'MAHMOUD', 'IBRAHIM', 'KHALIL', 'NASSER', 'SAEED', 'MANSOUR',
+    'HAMDAN', 'YOUSSEF', 'ABDELAZIZ', 'FAROUK', 'RASHID', 'ELSAYED', 'ABDELHAMID', 'SHAHIN', 'MOSTAFA',
+    'RAMADAN', 'SOLIMAN', 'ELNAGGAR', 'HAMED', 'AZIZ', 'BAKR', 'ZAKI', 'GAMAL', 'FAHMY', 'SHERIF', 'MORSI'
+]
+
+# Pool tails built by combination: ABDEL + a divine attribute (male names),
+# ABU + a first name (kunya family names) and EL + a place/trade (nisba)
+ABD_ATTRIBUTES = [
+    'RAHIM', 'MALIK', 'KARIM', 'HAKIM', 'MAJID', 'LATIF', 'WAHAB', 'RAZEK', 'FATTAH', 'ALIM',
+    'BASSET', 'HADI', 'SALAM', 'GHANI', 'KADER', 'GALIL', 'HALIM', 'MONEIM', 'SAMAD', 'SATTAR',
+    'GHAFFAR', 'KHALEK', 'BARI', 'WADOUD', 'HAFEZ', 'RAOUF', 'MOTTALEB', 'NASSER', 'MOHSEN', 'RAZZAK'
+]
+NISBA_ROOTS = [
+    'MASRY', 'SHAMY', 'HALABY', 'BAGHDADY', 'TANTAWY', 'SHARKAWY', 'DAMANHOURY', 'ASWANY', 'SOHAGY',
+    'GEZAWY', 'MANSOURY', 'SAIDY', 'FAYOUMY', 'MENOUFY', 'BEHEIRY', 'DESOUKY', 'ZAYAT', 'HADDAD',
+    'NAGGAR', 'SAYEGH', 'KHATIB', 'TAWIL', 'ATTAR', 'SHAZLY', 'GHAMRY', 'BANNA', 'SHENAWY', 'QASSAS'
+]
+MALE_FIRST_NAMES += [f'ABDEL{attribute}' for attribute in ABD_ATTRIBUTES]
+FAMILY_NAMES += [f'EL{root}' for root in NISBA_ROOTS if f'EL{root}' not in FAMILY_NAMES]
+FAMILY_NAMES += [f'ABU{name}' for name in MALE_FIRST_NAMES[:30]]
+
+# Transliteration variants (different spelling / pronunciation)
+SPELLING_VARIANTS = {
+    'MOHAMMED': ['MOHAMMAD', 'MOHAMED', 'MUHAMMAD'], 'AHMED': ['AHMAD'], 'MAHMOUD': ['MAHMOOD', 'MAHMUD'],
+    'MUSTAFA': ['MOSTAFA', 'MUSTAPHA'], 'ALI': ['ALY'], 'OMAR': ['OMER', 'UMAR'], 'HASSAN': ['HASAN'],
+    'HUSSEIN': ['HUSSAIN', 'HOSSEIN'], 'IBRAHIM': ['EBRAHIM', 'IBRAHEEM'], 'YOUSEF': ['YOUSSEF', 'YUSUF'],
+    'KHALED': ['KHALID'], 'ABDULLAH': ['ABDULLA', 'ABDALLAH'], 'ABDULRAHMAN': ['ABDELRAHMAN', 'ABDURRAHMAN'],
+    'SAYED': ['SAYYID', 'SAID'], 'AMR': ['AMRO'], 'TAREK': ['TARIQ', 'TAREQ'], 'WALEED': ['WALID'],
+    'HAMZA': ['HAMZAH'], 'KARIM': ['KAREEM'], 'SAMI': ['SAMY'], 'ADEL': ['ADIL'], 'NASSER': ['NASER', 'NASIR'],
+    'SALEH': ['SALIH'], 'FARES': ['FARIS'], 'ZIAD': ['ZIYAD', 'ZEYAD'], 'YASSER': ['YASER', 'YASIR'],
+    'OSAMA': ['USAMA'], 'HESHAM': ['HISHAM'], 'EMAD': ['IMAD'], 'MAJED': ['MAJID'],
+    'FATIMA': ['FATEMA', 'FATMA'], 'MARIAM': ['MARYAM'], 'AISHA': ['AYSHA', 'AICHA'], 'SARA': ['SARAH'],
+    'NOUR': ['NOOR'], 'YASMINE': ['YASMEEN', 'YASMIN'], 'ZAINAB': ['ZEINAB', 'ZAYNAB'],
+    'KHADIJA': ['KHADIGA', 'KHADEEJA'], 'HANA': ['HANAA'], 'LAYLA': ['LEILA', 'LAILA'], 'AMIRA': ['AMEERA'],
+    'SALMA': ['SELMA'], 'HAGAR': ['HAJAR'], 'RANA': ['RANAA'], 'DINA': ['DEENA'], 'MONA': ['MUNA'],
+    'HEBA': ['HIBA'], 'REEM': ['RIM'], 'NADIA': ['NADYA'], 'SAMIRA': ['SAMEERA'],
+    'SALEM': ['SALIM'], 'KHALIL': ['KHALEEL'], 'SAEED': ['SAID', 'SAEID'], 'MANSOUR': ['MANSUR'],
+    'HAMDAN': ['HAMDAAN'], 'YOUSSEF': ['YOUSEF', 'YUSUF'], 'ABDELAZIZ': ['ABDULAZIZ'], 'FAROUK': ['FAROOK', 'FARUQ'],
+    'RASHID': ['RASHED'], 'ELSAYED': ['ELSAYYED'], 'ABDELHAMID': ['ABDULHAMEED'], 'SHAHIN': ['SHAHEEN'],
+    'MOSTAFA': ['MUSTAFA'], 'RAMADAN': ['RAMADHAN'], 'SOLIMAN': ['SULEIMAN'], 'ELNAGGAR': ['ELNAJJAR'],
+    'HAMED': ['HAMID'], 'AZIZ': ['AZEEZ'], 'BAKR': ['BAKER'], 'ZAKI': ['ZAKY'], 'GAMAL': ['JAMAL'],
+    'FAHMY': ['FAHMI'], 'SHERIF': ['SHARIF'], 'MORSI': ['MORSY']
+}
+
+# Common nicknames of first names
+NICKNAMES = {
+    'MOHAMMED': ['HAMADA', 'HAMMOUDA'], 'AHMED': ['HAMADA'], 'MAHMOUD': ['MEDO'], 'MUSTAFA': ['MIZO'],
+    'OMAR': ['OMARY'], 'HASSAN': ['HASO'], 'IBRAHIM': ['BEBO'], 'YOUSEF': ['JOE'], 'KHALED': ['KHALOUDA'],
+    'ABDULLAH': ['ABDU'], 'ABDULRAHMAN': ['ABDO'], 'FATIMA': ['FIFI', 'FATOMA'], 'MARIAM': ['MIMI'],
+    'AISHA': ['SHOSHO'], 'SARA': ['SOSO'], 'NOUR': ['NONA'], 'ZAINAB': ['ZOZO'], 'KHADIJA': ['DIJA'],
+    'HEBA': ['HOBA'], 'MONA': ['MOUNI']
+}
+
+# Compound names written joined or split (ABDULRAHMAN / ABDUL RAHMAN)
+COMPOUND_SPLITS = {
+    'ABDULRAHMAN': ('ABDUL', 'RAHMAN'), 'ABDULLAH': ('ABD', 'ALLAH'), 'ABDELAZIZ': ('ABDEL', 'AZIZ'),
+    'ABDELHAMID': ('ABDEL', 'HAMID'), 'ELSAYED': ('EL', 'SAYED'), 'ELNAGGAR': ('EL', 'NAGGAR')
+}
+COMPOUND_SPLITS.update({f'ABDEL{attribute}': ('ABDEL', attribute) for attribute in ABD_ATTRIBUTES})
+COMPOUND_SPLITS.update({f'EL{root}': ('EL', root) for root in NISBA_ROOTS})
+COMPOUND_SPLITS.update({f'ABU{name}': ('ABU', name) for name in MALE_FIRST_NAMES[:30]})
+
+HONORIFICS = ['DR.', 'MR.', 'MRS.', 'MS.', 'PROF.']
+
+# Phonetic/keyboard substitutions seen in hand-typed transliterations
+TYPO_SUBSTITUTIONS = {'E': 'A', 'A': 'E', 'O': 'U', 'U': 'O', 'I': 'E', 'K': 'Q', 'S': 'Z', 'D': 'T', 'H': 'K'}
+
+
+class _ZipfSampler:
+    """Weighted token sampler with weight 1 / rank**exponent"""
+
+    def __init__(self, tokens, exponent):
+        self.tokens = tokens
+        self.cum_weights = list(itertools.accumulate(1.0 / (rank ** exponent) for rank in range(1, len(tokens) + 1)))
+
+    def sample(self, rng):
+        return rng.choices(self.tokens, cum_weights=self.cum_weights)[0]
+
+
+class CorpusGenerator:
+    """Seeded stream of synthetic name records with injected duplicates"""
+
+    def __init__(self, seed=42, category_rates=None, zipf_exponent=1.1,
+                 grandfather_rate=0.4, female_rate=0.45, window=10000,
+                 distinct_names=True, max_name_tokens=6):
+        """
+        Args:
+            seed: RNG seed (same seed = same corpus)
+            category_rates: {category: per-record duplicate probability}
+            zipf_exponent: Skew of token frequencies (higher = more common-name collisions)
+            grandfather_rate: Share of names with a grandfather token (4-part chain)
+            female_rate: Share of female first names
+            window: Recent originals a duplicate may copy (bounds memory)
+            distinct_names: Extend a new entity's name with ancestor tokens
+                while another entity already has it
+            max_name_tokens: Longest lineage used for disambiguation
+        """
+        self.rng = random.Random(seed)
+        self.category_rates = dict(DEFAULT_CATEGORY_RATES if category_rates is None else category_rates)
+        unknown = set(self.category_rates) - set(DUPLICATE_CATEGORIES)
+        if unknown:
+            raise ValueError(f"Unknown duplicate categories: {sorted(unknown)}")
+        if sum(self.category_rates.values()) > 1:
+            raise ValueError("Duplicate category rates must sum to at most 1")
+
+        self.grandfather_rate = grandfather_rate
+        self.female_rate = female_rate
+        self.distinct_names = distinct_names
+        self.max_name_tokens = max_name_tokens
+        self.male_first = _ZipfSampler(MALE_FIRST_NAMES, zipf_exponent)
+        self.female_first = _ZipfSampler(FEMALE_FIRST_NAMES, zipf_exponent)
+        self.family = _ZipfSampler(FAMILY_NAMES, zipf_exponent)
+
+        # Full names issued to entities so far, and how many repeated one
+        self.issued_names = set()
+        self.entities = 0
+        self.name_collisions = 0
+
+        # Ring buffer of recent originals: (record_id, entity_id, tokens)
+        self.window = [None] * window
+        self.window_fill = 0
+        self.window_position = 0
+
+        self.categories, cumulative = [], 0.0
+        self.category_thresholds = []
+        for category in DUPLICATE_CATEGORIES:
+            rate = self.category_rates.get(category, 0.0)
+            if rate > 0:
+                cumulative += rate
+                self.categories.append(category)
+                self.category_thresholds.append(cumulative)
+
+    # Name construction
+    def random_name_tokens(self):
+        """Tokens of a fresh full name: first, father, [grandfather], family"""
+        rng = self.rng
+        first = (self.female_first if rng.random() < self.female_rate else self.male_first).sample(rng)
+        tokens = [first, self.male_first.sample(rng)]
+        if rng.random() < self.grandfather_rate:
+            tokens.append(self.male_first.sample(rng))
+        tokens.append(self.family.sample(rng))
+        return tokens
+
+    def new_entity_tokens(self):
+        """Tokens of a new entity's name, extended with ancestors while already issued"""
+        tokens = self.random_name_tokens()
+        name = ' '.join(tokens)
+        while self.distinct_names and name in self.issued_names and len(tokens) < self.max_name_tokens:
+            # Uniform (not Zipf) ancestors: a common one would rarely disambiguate
+            tokens.insert(-1, self.rng.choice(MALE_FIRST_NAMES))
+            name = ' '.join(tokens)
+
+        self.entities += 1
+        if name in self.issued_names:
+            self.name_collisions += 1
+        else:
+            self.issued_names.add(name)
+        return tokens
+
+    def collision_rate(self):
+        """Share of entities generated so far whose full name an earlier entity already had"""
+        return self.name_collisions / self.entities if self.entities else 0.0
+
+    def _misspell(self, token):
+        rng = self.rng
+        if len(token) < 3:
+            return token + token[-1]
+        position = rng.randrange(1, len(token))
+        operation = rng.randrange(4)
+        if operation == 0:  # deletion
+            return token[:position] + token[position + 1:]
+        if operation == 1:  # doubled letter
+            return token[:position] + token[position] + token[position:]
+        if operation == 2 and position < len(token) - 1:  # transposition
+            return token[:position] + token[position + 1] + token[position] + token[position + 2:]
+        substitute = TYPO_SUBSTITUTIONS.get(token[position], 'A' if token[position] != 'A' else 'E')
+        return token[:position] + substitute + token[position + 1:]
+
+    def make_duplicate(self, tokens, category):
+        """
+        Apply one category's variation to a name
+
+        Returns:
+            tuple: (duplicate tokens, category actually applied)
+        """
+        rng = self.rng
+        tokens = list(tokens)
+
+        if category == 'different_spelling':
+            positions = [i for i, token in enumerate(tokens) if token in SPELLING_VARIANTS]
+            if positions:
+                for position in rng.sample(positions, rng.randint(1, len(positions))):
+                    tokens[position] = rng.choice(SPELLING_VARIANTS[tokens[position]])
+                return tokens, category
+            category = 'misspellings'
+
+        if category == 'common_nicknames':
+            if tokens[0] in NICKNAMES:
+                tokens[0] = rng.choice(NICKNAMES[tokens[0]])
+                return tokens, category
+            category = 'misspellings'
+
+        if category == 'misspellings':
+            position = rng.randrange(len(tokens))
+            misspelled = self._misspell(tokens[position])
+            tokens[position] = misspelled if misspelled != tokens[position] else tokens[position] + 'H'
+            return tokens, category
+
+        if category == 'name_abbreviations':
+            tokens[0] = tokens[0][0] + '.'
+            return tokens, category
+
+        if category == 'honorific_prefixes':
+            return [rng.choice(HONORIFICS)] + tokens, category
+
+        if category == 'split_names':
+            compound = [i for i, token in enumerate(tokens) if token in COMPOUND_SPLITS]
+            if compound:
+                position = rng.choice(compound)
+                tokens[position:position + 1] = COMPOUND_SPLITS[tokens[position]]
+            elif len(tokens) > 3:
+                del tokens[rng.randrange(1, len(tokens) - 1)]
+            else:
+                tokens.insert(2, self.male_first.sample(rng))
+            return tokens, category
+
+        raise ValueError(f"Unknown duplicate category '{category}'")
+
+    def _pick_category(self):
+        draw = self.rng.random()
+        for category, threshold in zip(self.categories, self.category_thresholds):
+            if draw < threshold:
+                return category
+        return None
+
+    @staticmethod
+    def _applicable(tokens, category):
+        """Whether a category's lexicon covers the name"""
+        if category == 'common_nicknames':
+            return tokens[0] in NICKNAMES
+        if category == 'different_spelling':
+            return any(token in SPELLING_VARIANTS for token in tokens)
+        return True
+
+    def _pick_original(self, category, attempts=8):
+        """A recent original the category applies to (falls back to any after a few tries)"""
+        for _ in range(attempts):
+            original = self.window[self.rng.randrange(self.window_fill)]
+            if self._applicable(original[2], category):
+                return original
+        return original
+
+    def _remember(self, record_id, entity_id, tokens):
+        self.window[self.window_position] = (record_id, entity_id, tokens)
+        self.window_position = (self.window_position + 1) % len(self.window)
+        self.window_fill = min(self.window_fill + 1, len(self.window))
+
+    # Streams
+    def records(self, count):
+        """
+        Yield `count` records with ground truth
+
+        Each record: record_id, entity_id, full_name, first_name,
+        duplicate_of (record_id of the original or None), category (or None)
+        """
+        next_entity = 0
+        for record_id in range(count):
+            category = self._pick_category() if self.window_fill else None
+
+            if category is None:
+                tokens = self.new_entity_tokens()
+                entity_id, duplicate_of = next_entity, None
+                next_entity += 1
+                self._remember(record_id, entity_id, tokens)
+            else:
+                duplicate_of, entity_id, original = self._pick_original(category)
+                tokens, category = self.make_duplicate(original, category)
+
+            yield {
+                'record_id': record_id,
+                'entity_id': entity_id,
+                'full_name': ' '.join(tokens),
+                'first_name': tokens[0],
+                'duplicate_of': duplicate_of,
+                'category': category
+            }
+
+    def labeled_pairs(self, count, duplicate_share=0.5, hard_negative_rate=0.5):
+        """
+        Yield `count` comparison cases in the ResultsReproducer format
+
+        Args:
+            duplicate_share: Share of duplicate pairs (split across the configured categories)
+            hard_negative_rate: Share of non-duplicates that share the family name
+
+        Each case: type, name1, name2, is_duplicate, case_id
+        """
+        rng = self.rng
+        weights = [self.category_rates.get(category, 0.0) for category in DUPLICATE_CATEGORIES]
+        if not any(weights):
+            weights = [1.0] * len(DUPLICATE_CATEGORIES)
+
+        for index in range(count):
+            tokens = self.random_name_tokens()
+            if rng.random() < duplicate_share:
+                requested = rng.choices(DUPLICATE_CATEGORIES, weights=weights)[0]
+                for _ in range(8):
+                    if self._applicable(tokens, requested):
+                        break
+                    tokens = self.random_name_tokens()
+                other, case_type = self.make_duplicate(tokens, requested)
+                is_duplicate = True
+            else:
+                other = self.random_name_tokens()
+                if rng.random() < hard_negative_rate:
+                    other[-1] = tokens[-1]
+                case_type, is_duplicate = 'non_duplicate', False
+                if other == tokens:
+                    other[0] = rng.choice([n for n in MALE_FIRST_NAMES if n != tokens[0]])
+
+            yield {
+                'type': case_type,
+                'name1': ' '.join(tokens),
+                'name2': ' '.join(other),
+                'is_duplicate': is_duplicate,
+                'case_id': f'SYN_{index}'
+            }
+
+
+RECORD_FIELDS = ['record_id', 'entity_id', 'full_name', 'first_name', 'duplicate_of', 'category']
+
+
+def write_csv(rows, path, fields=None):
+    """Stream dict rows to CSV; returns the number of rows written"""
+    rows = iter(rows)
+    first = next(rows, None)
+    if first is None:
+        open(path, 'w').close()
+        return 0
+
+    written = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=fields or list(first))
+        writer.writeheader()
+        for row in itertools.chain([first], rows):
+            writer.writerow(row)
+            written += 1
+    return written
+
+
+def write_jsonl(rows, path):
+    """Stream dict rows to JSON Lines; returns the number of rows written"""
+    written = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for row in rows:
+            f.write(json.dumps(row, ensure_ascii=False))
+            f.write('\n')
+            written += 1
+    return written
+
+
+def _numpy_chunks(records, dtype, chunk_size):
+    """Structured-array chunks of records, plus the names too long for their field"""
+    widths = {field: dtype[field].itemsize // 4 for field in ('full_name', 'first_name')}
+    truncated = {field: 0 for field in widths}
+    buffer = []
+    for record in records:
+        for field, width in widths.items():
+            if len(record[field]) > width:
+                truncated[field] += 1
+        buffer.append((
+            record['record_id'], record['entity_id'], record['full_name'], record['first_name'],
+            -1 if record['duplicate_of'] is None else record['duplicate_of'], record['category'] or ''
+        ))
+        if len(buffer) >= chunk_size:
+            yield np.array(buffer, dtype=dtype), truncated
+            buffer = []
+    if buffer:
+        yield np.array(buffer, dtype=dtype), truncated
+
+
+def write_numpy(records, path, count=None, name_width=64, chunk_size=100000):
+    """
+    Save records as a NumPy structured array (.npy); requires numpy
+
+    Chunks are written into a memory-mapped .npy, so memory stays at one
+    chunk. Missing duplicate_of is stored as -1 and missing category as ''.
+    Names longer than their field are truncated with a warning.
+
+    Args:
+        count: Number of records, when known (otherwise the records are
+            spooled to a temporary file first to count them)
+        name_width: Characters kept of full_name
+    """
+    if np is None:
+        raise ImportError("NumPy output requires numpy (pip install numpy)")
+
+    dtype = np.dtype([
+        ('record_id', np.int64), ('entity_id', np.int64),
+        ('full_name', f'U{name_width}'), ('first_name', 'U24'),
+        ('duplicate_of', np.int64), ('category', 'U20')
+    ])
+    truncated = {}
+
+    if count is None:
+        with tempfile.TemporaryFile(dir=os.path.dirname(os.path.abspath(path))) as spool:
+            count = 0
+            for chunk, truncated in _numpy_chunks(records, dtype, chunk_size):
+                chunk.tofile(spool)
+                count += len(chunk)
+            array = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(count,))
+            spool.seek(0)
+            for offset in range(0, count, chunk_size):
+                chunk = np.fromfile(spool, dtype=dtype, count=min(chunk_size, count - offset))
+                array[offset:offset + len(chunk)] = chunk
+    else:
+        array = np.lib.format.open_memmap(path, mode='w+', dtype=dtype, shape=(count,))
+        written = 0
+        for chunk, truncated in _numpy_chunks(records, dtype, chunk_size):
+            if written + len(chunk) > count:
+                raise ValueError(f"More than the {count} records announced")
+            array[written:written + len(chunk)] = chunk
+            written += len(chunk)
+        if written != count:
+            raise ValueError(f"Expected {count} records, got {written}")
+
+    array.flush()
+    del array
+
+    for field, names in truncated.items():
+        if names:
+            warnings.warn(f"{names} {field} values longer than {dtype[field].itemsize // 4} characters "
+                          f"were truncated in {path}" + (" (raise name_width)" if field == 'full_name' else ''))
+    return count
+
+
+def save_corpus(rows, path, output_format=None, count=None):
+    """
+    Write rows in the format given or implied by the extension (.csv/.jsonl/.npy)
+
+    Args:
+        count: Number of rows, when known (lets .npy output stream)
+    """
+    output_format = output_format or path.rsplit('.', 1)[-1].lower()
+    if output_format == 'csv':
+        return write_csv(rows, path)
+    if output_format in ('jsonl', 'ndjson'):
+        return write_jsonl(rows, path)
+    if output_format in ('npy', 'numpy'):
+        return write_numpy(rows, path, count)
+    raise ValueError(f"Unsupported corpus format '{output_format}' (csv, jsonl or npy)")
+
+
+# Testing and usage example
+if __name__ == "__main__":
+    from collections import Counter
+
+    print("🧬 Corpus Generator Test")
+    print("=" * 40)
+
+    generator = CorpusGenerator(seed=7)
+    sample = list(generator.records(20000))
+    categories = Counter(record['category'] for record in sample)
+    names = Counter(record['full_name'] for record in sample)
+
+    print(f"Records: {len(sample)}, distinct names: {len(names)}, "
+          f"entity name collisions: {generator.collision_rate():.2%}")
+    for category, count in categories.most_common():
+        print(f"  {category or 'original'}: {count} ({count / len(sample):.1%})")
+    for record in sample[:5]:
+        print(f"  {record}")
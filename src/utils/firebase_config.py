@@ -18,23 +18,108 @@ import time
 import os
 import uuid
 import sys
+import random
+from collections import OrderedDict
+
+try:
+    from .http_client import HTTPClient
+    from .sync_outbox import SyncOutbox
+    from .wire_schema import SESSION_METADATA, encode_record, encode_history_entry, decode_record
+    from .history_store import HistoryStore
+    from .async_firebase import FirebaseIO
+    from .rate_limiter import TokenBucket
+except ImportError:
+    from http_client import HTTPClient
+    from sync_outbox import SyncOutbox
+    from wire_schema import SESSION_METADATA, encode_record, encode_history_entry, decode_record
+    from history_store import HistoryStore
+    from async_firebase import FirebaseIO
+    from rate_limiter import TokenBucket
+
+# Realtime Database URL (override with BLUEEDGE_FIREBASE_URL, e.g. a local stand-in)
+DEFAULT_DATABASE_URL = "https://blueedge-framework-default-rtdb.firebaseio.com"
+
+# Durable sync outbox location (override with BLUEEDGE_OUTBOX)
+DEFAULT_OUTBOX_PATH = os.path.join('data', 'blueedge_outbox.db')
+
+# Client-side write budget shared by sync and UI writes (requests/s, burst)
+DEFAULT_WRITE_RATE = 2.0
+DEFAULT_WRITE_BURST = 10
+
+# Sync queue overflow policies (see FirebaseSync.add_to_sync_queue)
+OVERFLOW_POLICIES = ('block', 'shed', 'coalesce')
+
+# Why a write failed: 'transient' (offline, timeout, 408/429/5xx - retry later
+# without counting it against the item) or 'rejected' (the server refused the data)
+FAILURE_TRANSIENT = 'transient'
+FAILURE_REJECTED = 'rejected'
+
+# Local history store location (override with BLUEEDGE_HISTORY)
+DEFAULT_HISTORY_PATH = os.path.join('data', 'blueedge_history.db')
+
+# Firebase push-key alphabet (ASCII order, so keys sort by creation time)
+PUSH_CHARS = '-0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ_abcdefghijklmnopqrstuvwxyz'
+_push_lock = threading.Lock()
+_last_push_time = 0
+_last_push_random = []
+
+
+def generate_push_key():
+    """
+    Generate a Firebase-style push key on the client
+    
+    8 timestamp characters + 12 random characters. Keys made within the same
+    millisecond increment the random part, so they stay unique and ordered.
+    """
+    global _last_push_time, _last_push_random
+    
+    with _push_lock:
+        now = int(time.time() * 1000)
+        if now == _last_push_time:
+            position = len(_last_push_random) - 1
+            while position >= 0 and _last_push_random[position] == len(PUSH_CHARS) - 1:
+                _last_push_random[position] = 0
+                position -= 1
+            if position >= 0:
+                _last_push_random[position] += 1
+        else:
+            _last_push_time = now
+            _last_push_random = [random.randrange(len(PUSH_CHARS)) for _ in range(12)]
+        
+        time_chars = []
+        for _ in range(8):
+            time_chars.append(PUSH_CHARS[now % 64])
+            now //= 64
+        return ''.join(reversed(time_chars)) + ''.join(PUSH_CHARS[i] for i in _last_push_random)
+
+
+def is_transient_status(status_code):
+    """True for HTTP statuses worth retrying unchanged (timeouts, throttling, server errors)"""
+    return status_code in (408, 429) or status_code >= 500
+
 
 class FirebaseConfig:
     """Firebase Realtime Database Configuration for BlueEdge"""
     
-    def __init__(self):
+    def __init__(self, database_url=None):
         # Firebase Project Configuration
         # TODO: Update these values after creating Firebase project
         self.project_id = "blueedge-framework"
-        self.database_url = "https://blueedge-framework-default-rtdb.firebaseio.com"
+        self.database_url = (database_url or os.environ.get('BLUEEDGE_FIREBASE_URL', DEFAULT_DATABASE_URL)).rstrip('/')
         self.api_key = "YOUR_API_KEY_HERE"  # Will be updated from Firebase console
         
         # Database endpoints
+        self.root_endpoint = f"{self.database_url}/.json"
         self.users_endpoint = f"{self.database_url}/users.json"
         self.comparisons_endpoint = f"{self.database_url}/comparisons.json"
         self.statistics_endpoint = f"{self.database_url}/statistics.json"
         self.sessions_endpoint = f"{self.database_url}/sessions.json"
         
+        # Shared keep-alive HTTP client for all Firebase I/O
+        self.http = HTTPClient(pool_maxsize=8, retries=2, backoff_factor=0.5, timeout=10)
+        # One write budget for the device keeps server quota and radio use predictable
+        self.write_limiter = TokenBucket(rate=DEFAULT_WRITE_RATE, capacity=DEFAULT_WRITE_BURST)
+        
         # Connection status
         self.connected = False
         self.last_sync = None
@@ -44,17 +129,24 @@ class FirebaseConfig:
         print("🔥 Firebase Config initialized for BlueEdge")
         
     def test_connection(self):
-        """Test Firebase connection with retry logic"""
+        """Test Firebase connection with retry logic (a failed test clears connected)"""
+        success, message = self._probe_connection()
+        if not success:
+            self.connected = False
+        return success, message
+    
+    def _probe_connection(self):
+        """One shallow GET of the database root"""
         self.connection_attempts += 1
         
         try:
             print(f"🔗 Testing Firebase connection (attempt {self.connection_attempts})...")
             
-            # Test with timeout
-            response = requests.get(
-                f"{self.database_url}/.json", 
-                timeout=8,
-                headers={'User-Agent': 'BlueEdge-Framework/1.0'}
+            # Test with timeout (shallow: do not download the whole database)
+            response = self.http.get(
+                self.root_endpoint,
+                params={'shallow': 'true'},
+                timeout=8
             )
             
             if response.status_code == 200:
@@ -91,6 +183,12 @@ class FirebaseConfig:
         """Check if Firebase is currently connected"""
         return self.connected
     
+    def mark_disconnected(self, reason):
+        """Record a lost connection (connection error or timeout on a request)"""
+        if self.connected:
+            print(f"📴 Firebase connection lost: {reason}")
+        self.connected = False
+    
     def get_connection_info(self):
         """Get detailed connection information"""
         return {
@@ -101,164 +199,449 @@ class FirebaseConfig:
             'database_url': self.database_url
         }
 
+def merge_statistics(current_stats, delta):
+    """
+    Global statistics document after adding an aggregated delta
+    
+    Args:
+        current_stats: Statistics document as stored in Firebase (or {})
+        delta: StatisticsAggregator delta (counts, sums, min/max, categories)
+    """
+    count = delta['comparisons']
+    duplicates = delta['duplicates']
+    previous_count = current_stats.get("total_comparisons", 0)
+    previous_time = current_stats.get(
+        "total_processing_time",
+        current_stats.get("average_processing_time", 0) * previous_count
+    )
+    total_count = previous_count + count
+    total_time = previous_time + delta['processing_time']
+    
+    distribution = dict(current_stats.get("category_distribution", {}))
+    for category, category_count in delta['categories'].items():
+        distribution[category] = distribution.get(category, 0) + category_count
+    
+    # Accuracy placeholder (needs ground truth): duplicates count as correct, others as 85%
+    correct = current_stats.get("correct_predictions", previous_count * 0.85) + duplicates + 0.85 * (count - duplicates)
+    
+    return {
+        # Basic counters
+        "total_comparisons": total_count,
+        "total_duplicates_found": current_stats.get("total_duplicates_found", 0) + duplicates,
+        "total_unique_pairs": current_stats.get("total_unique_pairs", 0) + (count - duplicates),
+        
+        # Performance metrics
+        "average_processing_time": total_time / total_count if total_count else 0,
+        "total_processing_time": total_time,
+        "min_processing_time": min(current_stats.get("min_processing_time", float('inf')), delta['min_time']),
+        "max_processing_time": max(current_stats.get("max_processing_time", 0), delta['max_time']),
+        
+        # Category distribution
+        "category_distribution": distribution,
+        
+        # BlueEdge specific metrics
+        "mobile_edge_sessions": current_stats.get("mobile_edge_sessions", 0) + count,
+        "memory_efficiency": "5KB_per_comparison",
+        "platform_type": "mobile_edge_computing",
+        "accuracy_rate": min(1.0, correct / total_count) if total_count else 0.85,
+        
+        # Metadata
+        "last_updated": datetime.now().isoformat(),
+        "framework_info": {
+            "name": "BlueEdge",
+            "version": "1.0.0",
+            "algorithm": "levenshtein_enhanced",
+            "supported_categories": 6,
+            "languages": ["english", "arabic"]
+        }
+    }
+
+class StatisticsAggregator:
+    """Local aggregation of global statistics, flushed as one merged delta
+    
+    Saves only update in-memory counters; a background thread merges the
+    delta into the Firebase document every flush_interval seconds (or once
+    flush_size comparisons are pending) with an ETag conditional write, so
+    concurrent devices cannot overwrite each other's updates. Without an
+    ETag the write is never sent unconditionally: the document is read
+    again, and the flush fails (keeping the delta) if none arrives.
+    """
+    
+    def __init__(self, config: FirebaseConfig, flush_interval=60, flush_size=200, max_attempts=5):
+        """
+        Args:
+            config: FirebaseConfig (endpoint and shared HTTP client)
+            flush_interval: Seconds between flushes
+            flush_size: Pending comparisons that trigger an early flush
+            max_attempts: Conditional writes tried per flush before giving up
+        """
+        self.config = config
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.max_attempts = max_attempts
+        
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.delta = self._empty_delta()
+        self.wake_event = threading.Event()
+        self.flush_thread = None
+        self.running = False
+        
+        # Statistics
+        self.flushes = 0
+        self.conflicts = 0
+        self.missing_etags = 0
+        self.failed_flushes = 0
+    
+    @staticmethod
+    def _empty_delta():
+        return {'comparisons': 0, 'duplicates': 0, 'processing_time': 0.0,
+                'min_time': float('inf'), 'max_time': 0, 'categories': {}}
+    
+    @staticmethod
+    def _combine(target, delta):
+        """Add one delta into another"""
+        target['comparisons'] += delta['comparisons']
+        target['duplicates'] += delta['duplicates']
+        target['processing_time'] += delta['processing_time']
+        target['min_time'] = min(target['min_time'], delta['min_time'])
+        target['max_time'] = max(target['max_time'], delta['max_time'])
+        for category, count in delta['categories'].items():
+            target['categories'][category] = target['categories'].get(category, 0) + count
+    
+    def add(self, record):
+        """Count one saved comparison record"""
+        processing_time = record.get('processing_time', 0)
+        category = record.get('error_category', 'unknown')
+        
+        with self.lock:
+            delta = self.delta
+            delta['comparisons'] += 1
+            delta['duplicates'] += 1 if record.get('duplicate_status', False) else 0
+            delta['processing_time'] += processing_time
+            delta['min_time'] = min(delta['min_time'], processing_time)
+            delta['max_time'] = max(delta['max_time'], processing_time)
+            if category and category != 'unknown':
+                delta['categories'][category] = delta['categories'].get(category, 0) + 1
+            pending = delta['comparisons']
+        
+        self.start()
+        if pending >= self.flush_size:
+            self.wake_event.set()
+    
+    def pending_count(self):
+        """Comparisons not yet flushed"""
+        with self.lock:
+            return self.delta['comparisons']
+    
+    def flush(self):
+        """
+        Merge the pending delta into the Firebase statistics document
+        
+        Reads the document with its ETag and writes it back with if-match;
+        on 412 (another writer got there first) it re-merges into the
+        returned document and tries again. A response without an ETag
+        counts as an attempt and the document is read again (an if-match
+        of None would make the write unconditional). A failed flush keeps
+        the delta.
+        
+        Returns:
+            bool: True when nothing was pending or the write succeeded
+        """
+        with self.flush_lock:
+            with self.lock:
+                delta, self.delta = self.delta, self._empty_delta()
+            if not delta['comparisons']:
+                return True
+            
+            try:
+                etag, current_stats, failure = None, {}, None
+                for attempt in range(self.max_attempts):
+                    if not etag:
+                        response = self.config.http.get(
+                            self.config.statistics_endpoint,
+                            headers={'X-Firebase-ETag': 'true'},
+                            timeout=5
+                        )
+                        if response.status_code != 200:
+                            failure = f"HTTP {response.status_code}"
+                            break
+                        etag, current_stats = response.headers.get('ETag'), response.json() or {}
+                        if not etag:
+                            self.missing_etags += 1
+                            failure = "no ETag from server (refusing an unconditional write)"
+                            continue
+                    
+                    response = self.config.http.put(
+                        self.config.statistics_endpoint,
+                        json=merge_statistics(current_stats, delta),
+                        headers={'if-match': etag}
+                    )
+                    if response.status_code == 200:
+                        self.flushes += 1
+                        print(f"📊 Statistics updated successfully ({delta['comparisons']} comparisons)")
+                        return True
+                    failure = f"HTTP {response.status_code}"
+                    if response.status_code != 412:
+                        break
+                    # Conflict: the 412 response carries the current document and ETag
+                    # (without one, the next attempt reads the document again)
+                    self.conflicts += 1
+                    etag, current_stats = response.headers.get('ETag'), response.json() or {}
+                
+                print(f"❌ Statistics update failed: {failure}")
+                
+            except Exception as e:
+                print(f"❌ Statistics update error: {str(e)}")
+            
+            # Keep the delta for the next flush
+            self.failed_flushes += 1
+            with self.lock:
+                self._combine(self.delta, delta)
+            return False
+    
+    def start(self):
+        """Start the background flush thread (idempotent)"""
+        with self.lock:
+            if self.running:
+                return
+            self.running = True
+        self.flush_thread = threading.Thread(target=self._flush_loop, daemon=True)
+        self.flush_thread.start()
+    
+    def stop(self):
+        """Stop the flush thread and flush what is pending"""
+        if self.running:
+            self.running = False
+            self.wake_event.set()
+            if self.flush_thread and self.flush_thread.is_alive():
+                self.flush_thread.join(timeout=3)
+        return self.flush()
+    
+    def _flush_loop(self):
+        while self.running:
+            self.wake_event.wait(self.flush_interval)
+            self.wake_event.clear()
+            if self.running and self.config.is_connected():
+                self.flush()
+    
+    def get_statistics(self):
+        """Aggregator status"""
+        return {
+            'pending_comparisons': self.pending_count(),
+            'flushes': self.flushes,
+            'conflicts': self.conflicts,
+            'missing_etags': self.missing_etags,
+            'failed_flushes': self.failed_flushes
+        }
+
 class FirebaseDatabase:
     """Firebase Realtime Database Operations for BlueEdge"""
     
-    def __init__(self, config: FirebaseConfig):
+    def __init__(self, config: FirebaseConfig, history_path=None):
         self.config = config
-        self.local_cache = {}
         self.request_timeout = 10
+        self.statistics = StatisticsAggregator(config)
+        
+        # Local history: the UI reads from here, Firebase only sends what is new
+        self.history = HistoryStore(history_path or os.environ.get('BLUEEDGE_HISTORY', DEFAULT_HISTORY_PATH))
+        self.history_page_size = 100  # entries per delta request
+        self.history_requests = 0
+        self.history_entries_fetched = 0
+        
+        # Constant framework metadata is written once per session (wire schema v2)
+        self.session_id = f"session_{int(time.time())}_{uuid.uuid4().hex[:8]}"
+        self.session_metadata_sent = False
         print("📁 Firebase Database handler initialized for BlueEdge")
         
     def save_comparison_result(self, user_id, comparison_data):
         """Save BlueEdge name comparison result to Firebase"""
+        success, keys = self.save_comparison_results([(user_id, comparison_data)])
+        return success, (keys[0] if success else None)
+    
+    def save_comparison_results(self, batch):
+        """
+        Save many comparison results in one multi-path write
+        
+        See write_comparison_batch.
+        
+        Returns:
+            tuple: (success, Firebase keys in batch order)
+        """
+        success, keys, _ = self.write_comparison_batch(batch)
+        return success, keys
+    
+    def write_comparison_batch(self, batch):
+        """
+        Save many comparison results in one multi-path write
+        
+        Every record is written to comparisons/<key> and, as a short history
+        entry, to user_history/<user_id>/<key>. Push keys are generated on
+        the client, so the whole batch is a single PATCH (one round trip).
+        Records use the compact wire schema; the first batch of a session
+        also writes sessions/<session_id> with the framework metadata.
+        Failures are not retried inline; the sync queue retries the batch.
+        A connection error or timeout also marks Firebase disconnected.
+        
+        Args:
+            batch: List of (user_id, comparison_data) or
+                (user_id, comparison_data, push_key) tuples; a given key
+                (e.g. an outbox idempotency key) makes replays overwrite
+                the same paths instead of adding duplicates
+            
+        Returns:
+            tuple: (success, Firebase keys in batch order, failure) where
+                failure is None, FAILURE_TRANSIENT or FAILURE_REJECTED
+        """
         if not self.config.is_connected():
             print("❌ Cannot save - Firebase not connected")
-            return False, None
+            return False, [], FAILURE_TRANSIENT
+        if not batch:
+            return True, [], None
             
         try:
-            # Generate unique session ID
-            session_id = f"session_{int(time.time())}_{uuid.uuid4().hex[:8]}"
-            timestamp = datetime.now().isoformat()
-            
-            # Enhanced data structure for BlueEdge compatibility
-            data = {
-                # User and session info
-                "user_id": user_id,
-                "session_id": session_id,
-                "timestamp": timestamp,
-                
-                # Original comparison data from BlueEdge
-                "comparison_results": comparison_data,
-                
-                # Performance metrics (BlueEdge standard)
-                "processing_time": comparison_data.get("processing_time", 0),
-                "memory_usage": "~5KB",  # BlueEdge standard
-                "platform": "mobile_edge_computing",
+            updates, keys, records = {}, [], []
+            for user_id, comparison_data, *push_key in batch:
+                key = push_key[0] if push_key else generate_push_key()
+                record = self._build_comparison_record(user_id, comparison_data)
+                updates[f"comparisons/{key}"] = record
+                updates[f"user_history/{user_id}/{key}"] = self._build_history_entry(record)
+                keys.append(key)
+                records.append(record)
+            if not self.session_metadata_sent:
+                updates[f"sessions/{self.session_id}"] = dict(SESSION_METADATA, started=int(time.time() * 1000))
+            
+            print(f"💾 Saving {len(batch)} comparison(s) to Firebase in one write")
+            
+            response = self.config.http.patch(
+                self.config.root_endpoint,
+                json=updates,
+                timeout=self.request_timeout
+            )
+            
+            if response.status_code == 200:
+                print(f"✅ Data saved to Firebase: {len(keys)} record(s)")
+                self.session_metadata_sent = True
                 
-                # Analysis results
-                "similarity_score": comparison_data.get("similarity_score", 0),
-                "duplicate_status": comparison_data.get("is_duplicate", False),
-                "confidence_level": comparison_data.get("confidence_level", "unknown"),
-                "error_category": comparison_data.get("category", "unknown"),
-                "error_types_detected": comparison_data.get("error_types", []),
+                # Own writes go straight into the local history
+                self.history.put(
+                    (batch_item[0], key, self._build_history_entry(record))
+                    for batch_item, key, record in zip(batch, keys, records)
+                )
                 
-                # Name data (structured)
-                "name1_data": {
-                    "full_name": comparison_data.get("name1", ""),
-                    "processed": comparison_data.get("name1_processed", "")
-                },
-                "name2_data": {
-                    "full_name": comparison_data.get("name2", ""),
-                    "processed": comparison_data.get("name2_processed", "")
-                },
+                # Aggregate global statistics locally (flushed periodically)
+                for record in records:
+                    self.statistics.add(decode_record(record))
                 
-                # BlueEdge framework metadata
-                "framework": {
-                    "name": "BlueEdge",
-                    "version": "1.0.0",
-                    "algorithm_type": "levenshtein_enhanced",
-                    "mobile_optimized": True,
-                    "language_support": ["english", "arabic"],
-                    "categories_supported": [
-                        "different_spelling", "misspelling", "abbreviation",
-                        "honorific_prefix", "nickname", "split_name"
-                    ]
-                }
-            }
+                return True, keys, None
             
-            print(f"💾 Saving comparison to Firebase for user: {user_id}")
+            print(f"❌ Firebase save failed: HTTP {response.status_code}")
+            failure = FAILURE_TRANSIENT if is_transient_status(response.status_code) else FAILURE_REJECTED
+            return False, [], failure
+            
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            print(f"❌ Firebase save request error: {e}")
+            self.config.mark_disconnected(type(e).__name__)
+            return False, [], FAILURE_TRANSIENT
+            
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Firebase save request error: {e}")
+            return False, [], FAILURE_TRANSIENT
             
-            # Send to Firebase with retry logic
-            for attempt in range(2):
-                try:
-                    response = requests.post(
-                        self.config.comparisons_endpoint,
-                        json=data,
-                        timeout=self.request_timeout,
-                        headers={'User-Agent': 'BlueEdge-Framework/1.0'}
-                    )
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        firebase_key = result.get('name', 'unknown')
-                        print(f"✅ Data saved to Firebase: {firebase_key}")
-                        
-                        # Update global statistics
-                        self._update_statistics_async(data)
-                        
-                        return True, firebase_key
-                    else:
-                        print(f"❌ Firebase save failed: HTTP {response.status_code}")
-                        if attempt == 0:
-                            print("🔄 Retrying save operation...")
-                            time.sleep(1)
-                        
-                except requests.exceptions.RequestException as e:
-                    print(f"❌ Firebase save request error (attempt {attempt + 1}): {e}")
-                    if attempt == 0:
-                        time.sleep(1)
-            
-            return False, None
-                
         except Exception as e:
             print(f"❌ Firebase save error: {str(e)}")
-            return False, None
+            return False, [], FAILURE_REJECTED
     
-    def get_user_history(self, user_id, limit=10):
-        """Retrieve user's comparison history from Firebase"""
-        if not self.config.is_connected():
-            print("❌ Cannot load history - Firebase not connected")
-            return False, []
+    def _build_comparison_record(self, user_id, comparison_data):
+        """Build the stored comparisons/<key> record (compact wire schema)"""
+        return encode_record(user_id, comparison_data, self.session_id)
+    
+    def _build_history_entry(self, record):
+        """Short copy of a record for user_history/<user_id>/ (enough for the history list)"""
+        return encode_history_entry(record)
+    
+    def get_user_history(self, user_id, limit=10, refresh=True):
+        """
+        User's comparison history, newest first, served from the local store
+        
+        A refresh fetches only the keys from the user's cursor on (the first
+        one fetches the latest 50), so an unchanged history costs one small
+        request. Offline, the stored history is returned as it is.
+        
+        Args:
+            user_id: User whose history to load
+            limit: Entries returned
+            refresh: Fetch new entries from Firebase first
             
+        Returns:
+            tuple: (success, history entries with 'firebase_key' and 'display')
+        """
+        success = True
+        if refresh:
+            if self.config.is_connected():
+                success = self.refresh_user_history(user_id)
+            else:
+                print("📴 Firebase not connected - showing locally stored history")
+        
+        history = []
+        for key, entry in self.history.recent(user_id, limit):
+            value = decode_record(entry)
+            value['firebase_key'] = key
+            # Add formatted display data
+            value['display'] = self._format_history_item(value)
+            history.append(value)
+        
+        return success or bool(history), history
+    
+    def refresh_user_history(self, user_id):
+        """
+        Fetch history entries newer than the user's cursor into the local store
+        
+        Firebase REST has no conditional GET for queries, so the cursor is the
+        condition: startAt is inclusive and an unchanged history returns just
+        the cursor entry. Long gaps are fetched in pages of history_page_size.
+        
+        Returns:
+            bool: True when the store is up to date
+        """
+        url = f"{self.config.database_url}/user_history/{user_id}.json"
+        cursor = self.history.cursor(user_id)
+        
         try:
-            print(f"📖 Loading history for user: {user_id}")
-            
-            # Query Firebase for user data
-            params = {
-                'orderBy': '"user_id"',
-                'equalTo': f'"{user_id}"',
-                'limitToLast': min(limit, 50)  # Limit to prevent large downloads
-            }
-            
-            response = requests.get(
-                self.config.comparisons_endpoint,
-                params=params,
-                timeout=self.request_timeout,
-                headers={'User-Agent': 'BlueEdge-Framework/1.0'}
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                
-                if data:
-                    # Convert to list format
-                    history = []
-                    for key, value in data.items():
-                        value['firebase_key'] = key
-                        # Add formatted display data
-                        value['display'] = self._format_history_item(value)
-                        history.append(value)
-                    
-                    # Sort by timestamp (newest first)
-                    history.sort(
-                        key=lambda x: x.get('timestamp', ''),
-                        reverse=True
-                    )
-                    
-                    print(f"✅ Retrieved {len(history)} history records")
-                    return True, history[:limit]
+            while True:
+                if cursor:
+                    params = {'orderBy': '"$key"', 'startAt': json.dumps(cursor),
+                              'limitToFirst': self.history_page_size + 1}
                 else:
-                    print("📝 No history found for user")
-                    return True, []
-                    
-            else:
-                print(f"❌ History retrieval failed: HTTP {response.status_code}")
-                return False, []
+                    params = {'orderBy': '"$key"', 'limitToLast': 50}
+                
+                response = self.config.http.get(url, params=params, timeout=self.request_timeout)
+                self.history_requests += 1
+                if response.status_code != 200:
+                    print(f"❌ History retrieval failed: HTTP {response.status_code}")
+                    return False
+                
+                data = response.json() or {}
+                new_entries = {key: value for key, value in data.items() if key != cursor}
+                if new_entries:
+                    self.history.put((user_id, key, value) for key, value in new_entries.items())
+                    cursor = max(new_entries)
+                    self.history.advance(user_id, cursor)
+                    self.history_entries_fetched += len(new_entries)
+                    print(f"✅ Retrieved {len(new_entries)} new history record(s)")
                 
+                # A full page means more may follow
+                if not params.get('startAt') or len(data) <= self.history_page_size:
+                    return True
+                
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            print(f"❌ Firebase retrieve error: {str(e)}")
+            self.config.mark_disconnected(type(e).__name__)
+            return False
+            
         except Exception as e:
             print(f"❌ Firebase retrieve error: {str(e)}")
-            return False, []
+            return False
     
     def get_global_statistics(self):
         """Get global BlueEdge statistics from Firebase"""
@@ -266,10 +649,9 @@ class FirebaseDatabase:
             return False, {}
             
         try:
-            response = requests.get(
+            response = self.config.http.get(
                 self.config.statistics_endpoint, 
-                timeout=5,
-                headers={'User-Agent': 'BlueEdge-Framework/1.0'}
+                timeout=5
             )
             
             if response.status_code == 200:
@@ -298,11 +680,10 @@ class FirebaseDatabase:
                 'session_data': session_data
             }
             
-            response = requests.post(
+            response = self.config.http.post(
                 self.config.sessions_endpoint,
                 json=session_info,
-                timeout=5,
-                headers={'User-Agent': 'BlueEdge-Framework/1.0'}
+                timeout=5
             )
             
             return response.status_code == 200
@@ -311,111 +692,6 @@ class FirebaseDatabase:
             print(f"❌ Session save error: {str(e)}")
             return False
     
-    def _update_statistics_async(self, comparison_data):
-        """Update statistics in background thread"""
-        def update_stats():
-            try:
-                self._update_statistics(comparison_data)
-            except Exception as e:
-                print(f"❌ Background statistics update error: {e}")
-        
-        # Run in background thread
-        thread = threading.Thread(target=update_stats, daemon=True)
-        thread.start()
-    
-    def _update_statistics(self, comparison_data):
-        """Update global BlueEdge statistics"""
-        try:
-            # Get current stats
-            response = requests.get(self.config.statistics_endpoint, timeout=5)
-            current_stats = {}
-            
-            if response.status_code == 200 and response.json():
-                current_stats = response.json()
-            
-            # Extract relevant data
-            is_duplicate = comparison_data.get('duplicate_status', False)
-            processing_time = comparison_data.get('processing_time', 0)
-            error_category = comparison_data.get('error_category', 'unknown')
-            
-            # Update statistics
-            updated_stats = {
-                # Basic counters
-                "total_comparisons": current_stats.get("total_comparisons", 0) + 1,
-                "total_duplicates_found": current_stats.get("total_duplicates_found", 0) + (1 if is_duplicate else 0),
-                "total_unique_pairs": current_stats.get("total_unique_pairs", 0) + (0 if is_duplicate else 1),
-                
-                # Performance metrics
-                "average_processing_time": self._calculate_average_time(current_stats, processing_time),
-                "total_processing_time": current_stats.get("total_processing_time", 0) + processing_time,
-                "min_processing_time": min(current_stats.get("min_processing_time", float('inf')), processing_time),
-                "max_processing_time": max(current_stats.get("max_processing_time", 0), processing_time),
-                
-                # Category distribution
-                "category_distribution": self._update_category_distribution(current_stats, error_category),
-                
-                # BlueEdge specific metrics
-                "mobile_edge_sessions": current_stats.get("mobile_edge_sessions", 0) + 1,
-                "memory_efficiency": "5KB_per_comparison",
-                "platform_type": "mobile_edge_computing",
-                "accuracy_rate": self._calculate_accuracy_rate(current_stats, is_duplicate),
-                
-                # Metadata
-                "last_updated": datetime.now().isoformat(),
-                "framework_info": {
-                    "name": "BlueEdge",
-                    "version": "1.0.0",
-                    "algorithm": "levenshtein_enhanced",
-                    "supported_categories": 6,
-                    "languages": ["english", "arabic"]
-                }
-            }
-            
-            # Send updated stats
-            response = requests.put(
-                self.config.statistics_endpoint,
-                json=updated_stats,
-                timeout=self.request_timeout,
-                headers={'User-Agent': 'BlueEdge-Framework/1.0'}
-            )
-            
-            if response.status_code == 200:
-                print("📊 Statistics updated successfully")
-            else:
-                print(f"❌ Statistics update failed: HTTP {response.status_code}")
-                
-        except Exception as e:
-            print(f"❌ Statistics update error: {str(e)}")
-    
-    def _calculate_average_time(self, current_stats, new_time):
-        """Calculate updated average processing time"""
-        current_avg = current_stats.get("average_processing_time", 0)
-        current_count = current_stats.get("total_comparisons", 0)
-        
-        if current_count == 0:
-            return new_time
-        
-        total_time = (current_avg * current_count) + new_time
-        return total_time / (current_count + 1)
-    
-    def _update_category_distribution(self, current_stats, new_category):
-        """Update error category distribution"""
-        distribution = current_stats.get("category_distribution", {})
-        
-        if new_category and new_category != 'unknown':
-            distribution[new_category] = distribution.get(new_category, 0) + 1
-        
-        return distribution
-    
-    def _calculate_accuracy_rate(self, current_stats, is_duplicate):
-        """Calculate overall accuracy rate (placeholder - needs ground truth)"""
-        # This is a simplified calculation
-        # In production, you'd need ground truth data for real accuracy
-        total = current_stats.get("total_comparisons", 0) + 1
-        correct = current_stats.get("correct_predictions", total * 0.85) + (1 if is_duplicate else 0.85)
-        
-        return min(1.0, correct / total) if total > 0 else 0.85
-    
     def _format_history_item(self, item):
         """Format history item for display"""
         try:
@@ -457,112 +733,256 @@ class FirebaseDatabase:
 class FirebaseSync:
     """Background synchronization service for BlueEdge"""
     
-    def __init__(self, firebase_db: FirebaseDatabase):
+    def __init__(self, firebase_db: FirebaseDatabase, outbox_path=None, rate_limiter=None,
+                 overflow_policy='coalesce'):
+        """
+        Args:
+            firebase_db: Database handler used for the writes
+            outbox_path: SQLite outbox (default: BLUEEDGE_OUTBOX or data/blueedge_outbox.db)
+            rate_limiter: TokenBucket charged one token per write (None = unlimited)
+            overflow_policy: What add_to_sync_queue does above high_watermark:
+                'block' (wait for the queue to drain), 'shed' (drop the item) or
+                'coalesce' (update a pending item for the same names, else drop)
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow_policy}' (expected one of {OVERFLOW_POLICIES})")
         self.firebase_db = firebase_db
-        self.sync_queue = []
+        # Durable queue: pending items survive crashes and replay on start
+        self.outbox = SyncOutbox(outbox_path or os.environ.get('BLUEEDGE_OUTBOX', DEFAULT_OUTBOX_PATH))
         self.sync_thread = None
         self.running = False
-        self.max_queue_size = 50
+        self.max_queue_size = self.outbox.max_items
+        self.max_retries = 3        # rejected writes before an item is parked (outages do not count)
+        self.sync_batch_size = 50  # records per multi-path write
+        
+        # Event-driven wakeups: enqueue notifies, stop interrupts any wait
+        self.condition = threading.Condition()
+        self.stop_event = threading.Event()
+        self.batch_linger = 0.5     # seconds to let a partial batch fill up
+        self.idle_timeout = 30.0    # re-check interval when nothing is enqueued
+        self.backoff_base = 1.0     # first retry delay (doubles per failure)
+        self.backoff_max = 300.0
+        self.consecutive_errors = 0
+        self.deferred = 0           # batches kept pending through an outage or server error
+        self.reconnects = 0
+        
+        # Rate limiting and backpressure
+        self.rate_limiter = rate_limiter
+        self.overflow_policy = overflow_policy
+        self.high_watermark = 10000  # pending items before backpressure applies
+        self.block_timeout = 5.0     # longest 'block' wait before the item is shed
+        self.coalesce_index = OrderedDict()  # (user_id, name1, name2) -> pending key
+        self.shed = 0
+        self.coalesced = 0
+        self.blocked = 0
+        self.throttle_waits = 0
         print("🔄 Firebase Sync service initialized")
         
     def start_sync_service(self):
-        """Start background sync service"""
-        if not self.running and self.firebase_db.config.is_connected():
-            self.running = True
-            self.sync_thread = threading.Thread(target=self._sync_loop, daemon=True)
-            self.sync_thread.start()
+        """Start background sync service (offline, it reconnects once items are queued)"""
+        if self.running:
+            return
+        self.running = True
+        self.stop_event.clear()
+        self.sync_thread = threading.Thread(target=self._sync_loop, daemon=True)
+        self.sync_thread.start()
+        if self.firebase_db.config.is_connected():
             print("🔄 Firebase sync service started")
         else:
-            print("⚠️ Sync service not started - Firebase not connected")
+            print("🔄 Firebase sync service started offline - will reconnect")
     
     def stop_sync_service(self):
         """Stop background sync service"""
         if self.running:
             self.running = False
+            self.stop_event.set()
+            with self.condition:
+                self.condition.notify_all()
             if self.sync_thread and self.sync_thread.is_alive():
                 self.sync_thread.join(timeout=3)
+            self.firebase_db.statistics.stop()
             print("⏹️ Firebase sync service stopped")
     
-    def add_to_sync_queue(self, user_id, data):
-        """Add data to sync queue with size limit"""
-        if len(self.sync_queue) >= self.max_queue_size:
-            # Remove oldest item if queue is full
-            removed = self.sync_queue.pop(0)
-            print(f"⚠️ Sync queue full - removed oldest item")
-        
-        sync_item = {
-            'user_id': user_id,
-            'data': data,
-            'timestamp': datetime.now(),
-            'retries': 0,
-            'max_retries': 3
-        }
+    def add_to_sync_queue(self, user_id, data, idempotency_key=None):
+        """
+        Persist data in the sync outbox
+        
+        Above high_watermark pending items the overflow policy applies
+        (block, shed or coalesce), so a burst cannot grow the queue
+        without bound.
         
-        self.sync_queue.append(sync_item)
-        print(f"📝 Added to sync queue (size: {len(self.sync_queue)})")
+        Returns:
+            str: Idempotency key (also the Firebase push key of the record),
+                or None when the item was shed
+        """
+        coalesce_key = (user_id, data.get('name1'), data.get('name2')) if isinstance(data, dict) else None
+        
+        if self.outbox.pending_count() >= self.high_watermark:
+            if self.overflow_policy == 'coalesce' and coalesce_key in self.coalesce_index:
+                key = self.coalesce_index[coalesce_key]
+                if self.outbox.replace_pending(key, data):
+                    self.coalesced += 1
+                    return key
+            if self.overflow_policy == 'block':
+                self.blocked += 1
+                with self.condition:
+                    drained = self.condition.wait_for(
+                        lambda: self.outbox.pending_count() < self.high_watermark, timeout=self.block_timeout
+                    )
+            if self.overflow_policy != 'block' or not drained:
+                self.shed += 1
+                print(f"⚠️ Sync queue over budget - item shed ({self.shed} so far)")
+                return None
+        
+        key = self.outbox.enqueue(user_id, data, idempotency_key or generate_push_key())
+        if coalesce_key is not None:
+            self.coalesce_index[coalesce_key] = key
+            self.coalesce_index.move_to_end(coalesce_key)
+            if len(self.coalesce_index) > self.high_watermark:
+                self.coalesce_index.popitem(last=False)
+        with self.condition:
+            self.condition.notify()
+        print(f"📝 Added to sync queue (size: {self.outbox.pending_count()})")
+        return key
+    
+    def replay_dead(self, ids=None):
+        """
+        Queue parked (rejected) items for sync again, with their retries reset
+        
+        Args:
+            ids: Outbox ids to replay (default: every parked item)
+            
+        Returns:
+            int: Items returned to the queue
+        """
+        revived = self.outbox.revive(ids)
+        if revived:
+            with self.condition:
+                self.condition.notify()
+            print(f"♻️ Replaying {revived} parked item(s)")
+        return revived
     
     def get_queue_status(self):
         """Get sync queue status"""
         return {
-            'queue_size': len(self.sync_queue),
+            'queue_size': self.outbox.pending_count(),
             'max_size': self.max_queue_size,
+            'outbox': self.outbox.get_statistics(),
             'running': self.running,
+            'consecutive_errors': self.consecutive_errors,
+            'deferred': self.deferred,
+            'reconnects': self.reconnects,
+            'high_watermark': self.high_watermark,
+            'overflow_policy': self.overflow_policy,
+            'shed': self.shed,
+            'coalesced': self.coalesced,
+            'blocked': self.blocked,
+            'throttle_waits': self.throttle_waits,
             'connected': self.firebase_db.config.is_connected()
         }
     
-    def _sync_loop(self):
-        """Background sync loop with error handling"""
-        consecutive_errors = 0
-        max_consecutive_errors = 5
+    def _backoff_delay(self):
+        """Exponential backoff with jitter after consecutive failures"""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** max(0, self.consecutive_errors - 1)))
+        # Equal jitter: at least half the ceiling, so devices retrying together spread out
+        return ceiling / 2 + random.uniform(0, ceiling / 2)
+    
+    def _has_work(self):
+        return not self.running or self.outbox.pending_count() > 0
+    
+    def _sync_batch(self):
+        """Send the oldest batch in one write; items stay in the outbox until acknowledged"""
+        batch = self.outbox.peek(self.sync_batch_size)
+        ids = [item['id'] for item in batch]
+        
+        success, keys, failure = self.firebase_db.write_comparison_batch(
+            [(item['user_id'], item['data'], item['idempotency_key']) for item in batch]
+        )
+        
+        if success:
+            self.outbox.ack(ids)
+            if self.high_watermark and self.outbox.pending_count() < self.high_watermark:
+                with self.condition:
+                    self.condition.notify_all()  # release blocked producers
+            print(f"✅ Sync successful for {len(batch)} item(s)")
+            self.consecutive_errors = 0  # Reset error counter
+            return True
+        
+        self.consecutive_errors += 1
+        if failure != FAILURE_REJECTED:
+            # Offline, timeout or server error: nothing is wrong with the items,
+            # so they stay pending without using up retries
+            self.deferred += 1
+            print(f"🔄 Sync deferred for {len(batch)} item(s) - will retry")
+            return False
         
+        # Rejected items stay queued until they run out of retries
+        parked = self.outbox.fail(ids, self.max_retries)
+        if len(batch) > parked:
+            print(f"🔄 Retrying sync of {len(batch) - parked} item(s)")
+        if parked:
+            print(f"❌ Sync failed permanently for {parked} item(s) (see replay_dead)")
+        return False
+    
+    def _reconnect(self):
+        """Back off, then probe the connection (called while offline with items pending)"""
+        self.consecutive_errors += 1
+        self.stop_event.wait(self._backoff_delay())
+        if self.running and self.firebase_db.config.test_connection()[0]:
+            self.reconnects += 1
+            self.consecutive_errors = 0
+    
+    def _sync_loop(self):
+        """Background sync loop: wakes on enqueue, drains batches, backs off on failure"""
         while self.running:
             try:
-                if self.sync_queue and self.firebase_db.config.is_connected():
-                    item = self.sync_queue.pop(0)
-                    
-                    # Try to sync data
-                    success, result = self.firebase_db.save_comparison_result(
-                        item['user_id'],
-                        item['data']
-                    )
-                    
-                    if success:
-                        print(f"✅ Sync successful for user {item['user_id']}")
-                        consecutive_errors = 0  # Reset error counter
-                        
-                    elif item['retries'] < item['max_retries']:
-                        # Retry failed items
-                        item['retries'] += 1
-                        self.sync_queue.append(item)
-                        print(f"🔄 Retrying sync (attempt {item['retries']}/{item['max_retries']})")
-                        consecutive_errors += 1
-                        
-                    else:
-                        print(f"❌ Sync failed permanently for user {item['user_id']}")
-                        consecutive_errors += 1
+                # Sleep until something is enqueued (or the idle re-check)
+                with self.condition:
+                    self.condition.wait_for(self._has_work, timeout=self.idle_timeout)
+                if not self.running:
+                    break
+                if not self.firebase_db.config.is_connected():
+                    if self.outbox.pending_count():
+                        self._reconnect()
+                    continue
                 
-                # Adaptive sleep based on queue size and errors
-                if consecutive_errors >= max_consecutive_errors:
-                    time.sleep(10)  # Longer wait after many errors
-                elif len(self.sync_queue) > 10:
-                    time.sleep(1)   # Faster processing for large queue
-                else:
-                    time.sleep(3)   # Normal processing
+                # Let a partial batch fill up briefly (fewer, fuller writes)
+                if 0 < self.outbox.pending_count() < self.sync_batch_size and self.batch_linger:
+                    with self.condition:
+                        self.condition.wait_for(
+                            lambda: not self.running or self.outbox.pending_count() >= self.sync_batch_size,
+                            timeout=self.batch_linger
+                        )
+                
+                # Drain back to back while writes succeed, within the write budget
+                # (items enqueued while throttled make the next batch fuller)
+                while self.running and self.outbox.pending_count():
+                    if self.rate_limiter is not None and not self.rate_limiter.try_acquire():
+                        self.throttle_waits += 1
+                        self.stop_event.wait(self.rate_limiter.time_until())
+                        continue
+                    if not self._sync_batch():
+                        break
+                
+                if self.consecutive_errors:
+                    self.stop_event.wait(self._backoff_delay())
                 
             except Exception as e:
                 print(f"❌ Sync loop error: {str(e)}")
-                consecutive_errors += 1
-                time.sleep(5)  # Wait longer on error
+                self.consecutive_errors += 1
+                self.stop_event.wait(self._backoff_delay())
 
 # Factory function for easy initialization
-def create_firebase_service():
+def create_firebase_service(database_url=None):
     """Create and configure Firebase service for BlueEdge"""
     print("🏗️ Creating Firebase service for BlueEdge...")
     
     try:
-        config = FirebaseConfig()
+        config = FirebaseConfig(database_url)
         database = FirebaseDatabase(config)
-        sync_service = FirebaseSync(database)
+        sync_service = FirebaseSync(database, rate_limiter=config.write_limiter)
+        # Bounded asyncio I/O loop for UI-triggered calls (no thread per save)
+        io = FirebaseIO(database, max_concurrency=4, rate_limiter=config.write_limiter)
         
         # Test connection with retries
         success = False
@@ -576,16 +996,17 @@ def create_firebase_service():
         
         if success:
             print("✅ Firebase service ready for BlueEdge!")
-            # Start sync service
-            sync_service.start_sync_service()
         else:
             print(f"⚠️ Firebase service created but not connected: {message}")
             print("💡 The app will work in offline mode")
+        # Start sync service (offline it keeps the outbox and reconnects)
+        sync_service.start_sync_service()
         
         return {
             'config': config,
             'database': database,
             'sync': sync_service,
+            'io': io,
             'connected': success,
             'message': message if not success else "Connected successfully"
         }
@@ -596,6 +1017,7 @@ def create_firebase_service():
             'config': None,
             'database': None,
             'sync': None,
+            'io': None,
             'connected': False,
             'message': f"Service creation failed: {e}"
         }
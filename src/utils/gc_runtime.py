@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+GC-Aware Runtime for BlueEdge Framework
+=======================================
+Garbage-collector policy for interactive sessions and batch runs
+Features:
+- gc.freeze() of long-lived lexicons, detectors and indexes after warm-up
+- Generation thresholds tuned per mode (interactive / batch)
+- Full collections only when measured allocation growth calls for one
+- GC pause times and counts via gc.callbacks (reported by the monitor)
+
+Select the startup mode with BLUEEDGE_GC_MODE=interactive|batch.
+"""
+
+import os
+import gc
+import sys
+import time
+import threading
+from contextlib import contextmanager
+
+try:
+    from .latency_histogram import LatencyHistogram
+except ImportError:
+    from latency_histogram import LatencyHistogram
+
+# Generation thresholds per mode (None keeps the interpreter defaults)
+GC_MODES = {
+    'interactive': None,
+    # Batch loops allocate many short-lived strings/lists per comparison:
+    # collect the young generation less often and full collections rarely
+    'batch': (50000, 20, 100),
+}
+
+
+class GCRuntime:
+    """Process-wide garbage-collector policy and pause accounting"""
+
+    def __init__(self, mode='interactive', growth_threshold_blocks=200000):
+        """
+        Args:
+            mode: Key of GC_MODES
+            growth_threshold_blocks: Allocated-block growth that triggers maybe_collect()
+        """
+        self.mode = None
+        self.default_thresholds = gc.get_threshold()
+        self.growth_threshold_blocks = growth_threshold_blocks
+        self.baseline_blocks = sys.getallocatedblocks()
+        self.lock = threading.Lock()
+
+        # Pause accounting (filled from gc.callbacks)
+        self.tracking = False
+        self.pause_histogram = LatencyHistogram()
+        self.collections = [0, 0, 0]
+        self.collected_objects = 0
+        self.total_pause_ns = 0
+        self.max_pause_ns = 0
+        self.growth_collections = 0
+        self._pause_start_ns = None
+
+        self.set_mode(mode)
+
+    def set_mode(self, mode):
+        """Apply a mode's generation thresholds"""
+        if mode not in GC_MODES:
+            raise ValueError(f"Unknown GC mode '{mode}' (expected one of {sorted(GC_MODES)})")
+        thresholds = GC_MODES[mode] or self.default_thresholds
+        gc.set_threshold(*thresholds)
+        self.mode = mode
+
+    def track_pauses(self):
+        """Start recording GC pauses (idempotent)"""
+        with self.lock:
+            if not self.tracking:
+                gc.callbacks.append(self._on_gc)
+                self.tracking = True
+
+    def stop_tracking(self):
+        """Stop recording GC pauses"""
+        with self.lock:
+            if self.tracking:
+                gc.callbacks.remove(self._on_gc)
+                self.tracking = False
+
+    def _on_gc(self, phase, info):
+        """gc.callbacks hook: time each collection"""
+        if phase == 'start':
+            self._pause_start_ns = time.perf_counter_ns()
+            return
+        if self._pause_start_ns is None:
+            return
+
+        pause_ns = time.perf_counter_ns() - self._pause_start_ns
+        self._pause_start_ns = None
+        self.pause_histogram.record(pause_ns)
+        self.collections[info.get('generation', 2)] += 1
+        self.collected_objects += info.get('collected', 0)
+        self.total_pause_ns += pause_ns
+        if pause_ns > self.max_pause_ns:
+            self.max_pause_ns = pause_ns
+
+    def freeze(self):
+        """
+        Move every live object to the permanent generation
+
+        Call after warm-up (detector, lexicons, cache snapshot loaded) so
+        later collections no longer traverse the long-lived objects.
+
+        Returns:
+            int: Number of frozen objects
+        """
+        gc.collect()
+        gc.freeze()
+        self.baseline_blocks = sys.getallocatedblocks()
+        return gc.get_freeze_count()
+
+    def unfreeze(self):
+        """Return frozen objects to the oldest generation"""
+        gc.unfreeze()
+
+    def maybe_collect(self):
+        """
+        Run a full collection only if allocations grew past the threshold
+
+        Returns:
+            bool: True when a collection was run
+        """
+        blocks = sys.getallocatedblocks()
+        if blocks - self.baseline_blocks < self.growth_threshold_blocks:
+            return False
+
+        gc.collect()
+        self.growth_collections += 1
+        # Whatever survived is live data; measure growth from here
+        self.baseline_blocks = sys.getallocatedblocks()
+        return True
+
+    @contextmanager
+    def batch_mode(self, freeze=True):
+        """
+        Batch-run GC policy for the duration of a with-block
+
+        Args:
+            freeze: Freeze objects alive on entry (the warmed-up detector)
+        
+        A freeze already in place on entry (e.g. the app's post-warm-up
+        freeze) is left alone: nothing is frozen or unfrozen by this block,
+        since gc.unfreeze() would also release the caller's frozen objects.
+        """
+        previous_mode = self.mode
+        froze = freeze and gc.get_freeze_count() == 0
+        if froze:
+            self.freeze()
+        self.set_mode('batch')
+        try:
+            yield self
+        finally:
+            self.set_mode(previous_mode)
+            if froze:
+                self.unfreeze()
+
+    def get_statistics(self):
+        """GC pause and policy statistics (times in milliseconds)"""
+        percentiles = self.pause_histogram.percentiles((50, 99))
+        return {
+            'mode': self.mode,
+            'thresholds': gc.get_threshold(),
+            'tracking_pauses': self.tracking,
+            'collections_by_generation': list(self.collections),
+            'collected_objects': self.collected_objects,
+            'growth_collections': self.growth_collections,
+            'frozen_objects': gc.get_freeze_count(),
+            'total_pause_ms': self.total_pause_ns / 1e6,
+            'max_pause_ms': self.max_pause_ns / 1e6,
+            'p50_pause_ms': percentiles[50] / 1e6,
+            'p99_pause_ms': percentiles[99] / 1e6
+        }
+
+
+# Process-wide runtime shared by the monitor, the app and batch scripts
+_startup_mode = os.environ.get('BLUEEDGE_GC_MODE', 'interactive')
+if _startup_mode not in GC_MODES:
+    print(f"⚠️ Unknown BLUEEDGE_GC_MODE '{_startup_mode}' - using interactive")
+    _startup_mode = 'interactive'
+GC_RUNTIME = GCRuntime(mode=_startup_mode)
+
+
+# Testing and usage example
+if __name__ == "__main__":
+    print("♻️ GC Runtime Test")
+    print("=" * 40)
+
+    GC_RUNTIME.track_pauses()
+    lexicon = {f"NAME{i}": [f"NICK{i}", f"ALIAS{i}"] for i in range(50000)}
+
+    with GC_RUNTIME.batch_mode():
+        for i in range(200000):
+            pair = [f"A{i}", f"B{i}", {'i': i}]
+
+    stats = GC_RUNTIME.get_statistics()
+    print(f"Collections: {stats['collections_by_generation']}")
+    print(f"Total pause: {stats['total_pause_ms']:.2f}ms (max {stats['max_pause_ms']:.2f}ms)")
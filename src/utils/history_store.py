@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Local History Store for BlueEdge Framework
+==========================================
+SQLite copy of each user's comparison history, keyed by Firebase push key
+Features:
+- Serves the history screen locally (also offline)
+- Per-user sync cursor: the newest key fetched from Firebase, so a refresh
+  only asks for keys from the cursor on (orderBy="$key", startAt)
+- Write-through of the device's own saves (no cursor change: keys written
+  by other devices in between must still be fetched)
+- Newest-first reads straight from the key index (push keys sort by time)
+- Bounded per user: the oldest entries are pruned
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    user_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (user_id, key)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS cursors (
+    user_id TEXT PRIMARY KEY,
+    last_key TEXT NOT NULL,
+    synced_at REAL NOT NULL
+);
+"""
+
+
+class HistoryStore:
+    """Per-user history entries and Firebase sync cursors"""
+
+    def __init__(self, path, max_entries_per_user=500):
+        """
+        Args:
+            path: SQLite file (':memory:' for a non-persistent store)
+            max_entries_per_user: Entries kept per user (oldest keys pruned)
+        """
+        if path != ':memory:' and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.path = path
+        self.max_entries_per_user = max_entries_per_user
+        self.lock = threading.Lock()
+
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+
+    def put(self, rows):
+        """
+        Insert or replace entries
+
+        Args:
+            rows: Iterable of (user_id, key, entry)
+
+        Returns:
+            int: Rows written
+        """
+        rows = [(user_id, key, json.dumps(entry, separators=(',', ':'), ensure_ascii=False, default=str))
+                for user_id, key, entry in rows]
+        if not rows:
+            return 0
+
+        with self.lock:
+            self.connection.execute("BEGIN")
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO history (user_id, key, payload) VALUES (?, ?, ?)", rows
+            )
+            for user_id in {row[0] for row in rows}:
+                self.connection.execute(
+                    "DELETE FROM history WHERE user_id = ? AND key < ("
+                    "SELECT key FROM history WHERE user_id = ? ORDER BY key DESC LIMIT 1 OFFSET ?)",
+                    (user_id, user_id, self.max_entries_per_user - 1)
+                )
+            self.connection.execute("COMMIT")
+        return len(rows)
+
+    def cursor(self, user_id):
+        """Newest key fetched from Firebase for a user (None before the first fetch)"""
+        with self.lock:
+            row = self.connection.execute(
+                "SELECT last_key FROM cursors WHERE user_id = ?", (user_id,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def advance(self, user_id, key):
+        """Move a user's cursor forward to key (never backwards)"""
+        with self.lock:
+            self.connection.execute(
+                "INSERT INTO cursors (user_id, last_key, synced_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET last_key = MAX(last_key, excluded.last_key), "
+                "synced_at = excluded.synced_at",
+                (user_id, key, time.time())
+            )
+
+    def recent(self, user_id, limit=10):
+        """
+        Newest entries of a user
+
+        Returns:
+            list: [(key, entry), ...] newest first
+        """
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT key, payload FROM history WHERE user_id = ? ORDER BY key DESC LIMIT ?",
+                (user_id, limit)
+            ).fetchall()
+        return [(key, json.loads(payload)) for key, payload in rows]
+
+    def count(self, user_id):
+        """Entries stored for a user"""
+        with self.lock:
+            return self.connection.execute(
+                "SELECT COUNT(*) FROM history WHERE user_id = ?", (user_id,)
+            ).fetchone()[0]
+
+    def clear(self, user_id):
+        """Forget a user's entries and cursor (next fetch is a full one)"""
+        with self.lock:
+            self.connection.execute("DELETE FROM history WHERE user_id = ?", (user_id,))
+            self.connection.execute("DELETE FROM cursors WHERE user_id = ?", (user_id,))
+
+    def close(self):
+        """Close the database"""
+        with self.lock:
+            self.connection.close()
+
+
+# Testing and usage example
+if __name__ == "__main__":
+    print("📚 History Store Test")
+    print("=" * 40)
+
+    store = HistoryStore(':memory:', max_entries_per_user=3)
+    store.put(('user_1', f'-key{i}', {'n1': f'AHMED {i}'}) for i in range(5))
+    store.advance('user_1', '-key4')
+    print(f"Cursor: {store.cursor('user_1')}, stored: {store.count('user_1')}")
+    print(f"Newest: {store.recent('user_1', 2)}")
+    store.close()
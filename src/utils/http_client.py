@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP Client for BlueEdge Framework
+=========================================
+One keep-alive session shared by all Firebase I/O
+Features:
+- requests.Session with a sized urllib3 connection pool (TCP+TLS reuse)
+- Retry with exponential backoff through the mounted HTTPAdapter
+- Compact JSON bodies, gzip-compressed above a size threshold
+- Thread-safe: urllib3 pools are shared safely between threads
+
+POST is not retried: a repeated Firebase POST creates a second record.
+Writes that must survive retries use PATCH/PUT with client-side keys.
+"""
+
+import gzip
+import json
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_USER_AGENT = 'BlueEdge-Framework/1.0'
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+IDEMPOTENT_METHODS = frozenset(['GET', 'HEAD', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'])
+
+
+class HTTPClient:
+    """Shared keep-alive session with retries and compressed request bodies"""
+
+    def __init__(self, pool_connections=2, pool_maxsize=8, retries=3, backoff_factor=0.5,
+                 timeout=10, compress_requests=True, compress_min_bytes=1024,
+                 user_agent=DEFAULT_USER_AGENT):
+        """
+        Args:
+            pool_connections: Hosts with a cached connection pool
+            pool_maxsize: Keep-alive connections kept per host
+            retries: Retries per request (connect, read and retryable statuses)
+            backoff_factor: Backoff base in seconds (0.5 -> 0.5s, 1s, 2s, ...)
+            timeout: Default request timeout in seconds
+            compress_requests: gzip JSON bodies (Content-Encoding: gzip)
+            compress_min_bytes: Smaller bodies are sent uncompressed
+            user_agent: User-Agent header of every request
+        """
+        self.timeout = timeout
+        self.compress_requests = compress_requests
+        self.compress_min_bytes = compress_min_bytes
+
+        self.retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=IDEMPOTENT_METHODS,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        self.adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                                   max_retries=self.retry)
+
+        self.session = requests.Session()
+        self.session.headers.update({'User-Agent': user_agent, 'Connection': 'keep-alive'})
+        self.session.mount('https://', self.adapter)
+        self.session.mount('http://', self.adapter)
+
+        # Statistics
+        self.lock = threading.Lock()
+        self.requests_sent = 0
+        self.bytes_raw = 0
+        self.bytes_sent = 0
+
+    def _encode_body(self, payload, headers):
+        """Compact JSON body, gzipped when large enough to pay off"""
+        body = json.dumps(payload, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        headers['Content-Type'] = 'application/json'
+        raw_size = len(body)
+
+        if self.compress_requests and raw_size >= self.compress_min_bytes:
+            body = gzip.compress(body, compresslevel=6)
+            headers['Content-Encoding'] = 'gzip'
+        return body, raw_size
+
+    def request(self, method, url, json=None, params=None, timeout=None, headers=None):
+        """
+        Send a request over the pooled session
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            json: Payload serialized as the JSON body
+            params: Query parameters
+            timeout: Overrides the default timeout
+            headers: Extra request headers
+
+        Returns:
+            requests.Response: Final response (after retries)
+        """
+        headers = dict(headers or {})
+        body, raw_size = None, 0
+        if json is not None:
+            body, raw_size = self._encode_body(json, headers)
+
+        response = self.session.request(method, url, data=body, params=params, headers=headers,
+                                        timeout=timeout or self.timeout)
+
+        with self.lock:
+            self.requests_sent += 1
+            self.bytes_raw += raw_size
+            self.bytes_sent += len(body) if body else 0
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request('GET', url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self.request('PUT', url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self.request('PATCH', url, **kwargs)
+
+    def get_statistics(self):
+        """Request count and request-body compression savings"""
+        with self.lock:
+            return {
+                'requests_sent': self.requests_sent,
+                'body_bytes_raw': self.bytes_raw,
+                'body_bytes_sent': self.bytes_sent,
+                'compression_ratio': self.bytes_sent / self.bytes_raw if self.bytes_raw else 1.0
+            }
+
+    def close(self):
+        """Close pooled connections"""
+        self.session.close()
+
+
+# Testing and usage example
+if __name__ == "__main__":
+    print("🌐 HTTP Client Test")
+    print("=" * 40)
+
+    client = HTTPClient()
+    payload = {f"comparisons/key{i}": {"name1": "MOHAMMED AHMED", "name2": "MOHAMMAD AHMAD"} for i in range(50)}
+    body, raw_size = client._encode_body(payload, {})
+    print(f"Body: {raw_size} bytes raw, {len(body)} bytes gzipped")
+    print(f"Retry: {client.retry.total} retries, backoff {client.retry.backoff_factor}s")
+    client.close()
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Latency Histograms for BlueEdge Framework
+=========================================
+Bounded-memory latency recording in the HDR histogram style
+Features:
+- Log-linear buckets: fixed relative precision over a wide range
+- Fixed memory regardless of how many values are recorded
+- Arbitrary percentiles (p50/p95/p99/p999/...)
+- Mergeable across threads and processes (sparse dict form)
+- Windowed (last-N-seconds) views from a ring of time slots
+"""
+
+import time
+import math
+from array import array
+
+
+class LatencyHistogram:
+    """Log-linear bucketed histogram of integer values (nanoseconds by default)
+
+    Values below 2**sub_bucket_bits are counted exactly. Above that, every
+    power-of-two range is split into 2**(sub_bucket_bits - 1) equal buckets,
+    so a reported value is within 1 / 2**(sub_bucket_bits - 1) of the truth
+    (about 1.6% with the default of 7 bits).
+    """
+
+    def __init__(self, max_value=60 * 10**9, sub_bucket_bits=7):
+        """
+        Initialize Latency Histogram
+
+        Args:
+            max_value: Largest trackable value; larger values are clamped (default: 60 s in ns)
+            sub_bucket_bits: Precision bits (higher = more precise, more memory)
+        """
+        self.max_value = int(max_value)
+        self.sub_bucket_bits = sub_bucket_bits
+        self.sub_bucket_count = 1 << sub_bucket_bits
+        self.half_count = self.sub_bucket_count // 2
+
+        self.bucket_total = self._index_for(self.max_value) + 1
+        self.counts = array('Q', bytes(8 * self.bucket_total))
+
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def _index_for(self, value):
+        """Map a value to its bucket index"""
+        if value < self.sub_bucket_count:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return self.sub_bucket_count + (shift - 1) * self.half_count + ((value >> shift) - self.half_count)
+
+    def _bounds_for(self, index):
+        """Lowest and highest value that map to a bucket index"""
+        if index < self.sub_bucket_count:
+            return index, index
+        offset = index - self.sub_bucket_count
+        shift = offset // self.half_count + 1
+        mantissa = offset % self.half_count + self.half_count
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, value, count=1):
+        """Record a value (negative values count as 0, large values are clamped)"""
+        value = min(max(0, int(value)), self.max_value)
+        self.counts[self._index_for(value)] += count
+
+        self.count += count
+        self.total += value * count
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def record_seconds(self, seconds, count=1):
+        """Record a duration given in seconds"""
+        self.record(seconds * 1e9, count)
+
+    def percentile(self, percent):
+        """Value at the given percentile (0-100); 0 when empty"""
+        return self.percentiles([percent])[percent]
+
+    def percentiles(self, percents=(50, 95, 99, 99.9)):
+        """
+        Several percentiles in a single pass
+
+        Returns:
+            dict: {percent: value}
+        """
+        results = {}
+        if self.count == 0:
+            return {percent: 0 for percent in percents}
+
+        targets = sorted((max(1, math.ceil(percent / 100 * self.count)), percent) for percent in percents)
+        target_iter = iter(targets)
+        target, percent = next(target_iter)
+
+        cumulative = 0
+        for index, bucket_count in enumerate(self.counts):
+            if not bucket_count:
+                continue
+            cumulative += bucket_count
+            while cumulative >= target:
+                # Highest equivalent value, never beyond what was recorded
+                results[percent] = min(self._bounds_for(index)[1], self.max)
+                try:
+                    target, percent = next(target_iter)
+                except StopIteration:
+                    return results
+
+        return results
+
+    def mean(self):
+        """Mean of recorded values (exact, not bucketed)"""
+        return self.total / self.count if self.count else 0
+
+    def merge(self, other):
+        """Add another histogram's counts into this one (same configuration required)"""
+        if (other.sub_bucket_bits, other.max_value) != (self.sub_bucket_bits, self.max_value):
+            raise ValueError("Cannot merge histograms with different configurations")
+
+        for index, bucket_count in enumerate(other.counts):
+            if bucket_count:
+                self.counts[index] += bucket_count
+
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+        return self
+
+    def reset(self):
+        """Drop all recorded values"""
+        for index in range(self.bucket_total):
+            self.counts[index] = 0
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def to_dict(self):
+        """Sparse, JSON-friendly form for sending to another process"""
+        return {
+            'max_value': self.max_value,
+            'sub_bucket_bits': self.sub_bucket_bits,
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max,
+            'buckets': {str(index): c for index, c in enumerate(self.counts) if c}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a histogram produced by to_dict()"""
+        histogram = cls(max_value=data['max_value'], sub_bucket_bits=data['sub_bucket_bits'])
+        for index, bucket_count in data['buckets'].items():
+            histogram.counts[int(index)] = bucket_count
+        histogram.count = data['count']
+        histogram.total = data['total']
+        histogram.min = data['min']
+        histogram.max = data['max']
+        return histogram
+
+    def memory_bytes(self):
+        """Memory used by the bucket counters"""
+        return self.counts.itemsize * self.bucket_total
+
+
+class WindowedLatencyHistogram:
+    """Ring of per-slot histograms for last-N-seconds percentile views
+
+    Memory is fixed at `slots` histograms. A slot is reset when the ring
+    wraps around to it, so values older than slots * slot_seconds drop out.
+    """
+
+    def __init__(self, slot_seconds=10, slots=6, max_value=60 * 10**9, sub_bucket_bits=7, clock=time.monotonic):
+        """
+        Initialize Windowed Latency Histogram
+
+        Args:
+            slot_seconds: Width of one time slot
+            slots: Number of slots kept (window = slot_seconds * slots)
+            max_value, sub_bucket_bits: Passed to each LatencyHistogram
+            clock: Monotonic time source (injectable for tests)
+        """
+        self.slot_seconds = slot_seconds
+        self.slots = slots
+        self.clock = clock
+        self.histograms = [LatencyHistogram(max_value, sub_bucket_bits) for _ in range(slots)]
+        self.slot_ids = [None] * slots
+        self.max_value = max_value
+        self.sub_bucket_bits = sub_bucket_bits
+
+    def _current_slot(self):
+        """Histogram for the current time slot, resetting it if stale"""
+        slot_id = int(self.clock() // self.slot_seconds)
+        position = slot_id % self.slots
+        if self.slot_ids[position] != slot_id:
+            self.histograms[position].reset()
+            self.slot_ids[position] = slot_id
+        return self.histograms[position]
+
+    def record(self, value, count=1):
+        """Record a value in the current slot"""
+        self._current_slot().record(value, count)
+
+    def record_seconds(self, seconds, count=1):
+        """Record a duration given in seconds"""
+        self.record(seconds * 1e9, count)
+
+    def view(self, last_seconds=None):
+        """
+        Merged histogram of the slots inside the window
+
+        Args:
+            last_seconds: Window length (default: everything the ring holds)
+        """
+        current_id = int(self.clock() // self.slot_seconds)
+        window_slots = self.slots if last_seconds is None else max(1, math.ceil(last_seconds / self.slot_seconds))
+        oldest_id = current_id - min(window_slots, self.slots) + 1
+
+        merged = LatencyHistogram(self.max_value, self.sub_bucket_bits)
+        for slot_id, histogram in zip(self.slot_ids, self.histograms):
+            if slot_id is not None and oldest_id <= slot_id <= current_id:
+                merged.merge(histogram)
+        return merged
+
+
+# Testing and usage example
+if __name__ == "__main__":
+    import random
+
+    print("📈 Latency Histogram Test")
+    print("=" * 40)
+
+    histogram = LatencyHistogram()
+    rng = random.Random(42)
+    for _ in range(100000):
+        histogram.record_seconds(rng.lognormvariate(-7, 0.5))
+
+    for percent, value in histogram.percentiles((50, 90, 99, 99.9)).items():
+        print(f"p{percent}: {value / 1e6:.3f}ms")
+    print(f"💾 Memory: {histogram.memory_bytes() / 1024:.1f}KB for {histogram.count} values")
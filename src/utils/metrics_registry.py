@@ -0,0 +1,379 @@
+#!/usr/bin/env python3
+"""
+Metrics Registry for BlueEdge Framework
+=======================================
+Counters, gauges and histograms exposed in the OpenMetrics text format
+Features:
+- Thread-safe metric families with optional labels
+- Collectors that refresh metrics from live objects at scrape time
+- Tiny stdlib HTTP endpoint (GET /metrics)
+- Atomically rewritten textfile for node exporter textfile collectors
+- bind_blueedge_metrics(): comparisons, cache, sync queues, backpressure and per-stage time
+"""
+
+import os
+import math
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# Comparison latency buckets in seconds
+DEFAULT_LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _format_value(value):
+    """OpenMetrics number formatting"""
+    if isinstance(value, float):
+        if math.isinf(value):
+            return '+Inf' if value > 0 else '-Inf'
+        if math.isnan(value):
+            return 'NaN'
+        return repr(value)
+    return str(value)
+
+
+def _escape_label_value(value):
+    """Escape backslash, double quote and newline in a label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels):
+    """Render a sorted label tuple as {a="1",b="2"}"""
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape_label_value(value)}"' for name, value in labels) + '}'
+
+
+class _MetricFamily:
+    """Common state for a named metric with labelled samples"""
+
+    metric_type = 'unknown'
+
+    def __init__(self, name, documentation, unit=''):
+        self.name = name
+        self.documentation = documentation
+        self.unit = unit
+        self.values = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def _key(labels):
+        return tuple(sorted(labels.items()))
+
+    def _header(self):
+        lines = [f"# TYPE {self.name} {self.metric_type}"]
+        if self.unit:
+            lines.append(f"# UNIT {self.name} {self.unit}")
+        lines.append(f"# HELP {self.name} {self.documentation}")
+        return lines
+
+
+class Counter(_MetricFamily):
+    """Monotonically increasing count (exposed as <name>_total)"""
+
+    metric_type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        """Increase the counter"""
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def set(self, value, **labels):
+        """Mirror a monotonic count kept elsewhere (used by collectors)"""
+        with self.lock:
+            self.values[self._key(labels)] = value
+
+    def render(self):
+        lines = self._header()
+        with self.lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f"{self.name}_total{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(_MetricFamily):
+    """Value that can go up and down"""
+
+    metric_type = 'gauge'
+
+    def set(self, value, **labels):
+        """Set the current value"""
+        with self.lock:
+            self.values[self._key(labels)] = value
+
+    def inc(self, amount=1, **labels):
+        """Increase the current value"""
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def dec(self, amount=1, **labels):
+        """Decrease the current value"""
+        self.inc(-amount, **labels)
+
+    def render(self):
+        lines = self._header()
+        with self.lock:
+            for key, value in sorted(self.values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Histogram(_MetricFamily):
+    """Cumulative bucket histogram (exposed as _bucket/_count/_sum)"""
+
+    metric_type = 'histogram'
+
+    def __init__(self, name, documentation, buckets=DEFAULT_LATENCY_BUCKETS, unit=''):
+        super().__init__(name, documentation, unit)
+        self.buckets = tuple(sorted(buckets))
+
+    def _state(self, key):
+        state = self.values.get(key)
+        if state is None:
+            state = self.values[key] = {'buckets': [0] * len(self.buckets), 'count': 0, 'sum': 0.0}
+        return state
+
+    def observe(self, value, **labels):
+        """Record one observation"""
+        with self.lock:
+            state = self._state(self._key(labels))
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state['buckets'][index] += 1
+            state['count'] += 1
+            state['sum'] += value
+
+    def set_cumulative(self, bucket_counts, count, total, **labels):
+        """Mirror a distribution kept elsewhere (cumulative counts per bucket)"""
+        with self.lock:
+            self.values[self._key(labels)] = {'buckets': list(bucket_counts), 'count': count, 'sum': float(total)}
+
+    def render(self):
+        lines = self._header()
+        with self.lock:
+            for key, state in sorted(self.values.items()):
+                for bound, cumulative in zip(self.buckets, state['buckets']):
+                    le = _format_labels(key + (('le', _format_value(float(bound))),))
+                    lines.append(f"{self.name}_bucket{le} {cumulative}")
+                lines.append(f"{self.name}_bucket{_format_labels(key + (('le', '+Inf'),))} {state['count']}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {state['count']}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(state['sum'])}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named collection of metric families rendered as one OpenMetrics document"""
+
+    def __init__(self):
+        self.metrics = {}
+        self.collectors = []
+        self.lock = threading.Lock()
+
+    def _register(self, metric):
+        with self.lock:
+            existing = self.metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"Metric {metric.name} already registered as {existing.metric_type}")
+                return existing
+            self.metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, unit=''):
+        """Get or create a counter"""
+        return self._register(Counter(name, documentation, unit))
+
+    def gauge(self, name, documentation, unit=''):
+        """Get or create a gauge"""
+        return self._register(Gauge(name, documentation, unit))
+
+    def histogram(self, name, documentation, buckets=DEFAULT_LATENCY_BUCKETS, unit=''):
+        """Get or create a histogram"""
+        return self._register(Histogram(name, documentation, buckets, unit))
+
+    def add_collector(self, collector):
+        """Register a callable(registry) run before every exposition"""
+        self.collectors.append(collector)
+
+    def render(self):
+        """
+        Render all metrics in the OpenMetrics text format
+
+        Returns:
+            str: Exposition text terminated by '# EOF'
+        """
+        for collector in list(self.collectors):
+            try:
+                collector(self)
+            except Exception as e:
+                print(f"⚠️ Metrics collector failed: {e}")
+
+        lines = []
+        with self.lock:
+            metrics = [self.metrics[name] for name in sorted(self.metrics)]
+        for metric in metrics:
+            lines.extend(metric.render())
+        lines.append('# EOF')
+        return '\n'.join(lines) + '\n'
+
+    def write_textfile(self, path):
+        """Atomically replace path with the current exposition"""
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(self.render())
+        os.replace(temp_path, path)
+
+
+class TextfileExporter(threading.Thread):
+    """Daemon thread rewriting a metrics textfile every interval seconds"""
+
+    def __init__(self, registry, path, interval=15.0):
+        super().__init__(name='blueedge-metrics-textfile', daemon=True)
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self.stop_event = threading.Event()
+
+    def run(self):
+        while True:
+            try:
+                self.registry.write_textfile(self.path)
+            except OSError as e:
+                print(f"⚠️ Metrics textfile not written: {e}")
+            if self.stop_event.wait(self.interval):
+                break
+
+    def stop(self):
+        """Stop after writing a final snapshot"""
+        self.stop_event.set()
+        self.join(timeout=2)
+        self.registry.write_textfile(self.path)
+
+
+def start_http_server(registry, port=9464, address='127.0.0.1'):
+    """
+    Serve GET /metrics from a background thread
+
+    Returns:
+        ThreadingHTTPServer: call shutdown() to stop
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/metrics', '/'):
+                self.send_error(404)
+                return
+            body = registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', OPENMETRICS_CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((address, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='blueedge-metrics-http', daemon=True).start()
+    return server
+
+
+def _latency_buckets(latency_histogram, bounds_seconds):
+    """Cumulative counts of a LatencyHistogram (ns) at the given bucket bounds"""
+    bounds_ns = [bound * 1e9 for bound in bounds_seconds]
+    cumulative = [0] * len(bounds_ns)
+    for index, bucket_count in enumerate(latency_histogram.counts):
+        if not bucket_count:
+            continue
+        highest = latency_histogram._bounds_for(index)[1]
+        for position, bound in enumerate(bounds_ns):
+            if highest <= bound:
+                cumulative[position] += bucket_count
+    return cumulative
+
+
+def bind_blueedge_metrics(registry, monitor=None, cache=None, sync=None, tracer=None, io=None):
+    """
+    Expose BlueEdge components through a registry (values are read at scrape time)
+
+    Args:
+        registry: MetricsRegistry
+        monitor: SimplePerformanceMonitor
+        cache: SmartCache or ShardedSmartCache
+        sync: FirebaseSync (queue depth, shed/coalesced/blocked items, throttling)
+        tracer: tracing.Tracer (per-stage self time since start; only grows while tracing)
+        io: async_firebase.FirebaseIO (queued and shed UI saves)
+    """
+    comparisons = registry.counter('blueedge_comparisons', 'Name comparisons processed')
+    comparison_seconds = registry.histogram('blueedge_comparison_duration_seconds',
+                                            'Wall time per comparison', unit='seconds')
+    cache_requests = registry.counter('blueedge_cache_requests', 'Result cache lookups by outcome')
+    cache_evictions = registry.counter('blueedge_cache_evictions', 'Result cache evictions')
+    cache_expirations = registry.counter('blueedge_cache_expirations', 'Result cache TTL expirations')
+    cache_entries = registry.gauge('blueedge_cache_entries', 'Entries in the result cache')
+    sync_depth = registry.gauge('blueedge_sync_queue_depth', 'Items waiting in the cloud sync queue')
+    sync_backpressure = registry.counter('blueedge_sync_backpressure', 'Sync items affected by backpressure')
+    sync_throttle_waits = registry.counter('blueedge_sync_throttle_waits', 'Writes delayed by the rate limiter')
+    stage_seconds = registry.counter('blueedge_stage_seconds', 'Traced time per pipeline stage', unit='seconds')
+    stage_calls = registry.counter('blueedge_stage_calls', 'Traced calls per pipeline stage')
+    gc_pause_seconds = registry.counter('blueedge_gc_pause_seconds', 'Time spent in garbage collection', unit='seconds')
+    gc_collections = registry.counter('blueedge_gc_collections', 'Garbage collections by generation')
+
+    def collect(_registry):
+        if monitor is not None:
+            comparisons.set(monitor.total_comparisons)
+            histogram = monitor.latency_histogram
+            comparison_seconds.set_cumulative(
+                _latency_buckets(histogram, comparison_seconds.buckets),
+                histogram.count, histogram.total / 1e9
+            )
+            gc_runtime = getattr(monitor, 'gc_runtime', None)
+            if gc_runtime is not None:
+                gc_pause_seconds.set(gc_runtime.total_pause_ns / 1e9)
+                for generation, count in enumerate(gc_runtime.collections):
+                    gc_collections.set(count, generation=generation)
+        if cache is not None:
+            stats = cache.get_statistics()
+            cache_requests.set(stats['hits'], result='hit')
+            cache_requests.set(stats['misses'], result='miss')
+            cache_evictions.set(stats['evictions'])
+            cache_expirations.set(stats.get('expirations', 0))
+            cache_entries.set(stats['current_size'])
+        if sync is not None:
+            status = sync.get_queue_status()
+            sync_depth.set(status['queue_size'], queue='outbox')
+            for action in ('shed', 'coalesced', 'blocked'):
+                sync_backpressure.set(status[action], queue='outbox', action=action)
+            sync_throttle_waits.set(status['throttle_waits'], queue='outbox')
+        if io is not None:
+            stats = io.get_statistics()
+            sync_depth.set(stats['queued_saves'], queue='io')
+            sync_backpressure.set(stats['shed'], queue='io', action='shed')
+            sync_throttle_waits.set(stats['throttle_waits'], queue='io')
+        if tracer is not None:
+            for stage, totals in tracer.stage_totals().items():
+                stage_seconds.set(totals['self_seconds'], stage=stage)
+                stage_calls.set(totals['count'], stage=stage)
+
+    registry.add_collector(collect)
+    return registry
+
+
+# Testing and usage example
+if __name__ == "__main__":
+    print("📡 Metrics Registry Test")
+    print("=" * 40)
+
+    registry = MetricsRegistry()
+    requests_total = registry.counter('demo_requests', 'Demo requests')
+    latency = registry.histogram('demo_latency_seconds', 'Demo latency', unit='seconds')
+    for i in range(10):
+        requests_total.inc(route='compare')
+        latency.observe(i / 1000)
+
+    print(registry.render())
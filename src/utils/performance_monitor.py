@@ -3,30 +3,122 @@
 Fixed Simple Performance Monitor for BlueEdge Framework
 ======================================================
 Lightweight performance monitoring without recursion issues
+
+Measurements (see SimplePerformanceMonitor.measure):
+- Wall clock via time.perf_counter_ns
+- CPU time via time.process_time_ns
+- Peak Python allocations via tracemalloc, on every Nth (sampled) operation,
+  reported per comparison (mean and max), never summed into a running total
+- Process RSS via the resource module (Unix) or /proc (Linux)
+- Latency percentiles from bounded-memory log-bucketed histograms
+- Garbage-collector pauses via gc.callbacks (see gc_runtime.GCRuntime)
+- On-demand profiling of the next N comparisons (see profiler.ProfilingSession)
 """
 
+import os
 import time
 import threading
 import gc
 import sys
 import json
+import tracemalloc
+from contextlib import contextmanager
 from datetime import datetime
 from collections import deque
 
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+try:
+    from .latency_histogram import LatencyHistogram, WindowedLatencyHistogram
+except ImportError:
+    from latency_histogram import LatencyHistogram, WindowedLatencyHistogram
+
+try:
+    from .gc_runtime import GC_RUNTIME
+except ImportError:
+    from gc_runtime import GC_RUNTIME
+
+try:
+    from .profiler import ProfilingSession, parse_profile_spec
+except ImportError:
+    from profiler import ProfilingSession, parse_profile_spec
+
+# Percentiles reported by default (SLOs are defined on the tail)
+DEFAULT_PERCENTILES = (50, 95, 99, 99.9)
+
+
+def percentile_label(percent):
+    """Metric label for a percentile: 50 -> 'p50', 99.9 -> 'p999'"""
+    return 'p' + f"{percent:g}".replace('.', '')
+
+
+def get_rss_kb():
+    """
+    Get process resident set size in KB
+    
+    Returns:
+        tuple: (current_rss_kb, peak_rss_kb) - either may be None if unavailable
+    """
+    current_kb = None
+    peak_kb = None
+    
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        current_kb = pages * os.sysconf('SC_PAGE_SIZE') / 1024
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    
+    if resource is not None:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is bytes on macOS, KB elsewhere
+        peak_kb = max_rss / 1024 if sys.platform == 'darwin' else float(max_rss)
+    
+    return current_kb, peak_kb
+
 class SimplePerformanceMonitor:
     """Fixed lightweight performance monitoring for BlueEdge"""
     
-    def __init__(self, max_history=50):
+    def __init__(self, max_history=50, memory_sample_every=10, gc_runtime=None):
+        """
+        Args:
+            max_history: Number of recent comparison records kept
+            memory_sample_every: Trace allocations on every Nth measured operation
+                (0 disables tracemalloc sampling)
+            gc_runtime: GCRuntime whose pauses are reported (default: process-wide GC_RUNTIME)
+        """
         # Performance metrics storage
         self.max_history = max_history
         self.metrics_history = deque(maxlen=max_history)
         
+        # Measurement sampling
+        self.memory_sample_every = memory_sample_every
+        self.measured_operations = 0
+        
+        # Latency distribution (fixed memory, whole session and last minute)
+        self.latency_histogram = LatencyHistogram()
+        self.recent_latency = WindowedLatencyHistogram(slot_seconds=10, slots=6)
+        
+        # Garbage collection: pause accounting and growth-triggered collection
+        self.gc_runtime = gc_runtime or GC_RUNTIME
+        self.gc_runtime.track_pauses()
+        
+        # On-demand profiling (BLUEEDGE_PROFILE or start_profiling)
+        self.profiling_session = None
+        self.last_profile = None
+        self.unreleased_session = None  # finished off-thread; hook removed on next comparison
+        
         # Session metrics
         self.session_start = time.time()
         self.total_comparisons = 0
         self.total_processing_time = 0
         self.fastest_comparison = float('inf')
         self.slowest_comparison = 0
+        self.total_cpu_time = 0
+        self.cpu_measured_comparisons = 0
         
         # Cache metrics
         self.cache_hits = 0
@@ -36,18 +128,84 @@ class SimplePerformanceMonitor:
         self.estimated_memory_usage = 0
         self.peak_estimated_memory = 0
         
+        # Measured memory (tracemalloc peaks of sampled operations)
+        self.memory_samples = 0
+        self.total_sampled_peak_bytes = 0
+        self.max_sampled_peak_bytes = 0
+        
         # BlueEdge thresholds
         self.thresholds = {
             'target_processing_ms': 1000,  # 1 second target
             'max_processing_ms': 1500,     # 1.5 seconds max
-            'estimated_memory_kb': 5000,   # 5KB per comparison
+            'estimated_memory_kb': 5000,   # Budget for explicit data_size_estimate totals
+            'peak_memory_per_comparison_kb': 5,  # 5KB per comparison (sampled tracemalloc peak)
             'min_cache_hit_rate': 0.75     # 75% cache hit rate
         }
         
         print("📊 Simple Performance Monitor initialized (Fixed)")
         print(f"🎯 BlueEdge targets: {self.thresholds['target_processing_ms']}ms processing, ~5KB memory")
-        
-    def record_comparison(self, processing_time, data_size_estimate=None, cache_hit=None):
+        if resource is None:
+            print("⚠️ resource module unavailable - peak RSS will not be reported")
+        
+        profile_spec = parse_profile_spec(os.environ.get('BLUEEDGE_PROFILE'))
+        if profile_spec:
+            self.start_profiling(**profile_spec)
+        
+    @contextmanager
+    def measure(self, cache_hit=None):
+        """
+        Measure one operation and record it as a comparison
+        
+        Yields a dict; callers may set 'cache_hit' on it. After the block it
+        holds 'wall_time', 'cpu_time', 'peak_memory_bytes' and 'sampled'.
+        
+        Usage:
+            with monitor.measure() as measurement:
+                result = detector.are_duplicates(name1, name2)
+        """
+        self.measured_operations += 1
+        sampled = bool(self.memory_sample_every) and self.measured_operations % self.memory_sample_every == 0
+        started_tracing = False
+        base_memory = 0
+        
+        if sampled:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                started_tracing = True
+            base_memory = tracemalloc.get_traced_memory()[0]
+        
+        measurement = {'cache_hit': cache_hit}
+        wall_start = time.perf_counter_ns()
+        cpu_start = time.process_time_ns()
+        try:
+            yield measurement
+        finally:
+            wall_ns = time.perf_counter_ns() - wall_start
+            cpu_ns = time.process_time_ns() - cpu_start
+            
+            peak_bytes = None
+            if sampled:
+                peak_bytes = max(0, tracemalloc.get_traced_memory()[1] - base_memory)
+                if started_tracing:
+                    tracemalloc.stop()
+            
+            measurement.update({
+                'wall_time': wall_ns / 1e9,
+                'cpu_time': cpu_ns / 1e9,
+                'peak_memory_bytes': peak_bytes,
+                'sampled': sampled
+            })
+            self.record_comparison(
+                measurement['wall_time'],
+                cache_hit=measurement['cache_hit'],
+                cpu_time=measurement['cpu_time'],
+                peak_memory_bytes=peak_bytes
+            )
+    
+    def record_comparison(self, processing_time, data_size_estimate=None, cache_hit=None,
+                          cpu_time=None, peak_memory_bytes=None):
         """Record a name comparison operation"""
         timestamp = time.time()
         processing_ms = processing_time * 1000
@@ -56,17 +214,29 @@ class SimplePerformanceMonitor:
         self.total_comparisons += 1
         self.total_processing_time += processing_time
         
+        # Latency distribution
+        self.latency_histogram.record_seconds(processing_time)
+        self.recent_latency.record_seconds(processing_time)
+        
+        if cpu_time is not None:
+            self.total_cpu_time += cpu_time
+            self.cpu_measured_comparisons += 1
+        
+        if peak_memory_bytes is not None:
+            self.memory_samples += 1
+            self.total_sampled_peak_bytes += peak_memory_bytes
+            self.max_sampled_peak_bytes = max(self.max_sampled_peak_bytes, peak_memory_bytes)
+        
         # Update performance ranges
         if processing_time < self.fastest_comparison:
             self.fastest_comparison = processing_time
         if processing_time > self.slowest_comparison:
             self.slowest_comparison = processing_time
         
-        # Estimate memory usage
+        # Explicit caller estimates accumulate; sampled peaks are transient and
+        # only feed the per-comparison mean/max above
         if data_size_estimate:
             self.estimated_memory_usage += data_size_estimate
-        else:
-            self.estimated_memory_usage += 5 * 1024  # 5KB default
         
         if self.estimated_memory_usage > self.peak_estimated_memory:
             self.peak_estimated_memory = self.estimated_memory_usage
@@ -82,6 +252,8 @@ class SimplePerformanceMonitor:
             'timestamp': timestamp,
             'comparison_id': self.total_comparisons,
             'processing_time_ms': processing_ms,
+            'cpu_time_ms': cpu_time * 1000 if cpu_time is not None else None,
+            'peak_memory_kb': peak_memory_bytes / 1024 if peak_memory_bytes is not None else None,
             'estimated_memory_kb': self.estimated_memory_usage / 1024,
             'cache_hit': cache_hit,
             'session_duration_s': timestamp - self.session_start,
@@ -94,12 +266,76 @@ class SimplePerformanceMonitor:
         # Check for performance alerts
         self._check_performance_alerts(record)
         
-        # Auto cleanup every 10 comparisons
+        # Growth check every 10 comparisons (collects only when needed)
         if self.total_comparisons % 10 == 0:
             self._auto_cleanup()
         
+        session = self.profiling_session
+        if session is not None and session.on_comparison():
+            self.stop_profiling()
+        elif self.unreleased_session is not None and self.unreleased_session.release_thread():
+            self.unreleased_session = None
+        
         return record
     
+    def start_profiling(self, comparisons=None, seconds=None, output_dir=None, use_cprofile=True):
+        """
+        Profile the next comparisons (call from the thread doing the comparisons)
+        
+        Args:
+            comparisons: Number of comparisons to profile (default 100 if no seconds)
+            seconds: Wall-clock budget (ends the session even without comparisons)
+            output_dir: Directory for .pstats/.collapsed output
+            use_cprofile: False for stack sampling only (lowest overhead)
+            
+        Returns:
+            ProfilingSession: The active session
+        """
+        if self.profiling_session is None:
+            self.profiling_session = ProfilingSession(
+                comparisons=comparisons, seconds=seconds,
+                output_dir=output_dir, use_cprofile=use_cprofile,
+                on_deadline=self.stop_profiling
+            ).start()
+        return self.profiling_session
+    
+    def stop_profiling(self):
+        """Finish the active profiling session and return where the output landed"""
+        session = self.profiling_session
+        if session is None:
+            return None
+        self.profiling_session = None
+        result = session.finish()
+        if result is None:  # already finished by the other thread
+            return self.last_profile
+        self.last_profile = result
+        if threading.get_ident() != session.thread_id:
+            self.unreleased_session = session
+        return self.last_profile
+    
+    def get_latency_percentiles(self, percents=DEFAULT_PERCENTILES, window_seconds=None):
+        """
+        Latency percentiles in milliseconds
+        
+        Args:
+            percents: Percentiles to report (0-100)
+            window_seconds: Only the last N seconds (up to 60); None = whole session
+            
+        Returns:
+            dict: {'p50': ms, 'p95': ms, ...}
+        """
+        histogram = self.latency_histogram if window_seconds is None else self.recent_latency.view(window_seconds)
+        return {
+            percentile_label(percent): value / 1e6
+            for percent, value in histogram.percentiles(percents).items()
+        }
+    
+    def merge_latency_histogram(self, histogram):
+        """Fold a histogram recorded elsewhere (another thread/process) into the session"""
+        if isinstance(histogram, dict):
+            histogram = LatencyHistogram.from_dict(histogram)
+        self.latency_histogram.merge(histogram)
+    
     def get_current_metrics(self):
         """Get current performance metrics (fixed - no recursion)"""
         current_time = time.time()
@@ -117,6 +353,12 @@ class SimplePerformanceMonitor:
         # Calculate efficiency WITHOUT calling self methods
         efficiency_score = self._calculate_efficiency_direct(avg_processing_time * 1000, cache_hit_rate)
         
+        # Measured resources
+        current_rss_kb, peak_rss_kb = get_rss_kb()
+        avg_cpu_ms = (self.total_cpu_time / self.cpu_measured_comparisons * 1000) if self.cpu_measured_comparisons else None
+        avg_peak_kb = (self.total_sampled_peak_bytes / self.memory_samples / 1024) if self.memory_samples else None
+        memory_kb, memory_target_kb, memory_basis = self._memory_status()
+        
         return {
             # Session summary
             'session_duration_s': session_duration,
@@ -129,12 +371,34 @@ class SimplePerformanceMonitor:
             'recent_avg_processing_time_ms': recent_avg_time,
             'fastest_comparison_ms': self.fastest_comparison * 1000 if self.fastest_comparison != float('inf') else 0,
             'slowest_comparison_ms': self.slowest_comparison * 1000,
+            'latency_percentiles_ms': self.get_latency_percentiles(),
+            'recent_latency_percentiles_ms': self.get_latency_percentiles(window_seconds=60),
+            
+            # Memory figure checked against the target (see _memory_status)
+            'memory_kb': memory_kb,
+            'memory_target_kb': memory_target_kb,
+            'memory_basis': memory_basis,
             
             # Memory estimates
             'estimated_current_memory_kb': self.estimated_memory_usage / 1024,
             'peak_estimated_memory_kb': self.peak_estimated_memory / 1024,
             'estimated_memory_per_comparison_kb': (self.estimated_memory_usage / self.total_comparisons / 1024) if self.total_comparisons > 0 else 0,
             
+            # Measured resources (None when not measured on this platform/session)
+            'avg_cpu_time_ms': avg_cpu_ms,
+            'measured_peak_memory_per_comparison_kb': avg_peak_kb,
+            'max_peak_memory_per_comparison_kb': self.max_sampled_peak_bytes / 1024 if self.memory_samples else None,
+            'memory_samples': self.memory_samples,
+            'rss_kb': current_rss_kb,
+            'peak_rss_kb': peak_rss_kb,
+            
+            # Garbage collection
+            'gc': self.gc_runtime.get_statistics(),
+            
+            # Profiling
+            'profiling_active': self.profiling_session is not None,
+            'last_profile': self.last_profile,
+            
             # Cache performance
             'cache_hit_rate': cache_hit_rate,
             'cache_hits': self.cache_hits,
@@ -156,7 +420,7 @@ class SimplePerformanceMonitor:
             'total_comparisons': metrics['total_comparisons'],
             'avg_time_ms': round(metrics['avg_processing_time_ms']),
             'recent_time_ms': round(metrics['recent_avg_processing_time_ms']),
-            'memory_kb': round(metrics['estimated_current_memory_kb']),
+            'memory_kb': round(metrics['memory_kb'], 1),
             'cache_rate': round(metrics['cache_hit_rate'] * 100),
             'efficiency': round(metrics['efficiency_score']),
             'status': metrics['performance_status'],
@@ -187,15 +451,40 @@ class SimplePerformanceMonitor:
                     'fastest_ms': round(metrics['fastest_comparison_ms']),
                     'slowest_ms': round(metrics['slowest_comparison_ms']),
                     'recent_average_ms': round(metrics['recent_avg_processing_time_ms']),
+                    'percentiles_ms': {label: round(value, 3) for label, value in metrics['latency_percentiles_ms'].items()},
+                    'recent_percentiles_ms': {label: round(value, 3) for label, value in metrics['recent_latency_percentiles_ms'].items()},
                     'target_ms': self.thresholds['target_processing_ms'],
                     'meets_target': metrics['avg_processing_time_ms'] <= self.thresholds['target_processing_ms']
                 },
+                'measured_resources': {
+                    'avg_cpu_time_ms': metrics['avg_cpu_time_ms'],
+                    'peak_memory_per_comparison_kb': metrics['measured_peak_memory_per_comparison_kb'],
+                    'max_peak_memory_per_comparison_kb': metrics['max_peak_memory_per_comparison_kb'],
+                    'memory_samples': metrics['memory_samples'],
+                    'rss_kb': metrics['rss_kb'],
+                    'peak_rss_kb': metrics['peak_rss_kb']
+                },
+                'garbage_collection': {
+                    'mode': metrics['gc']['mode'],
+                    'collections_by_generation': metrics['gc']['collections_by_generation'],
+                    'growth_collections': metrics['gc']['growth_collections'],
+                    'frozen_objects': metrics['gc']['frozen_objects'],
+                    'total_pause_ms': round(metrics['gc']['total_pause_ms'], 3),
+                    'max_pause_ms': round(metrics['gc']['max_pause_ms'], 3),
+                    'p99_pause_ms': round(metrics['gc']['p99_pause_ms'], 3)
+                },
+                'profiling': {
+                    'active': metrics['profiling_active'],
+                    'last_profile': metrics['last_profile']
+                },
                 'memory_usage': {
+                    'basis': metrics['memory_basis'],
+                    'measured_kb': round(metrics['memory_kb'], 1),
                     'estimated_current_kb': round(metrics['estimated_current_memory_kb']),
                     'estimated_peak_kb': round(metrics['peak_estimated_memory_kb']),
                     'per_comparison_kb': round(metrics['estimated_memory_per_comparison_kb'], 1),
-                    'blueedge_target_kb': self.thresholds['estimated_memory_kb'],
-                    'within_target': metrics['estimated_current_memory_kb'] <= self.thresholds['estimated_memory_kb']
+                    'blueedge_target_kb': metrics['memory_target_kb'],
+                    'within_target': metrics['memory_kb'] <= metrics['memory_target_kb']
                 },
                 'cache_efficiency': {
                     'hit_rate_percent': round(metrics['cache_hit_rate'] * 100, 1),
@@ -224,6 +513,7 @@ class SimplePerformanceMonitor:
         try:
             report = self.generate_report()
             report['raw_metrics_history'] = list(self.metrics_history)
+            report['latency_histogram'] = self.latency_histogram.to_dict()
             
             with open(filename, 'w', encoding='utf-8') as f:
                 json.dump(report, f, indent=2, default=str, ensure_ascii=False)
@@ -258,10 +548,10 @@ class SimplePerformanceMonitor:
             time_penalty = min(40, (avg_processing_ms - self.thresholds['target_processing_ms']) / 10)
             score -= time_penalty
         
-        # Memory impact (30% weight)
-        memory_kb = self.estimated_memory_usage / 1024
-        if memory_kb > self.thresholds['estimated_memory_kb']:
-            memory_penalty = min(30, (memory_kb - self.thresholds['estimated_memory_kb']) / 1000)
+        # Memory impact (30% weight): 1 point per 20% over target
+        memory_kb, target_kb, _ = self._memory_status()
+        if memory_kb > target_kb:
+            memory_penalty = min(30, (memory_kb - target_kb) / target_kb * 5)
             score -= memory_penalty
         
         # Cache impact (30% weight)
@@ -271,6 +561,20 @@ class SimplePerformanceMonitor:
         
         return max(0, min(100, score))
     
+    def _memory_status(self):
+        """
+        Memory figure for targets, compliance and efficiency
+        
+        Returns:
+            tuple: (memory_kb, target_kb, basis) - the mean sampled peak per
+                comparison when tracemalloc samples exist ('measured'), else
+                the running total of explicit estimates ('estimate')
+        """
+        if self.memory_samples:
+            return (self.total_sampled_peak_bytes / self.memory_samples / 1024,
+                    self.thresholds['peak_memory_per_comparison_kb'], 'measured')
+        return self.estimated_memory_usage / 1024, self.thresholds['estimated_memory_kb'], 'estimate'
+    
     def _get_status_direct(self, efficiency):
         """Get status based on efficiency score"""
         if efficiency >= 90:
@@ -284,11 +588,11 @@ class SimplePerformanceMonitor:
     
     def _check_compliance_direct(self, avg_processing_ms, cache_hit_rate):
         """Check BlueEdge compliance directly"""
-        memory_kb = self.estimated_memory_usage / 1024
+        memory_kb, target_kb, _ = self._memory_status()
         
         compliance = {
             'processing_time_compliant': avg_processing_ms <= self.thresholds['target_processing_ms'],
-            'memory_compliant': memory_kb <= self.thresholds['estimated_memory_kb'],
+            'memory_compliant': memory_kb <= target_kb,
             'cache_compliant': cache_hit_rate >= self.thresholds['min_cache_hit_rate']
         }
         
@@ -300,7 +604,7 @@ class SimplePerformanceMonitor:
     def _get_tips_direct(self, avg_processing_ms, cache_hit_rate):
         """Get optimization tips directly"""
         tips = []
-        memory_kb = self.estimated_memory_usage / 1024
+        memory_kb, target_kb, memory_basis = self._memory_status()
         
         if avg_processing_ms > self.thresholds['target_processing_ms']:
             tips.append({
@@ -309,10 +613,11 @@ class SimplePerformanceMonitor:
                 'priority': 'high' if avg_processing_ms > self.thresholds['max_processing_ms'] else 'medium'
             })
         
-        if memory_kb > self.thresholds['estimated_memory_kb']:
+        if memory_kb > target_kb:
+            label = "Peak memory per comparison" if memory_basis == 'measured' else "Estimated memory usage"
             tips.append({
                 'category': 'memory',
-                'tip': f"Memory usage ({memory_kb:.0f}KB) exceeds target ({self.thresholds['estimated_memory_kb']}KB)",
+                'tip': f"{label} ({memory_kb:.1f}KB) exceeds target ({target_kb}KB)",
                 'priority': 'medium'
             })
         
@@ -334,11 +639,11 @@ class SimplePerformanceMonitor:
             print(f"💾 High memory usage estimated: {record['estimated_memory_kb']:.0f}KB")
     
     def _auto_cleanup(self):
-        """Automatic memory cleanup"""
+        """Automatic memory cleanup (no forced collection on the hot path)"""
         try:
-            gc.collect()
             self.estimated_memory_usage = max(0, self.estimated_memory_usage * 0.8)
-            print(f"🧹 Auto cleanup executed (comparison #{self.total_comparisons})")
+            if self.gc_runtime.maybe_collect():
+                print(f"🧹 Allocation growth - collection executed (comparison #{self.total_comparisons})")
         except Exception as e:
             print(f"❌ Cleanup failed: {e}")
     
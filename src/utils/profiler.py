@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+On-Demand Profiler for BlueEdge Framework
+=========================================
+Profile the next N comparisons or T seconds on a running device
+Features:
+- cProfile over the profiled thread, saved as .pstats
+- Low-overhead stack sampler, saved as flamegraph-ready collapsed stacks
+- Budget by comparison count and/or wall-clock seconds (a timer ends the
+  session at the deadline even if no comparison arrives)
+- Switchable from the app (performance report) or BLUEEDGE_PROFILE
+
+BLUEEDGE_PROFILE values: "200" (next 200 comparisons), "30s" (next 30
+seconds), "on" (next 100 comparisons). Output goes to BLUEEDGE_PROFILE_DIR
+(default: current directory).
+"""
+
+import os
+import sys
+import time
+import cProfile
+import threading
+from datetime import datetime
+
+DEFAULT_PROFILE_COMPARISONS = 100
+
+
+def parse_profile_spec(spec):
+    """
+    Parse a BLUEEDGE_PROFILE value
+
+    Returns:
+        dict: {'comparisons': int or None, 'seconds': float or None}, or None when disabled
+    """
+    spec = (spec or '').strip().lower()
+    if spec in ('', '0', 'off', 'false', 'no'):
+        return None
+    if spec in ('1', 'on', 'true', 'yes'):
+        return {'comparisons': DEFAULT_PROFILE_COMPARISONS, 'seconds': None}
+    try:
+        if spec.endswith('s'):
+            return {'comparisons': None, 'seconds': float(spec[:-1])}
+        return {'comparisons': int(spec), 'seconds': None}
+    except ValueError:
+        print(f"⚠️ Invalid BLUEEDGE_PROFILE '{spec}' - profiling disabled")
+        return None
+
+
+class StackSampler(threading.Thread):
+    """Daemon thread sampling one thread's Python stack at a fixed interval"""
+
+    def __init__(self, thread_id, interval=0.005, deadline=None):
+        """
+        Args:
+            thread_id: threading.get_ident() of the thread to sample
+            interval: Seconds between samples
+            deadline: time.monotonic() after which sampling stops
+        """
+        super().__init__(name='blueedge-stack-sampler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.deadline = deadline
+        self.stacks = {}
+        self.samples = 0
+        self.stop_event = threading.Event()
+
+    @staticmethod
+    def _frame_label(frame):
+        code = frame.f_code
+        return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+    def run(self):
+        while not self.stop_event.wait(self.interval):
+            if self.deadline is not None and time.monotonic() >= self.deadline:
+                break
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            labels = []
+            while frame is not None:
+                labels.append(self._frame_label(frame))
+                frame = frame.f_back
+            key = ';'.join(reversed(labels))
+            self.stacks[key] = self.stacks.get(key, 0) + 1
+            self.samples += 1
+
+    def stop(self):
+        self.stop_event.set()
+        if self.is_alive():
+            self.join(timeout=1)
+
+    def write_collapsed(self, path):
+        """Write 'frame;frame;frame <samples>' lines"""
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+class ProfilingSession:
+    """Profiles the calling thread until a comparison or time budget is used up
+
+    Start the session on the thread doing the comparisons: cProfile only
+    observes the thread that enabled it. A seconds budget is enforced by a
+    timer thread. Before Python 3.12 a cProfile hook can only be removed by
+    its own thread, so after a deadline finish the profiled thread should
+    call release_thread() (the performance monitor does this on its next
+    comparison); until then the hook runs but nothing is reported.
+    """
+
+    def __init__(self, comparisons=None, seconds=None, output_dir=None,
+                 use_cprofile=True, sample_interval=0.005, on_deadline=None):
+        """
+        Args:
+            comparisons: Stop after this many comparisons
+            seconds: Stop after this many seconds
+            output_dir: Where .pstats/.collapsed files are written
+            use_cprofile: Also run cProfile (deterministic, higher overhead)
+            sample_interval: Stack sampler interval in seconds (0 disables)
+            on_deadline: Called on the timer thread when the seconds budget
+                runs out (default: finish())
+        """
+        if comparisons is None and seconds is None:
+            comparisons = DEFAULT_PROFILE_COMPARISONS
+        self.comparisons_budget = comparisons
+        self.seconds_budget = seconds
+        self.output_dir = output_dir or os.environ.get('BLUEEDGE_PROFILE_DIR', '.')
+        self.use_cprofile = use_cprofile
+        self.sample_interval = sample_interval
+        self.on_deadline = on_deadline
+
+        self.profiler = None
+        self.sampler = None
+        self.timer = None
+        self.thread_id = None
+        self.comparisons_seen = 0
+        self.started_at = None
+        self.active = False
+        self.finish_lock = threading.Lock()
+
+    def start(self):
+        """Begin profiling the calling thread"""
+        self.started_at = time.monotonic()
+        self.thread_id = threading.get_ident()
+        deadline = self.started_at + self.seconds_budget if self.seconds_budget else None
+
+        if self.sample_interval:
+            self.sampler = StackSampler(threading.get_ident(), self.sample_interval, deadline)
+            self.sampler.start()
+        if self.use_cprofile:
+            self.profiler = cProfile.Profile()
+            try:
+                self.profiler.enable()
+            except ValueError as e:  # another profiler is already active
+                print(f"⚠️ cProfile unavailable ({e}) - stack sampling only")
+                self.profiler = None
+
+        self.active = True
+        if self.seconds_budget:
+            self.timer = threading.Timer(self.seconds_budget, self._deadline_reached)
+            self.timer.daemon = True
+            self.timer.start()
+        budget = f"{self.comparisons_budget} comparisons" if self.comparisons_budget else f"{self.seconds_budget}s"
+        print(f"🔬 Profiling started ({budget})")
+        return self
+
+    def budget_exhausted(self):
+        """True once the comparison or time budget is used up"""
+        if self.comparisons_budget is not None and self.comparisons_seen >= self.comparisons_budget:
+            return True
+        if self.seconds_budget is not None and time.monotonic() - self.started_at >= self.seconds_budget:
+            return True
+        return False
+
+    def on_comparison(self):
+        """Count one comparison; returns True when the session should finish"""
+        self.comparisons_seen += 1
+        return self.budget_exhausted()
+
+    def _deadline_reached(self):
+        if self.active:
+            (self.on_deadline or self.finish)()
+
+    def release_thread(self):
+        """
+        Remove a cProfile hook left on the calling thread by a finish() from
+        another thread (Python < 3.12)
+
+        Returns:
+            bool: True when called on the profiled thread
+        """
+        if threading.get_ident() != self.thread_id:
+            return False
+        if self.profiler is not None and sys.getprofile() is self.profiler:
+            sys.setprofile(None)
+        return True
+
+    def finish(self):
+        """
+        Stop profiling and write the output files
+
+        Returns:
+            dict: Output paths and session totals
+        """
+        with self.finish_lock:
+            if not self.active:
+                return None
+            self.active = False
+
+        if self.timer is not None:
+            self.timer.cancel()
+        if self.profiler is not None:
+            self.profiler.disable()
+            if threading.get_ident() == self.thread_id:
+                self.release_thread()
+        if self.sampler is not None:
+            self.sampler.stop()
+
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir, f"blueedge_profile_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}")
+
+        result = {
+            'comparisons': self.comparisons_seen,
+            'duration_s': time.monotonic() - self.started_at,
+            'pstats_path': None,
+            'collapsed_path': None,
+            'samples': self.sampler.samples if self.sampler else 0
+        }
+        if self.profiler is not None:
+            result['pstats_path'] = base + '.pstats'
+            self.profiler.dump_stats(result['pstats_path'])
+        if self.sampler is not None:
+            result['collapsed_path'] = base + '.collapsed'
+            self.sampler.write_collapsed(result['collapsed_path'])
+
+        print(f"🔬 Profiling finished: {result['comparisons']} comparisons in {result['duration_s']:.1f}s")
+        for key in ('pstats_path', 'collapsed_path'):
+            if result[key]:
+                print(f"   📄 {result[key]}")
+        return result
+
+
+# Testing and usage example
+if __name__ == "__main__":
+    import pstats
+
+    print("🔬 Profiler Test")
+    print("=" * 40)
+
+    session = ProfilingSession(comparisons=2000, output_dir='.').start()
+    while True:
+        sorted(str(i) for i in range(200))
+        if session.on_comparison():
+            break
+    result = session.finish()
+
+    pstats.Stats(result['pstats_path']).sort_stats('cumulative').print_stats(5)
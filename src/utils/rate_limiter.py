@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Token Bucket Rate Limiter for BlueEdge Framework
+================================================
+Client-side budget for requests to the cloud backend
+Features:
+- Sustained rate with a bounded burst (bucket capacity)
+- Non-blocking try_acquire / time_until for event loops and sync threads
+- Blocking acquire with timeout and an optional stop event
+- Thread-safe; injectable clock for tests
+"""
+
+import time
+import threading
+
+
+class TokenBucket:
+    """Refills `rate` tokens per second up to `capacity`"""
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Largest burst, at least 1 (default: one second of tokens)
+            clock: Monotonic time source in seconds
+        """
+        if rate <= 0:
+            raise ValueError(f"Token bucket rate must be positive (got {rate})")
+        if capacity is not None and capacity < 1:
+            raise ValueError(f"Token bucket capacity must be at least 1 (got {capacity})")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self.clock = clock
+        self.lock = threading.Lock()
+
+        self.tokens = self.capacity
+        self.updated = clock()
+
+        # Statistics
+        self.granted = 0
+        self.throttled = 0
+
+    def _refill(self):
+        """Add tokens for the time elapsed (lock held)"""
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens=1):
+        """Take tokens if available now"""
+        with self.lock:
+            self._refill()
+            if self.tokens >= tokens:
+                self.tokens -= tokens
+                self.granted += 1
+                return True
+            self.throttled += 1
+            return False
+
+    def _check_request(self, tokens):
+        """Reject requests the bucket can never hold (they would wait forever)"""
+        if tokens > self.capacity:
+            raise ValueError(f"Requested {tokens} tokens but the bucket holds at most {self.capacity:g}")
+
+    def time_until(self, tokens=1):
+        """Seconds until `tokens` will be available (0 when available now)"""
+        self._check_request(tokens)
+        with self.lock:
+            self._refill()
+            return max(0.0, (tokens - self.tokens) / self.rate)
+
+    def acquire(self, tokens=1, timeout=None, stop_event=None):
+        """
+        Wait for tokens
+
+        Args:
+            timeout: Longest wait in seconds (None = no limit)
+            stop_event: threading.Event that aborts the wait
+
+        Returns:
+            bool: True when the tokens were taken
+
+        Raises:
+            ValueError: tokens exceeds the bucket capacity
+        """
+        self._check_request(tokens)
+        deadline = None if timeout is None else self.clock() + timeout
+        while not self.try_acquire(tokens):
+            wait = self.time_until(tokens)
+            if deadline is not None:
+                remaining = deadline - self.clock()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            if stop_event is not None:
+                if stop_event.wait(wait):
+                    return False
+            else:
+                time.sleep(wait)
+        return True
+
+    def get_statistics(self):
+        with self.lock:
+            self._refill()
+            return {
+                'rate': self.rate,
+                'capacity': self.capacity,
+                'available': self.tokens,
+                'granted': self.granted,
+                'throttled': self.throttled
+            }
+
+
+# Testing and usage example
+if __name__ == "__main__":
+    print("🪣 Token Bucket Test")
+    print("=" * 40)
+
+    bucket = TokenBucket(rate=20, capacity=5)
+    start = time.perf_counter()
+    for _ in range(25):
+        bucket.acquire()
+    print(f"25 tokens at 20/s with burst 5: {time.perf_counter() - start:.2f}s (expected ~1.0s)")
+    print(f"Statistics: {bucket.get_statistics()}")
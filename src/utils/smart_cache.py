@@ -9,34 +9,140 @@ Features:
 - Memory-efficient storage for mobile devices
 - Cache analytics and optimization
 - Mobile-optimized for 5KB memory constraint per comparison
+- Lock-striped sharded variant for concurrent callers
+- Two-tier caching: prepared names (tier 1) under pair results (tier 2)
+- Min-heap TTL expiry with bounded work per lookup and optional background thread
+- Declarative @cached decorator for detector and similarity methods
+- Compact binary snapshots for shipping preloaded caches to devices
 """
 
+import os
 import time
 import hashlib
 import json
+import struct
+import marshal
+import zlib
+import tempfile
+import heapq
+import threading
+import functools
 from collections import OrderedDict
 from datetime import datetime
 
+try:
+    from .tracing import traced
+except ImportError:
+    from tracing import traced
+
+# Snapshot file layout: header (magic, version, entry count) + zlib-compressed JSON entries
+SNAPSHOT_MAGIC = b'BESC'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct('>4sBI')
+
+class PreparedNameCache:
+    """First-tier cache of prepared names keyed by the raw name string
+    
+    Pair results rarely repeat in one-vs-many workloads, but the individual
+    names do. Detectors store their normalized/tokenized form of each name
+    here so a new pair only prepares the names it has never seen.
+    """
+    
+    def __init__(self, max_size=200):
+        """
+        Initialize Prepared Name Cache
+        
+        Args:
+            max_size: Maximum number of prepared names kept (LRU)
+        """
+        self.cache = OrderedDict()
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        
+        # Tier statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.total_requests = 0
+    
+    def get_or_prepare(self, name, prepare, kind='name'):
+        """
+        Return the prepared form of a name, preparing and storing it on a miss
+        
+        Args:
+            name: Raw name string
+            prepare: Callable producing the prepared form from the raw name
+            kind: Namespace so different preparers can share one tier
+        """
+        key = (kind, name)
+        
+        with self.lock:
+            self.total_requests += 1
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                self.hits += 1
+                return self.cache[key]
+            self.misses += 1
+        
+        # Prepare outside the lock; a concurrent duplicate prepare is harmless
+        prepared = prepare(name)
+        
+        with self.lock:
+            self.cache[key] = prepared
+            self.cache.move_to_end(key)
+            while len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
+                self.evictions += 1
+        
+        return prepared
+    
+    def clear(self):
+        """Clear all prepared names"""
+        with self.lock:
+            cleared_count = len(self.cache)
+            self.cache.clear()
+        return cleared_count
+    
+    def get_statistics(self):
+        """Get name tier statistics"""
+        total_requests = max(1, self.total_requests)
+        return {
+            'total_requests': self.total_requests,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total_requests,
+            'evictions': self.evictions,
+            'current_size': len(self.cache),
+            'max_size': self.max_size
+        }
+
+
 class SmartCache:
     """Intelligent caching system for BlueEdge name comparisons"""
     
-    def __init__(self, max_size=50, max_memory_kb=25):
+    def __init__(self, max_size=50, max_memory_kb=25, verbose=True, name_cache_size=200):
         """
         Initialize Smart Cache
         
         Args:
             max_size: Maximum number of cached results (default: 50 for mobile)
             max_memory_kb: Maximum memory usage in KB (default: 25KB for mobile)
+            verbose: Print initialization and cleanup messages
+            name_cache_size: Size of the prepared-name tier (0 disables it)
         """
         # Cache storage (using OrderedDict for LRU)
         self.cache = OrderedDict()
         self.max_size = max_size
         self.max_memory_kb = max_memory_kb
         
+        # First tier: prepared names shared by every pair that contains them
+        self.name_cache = PreparedNameCache(name_cache_size) if name_cache_size > 0 else None
+        
         # Cache statistics
         self.hits = 0
         self.misses = 0
         self.evictions = 0
+        self.expirations = 0
         self.total_requests = 0
         
         # Performance tracking
@@ -47,9 +153,15 @@ class SmartCache:
         # Cache configuration (mobile-optimized)
         self.similarity_threshold = 0.95  # 95% similarity for cache hit
         self.expire_hours = 12  # Cache entries expire after 12 hours (mobile-optimized)
-        self.cleanup_interval = 300  # Cleanup every 5 minutes
+        self.expire_batch_size = 16  # Max expired items removed per lookup
+        self.inline_expiry = True  # Disabled when a maintenance thread owns expiry
+        
+        # Min-heap of (deadline, key, created_at); stale entries are skipped lazily
+        self._expiry_heap = []
         
-        print(f"🧠 Smart Cache initialized - Max: {max_size} items, {max_memory_kb}KB")
+        self.verbose = verbose
+        if verbose:
+            print(f"🧠 Smart Cache initialized - Max: {max_size} items, {max_memory_kb}KB")
     
     def get_cache_key(self, name1, name2):
         """Generate cache key for name pair"""
@@ -69,17 +181,25 @@ class SmartCache:
         """
         Get cached comparison result
         
+        Returns:
+            tuple: (found, result) - found is boolean, result is cached data or None
+        """
+        return self.get_by_key(self.get_cache_key(name1, name2))
+    
+    @traced('SmartCache.get')
+    def get_by_key(self, cache_key):
+        """
+        Get cached result by a precomputed (hashable) cache key
+        
         Returns:
             tuple: (found, result) - found is boolean, result is cached data or None
         """
         self.total_requests += 1
         
-        # Check if cleanup is needed
-        if time.time() - self.last_cleanup > self.cleanup_interval:
+        # Expire due items with bounded work (O(1) when nothing is due)
+        if self.inline_expiry and self._expiry_heap and self._expiry_heap[0][0] <= time.time():
             self._auto_cleanup()
         
-        cache_key = self.get_cache_key(name1, name2)
-        
         if cache_key in self.cache:
             cached_item = self.cache[cache_key]
             
@@ -87,6 +207,7 @@ class SmartCache:
             if self._is_expired(cached_item):
                 del self.cache[cache_key]
                 self.estimated_memory_bytes -= cached_item['size_bytes']
+                self.expirations += 1
                 self.misses += 1
                 return False, None
             
@@ -111,8 +232,18 @@ class SmartCache:
             name1, name2: Names being compared
             comparison_result: The comparison result to cache
         """
-        cache_key = self.get_cache_key(name1, name2)
+        self.put_by_key(self.get_cache_key(name1, name2), comparison_result, name1, name2)
+    
+    @traced('SmartCache.put')
+    def put_by_key(self, cache_key, comparison_result, name1='', name2=''):
+        """
+        Store a result under a precomputed (hashable) cache key
         
+        Args:
+            cache_key: Key produced by get_cache_key or a @cached key function
+            comparison_result: The result to cache
+            name1, name2: Names being compared (kept for diagnostics)
+        """
         # Create cache entry
         cache_entry = {
             'key': cache_key,
@@ -139,6 +270,12 @@ class SmartCache:
         self.cache[cache_key] = cache_entry
         self.estimated_memory_bytes += cache_entry['size_bytes']
         
+        # Schedule expiry
+        deadline = cache_entry['created_at'] + self.expire_hours * 3600
+        heapq.heappush(self._expiry_heap, (deadline, cache_key, cache_entry['created_at']))
+        if len(self._expiry_heap) > 2 * len(self.cache) + 64:
+            self._compact_expiry_heap()
+        
         # Check size limit and evict if necessary
         while len(self.cache) > self.max_size:
             self._evict_lru()
@@ -164,6 +301,7 @@ class SmartCache:
             'hit_rate': hit_rate,
             'miss_rate': miss_rate,
             'evictions': self.evictions,
+            'expirations': self.expirations,
             
             # Cache status
             'current_size': len(self.cache),
@@ -179,20 +317,144 @@ class SmartCache:
             'avg_access_per_item': avg_access_per_item,
             'cache_age_hours': (time.time() - self.creation_time) / 3600,
             'last_cleanup_ago_minutes': (time.time() - self.last_cleanup) / 60,
+            'expiry_heap_size': len(self._expiry_heap),
             
             # Efficiency rating
-            'efficiency_score': self._calculate_efficiency_score(hit_rate, memory_utilization)
+            'efficiency_score': self._calculate_efficiency_score(hit_rate, memory_utilization),
+            
+            # Prepared-name tier
+            'name_tier': self.name_cache.get_statistics() if self.name_cache else None
         }
     
     def clear(self):
         """Clear all cached items"""
         cleared_count = len(self.cache)
         self.cache.clear()
+        self._expiry_heap.clear()
         self.estimated_memory_bytes = 0
+        if self.name_cache:
+            self.name_cache.clear()
         
-        print(f"🗑️ Cache cleared - removed {cleared_count} items")
+        if self.verbose:
+            print(f"🗑️ Cache cleared - removed {cleared_count} items")
         return cleared_count
     
+    def expire_due(self, max_items=None):
+        """
+        Remove items whose expiry deadline has passed
+        
+        Args:
+            max_items: Upper bound on items removed in this call (None = all due)
+            
+        Returns:
+            int: Number of items removed
+        """
+        now = time.time()
+        self.last_cleanup = now
+        removed = 0
+        
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            if max_items is not None and removed >= max_items:
+                break
+            
+            deadline, key, created_at = heapq.heappop(self._expiry_heap)
+            item = self.cache.get(key)
+            
+            # Skip entries that were evicted or replaced since scheduling
+            if item is None or item['created_at'] != created_at:
+                continue
+            
+            del self.cache[key]
+            self.estimated_memory_bytes -= item['size_bytes']
+            self.expirations += 1
+            removed += 1
+        
+        return removed
+    
+    def snapshot(self, path):
+        """
+        Write live cache entries to a compact binary snapshot file
+        
+        Results must be JSON-compatible (tuples are restored as lists).
+        The file is written to a temporary file in the same directory,
+        fsynced and renamed over path, so an interrupted write never
+        leaves a truncated snapshot behind.
+        
+        Args:
+            path: Output file path
+            
+        Returns:
+            int: Number of entries written
+        """
+        entries = [
+            [item['key'], item['name1'], item['name2'], item['result'], item['access_count']]
+            for item in self.cache.values()
+            if not self._is_expired(item)
+        ]
+        
+        payload = zlib.compress(
+            json.dumps(entries, ensure_ascii=False, separators=(',', ':')).encode('utf-8'), 9
+        )
+        
+        fd, temp_path = tempfile.mkstemp(prefix='.snapshot-', dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(entries)))
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+        
+        if self.verbose:
+            print(f"💾 Cache snapshot saved: {len(entries)} items, "
+                  f"{(SNAPSHOT_HEADER.size + len(payload)) / 1024:.1f}KB -> {path}")
+        return len(entries)
+    
+    def load(self, path):
+        """
+        Load entries from a snapshot file into this cache
+        
+        Loaded entries start a fresh expiry period and respect this cache's
+        size and memory limits (oldest snapshot entries are evicted first).
+        
+        Args:
+            path: Snapshot file written by snapshot()
+            
+        Returns:
+            int: Number of entries loaded
+        """
+        with open(path, 'rb') as f:
+            header = f.read(SNAPSHOT_HEADER.size)
+            payload = f.read()
+        
+        if len(header) != SNAPSHOT_HEADER.size:
+            raise ValueError(f"Not a BlueEdge cache snapshot: {path}")
+        
+        magic, version, count = SNAPSHOT_HEADER.unpack(header)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f"Not a BlueEdge cache snapshot: {path}")
+        if version != SNAPSHOT_VERSION:
+            raise ValueError(f"Unsupported cache snapshot version: {version}")
+        
+        entries = json.loads(zlib.decompress(payload).decode('utf-8'))
+        if len(entries) != count:
+            raise ValueError(f"Corrupt cache snapshot: expected {count} entries, found {len(entries)}")
+        
+        for key, name1, name2, result, access_count in entries:
+            # JSON turns tuple keys (from @cached key functions) into lists
+            if isinstance(key, list):
+                key = tuple(key)
+            self.put_by_key(key, result, name1, name2)
+            if key in self.cache:
+                self.cache[key]['access_count'] = access_count
+        
+        if self.verbose:
+            print(f"📥 Cache snapshot loaded: {len(entries)} items from {path}")
+        return len(entries)
+    
     def optimize(self):
         """Optimize cache for better performance"""
         print("🔧 Optimizing cache...")
@@ -289,15 +551,11 @@ class SmartCache:
         return memory_freed
     
     def _auto_cleanup(self):
-        """Automatic cleanup of expired items"""
-        self.last_cleanup = time.time()
-        expired_count = self._remove_expired()
-        
-        if expired_count > 0:
-            print(f"🧹 Auto cleanup: removed {expired_count} expired items")
+        """Bounded expiry tick run from the lookup path"""
+        self.expire_due(self.expire_batch_size)
     
     def _remove_expired(self):
-        """Remove expired cache items"""
+        """Remove expired cache items (full scan; used by explicit optimize only)"""
         expired_keys = []
         
         for key, item in self.cache.items():
@@ -309,8 +567,21 @@ class SmartCache:
             self.estimated_memory_bytes -= item['size_bytes']
             del self.cache[key]
         
+        self.expirations += len(expired_keys)
+        if expired_keys:
+            self._compact_expiry_heap()
+        
         return len(expired_keys)
     
+    def _compact_expiry_heap(self):
+        """Rebuild the expiry heap from live entries, dropping stale ones"""
+        expire_seconds = self.expire_hours * 3600
+        self._expiry_heap = [
+            (item['created_at'] + expire_seconds, key, item['created_at'])
+            for key, item in self.cache.items()
+        ]
+        heapq.heapify(self._expiry_heap)
+    
     def _calculate_efficiency_score(self, hit_rate, memory_utilization):
         """Calculate cache efficiency score (0-100)"""
         # Hit rate component (70% weight)
@@ -327,6 +598,379 @@ class SmartCache:
         
         return min(100, hit_score + memory_score)
 
+
+class CacheMaintenanceThread(threading.Thread):
+    """Daemon thread that runs a bounded cache expiry tick at a fixed interval"""
+    
+    def __init__(self, tick, interval=1.0):
+        super().__init__(daemon=True, name="SmartCacheMaintenance")
+        self.tick = tick
+        self.interval = interval
+        self.ticks = 0
+        self.items_expired = 0
+        self._stop_event = threading.Event()
+    
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.items_expired += self.tick()
+                self.ticks += 1
+            except Exception as e:
+                print(f"❌ Cache maintenance error: {e}")
+    
+    def stop(self, timeout=3):
+        """Signal the thread to exit and wait for it"""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout=timeout)
+
+
+class ShardedSmartCache:
+    """Thread-safe SmartCache split into lock-striped shards
+    
+    Keys are hashed to one of N shards. Each shard is an independent
+    SmartCache with its own lock and LRU order, so concurrent lookups only
+    contend when they land on the same shard. Statistics are summed from the
+    shard counters without taking any lock. Expiry can be moved to a
+    background thread with start_maintenance().
+    """
+    
+    def __init__(self, max_size=400, max_memory_kb=200, num_shards=8, name_cache_size=1000):
+        """
+        Initialize Sharded Smart Cache
+        
+        Args:
+            max_size: Total maximum number of cached results across all shards
+            max_memory_kb: Total maximum memory usage in KB across all shards
+            num_shards: Number of independent shards (and locks)
+            name_cache_size: Size of the shared prepared-name tier (0 disables it)
+        """
+        self.num_shards = max(1, int(num_shards))
+        self.max_size = max_size
+        self.max_memory_kb = max_memory_kb
+        
+        # Budgets are split evenly; round up so small caches keep every shard usable
+        shard_size = max(1, -(-max_size // self.num_shards))
+        shard_memory_kb = max_memory_kb / self.num_shards
+        
+        self.shards = [
+            SmartCache(max_size=shard_size, max_memory_kb=shard_memory_kb,
+                       verbose=False, name_cache_size=0)
+            for _ in range(self.num_shards)
+        ]
+        # One name tier for all shards; it carries its own lock
+        self.name_cache = PreparedNameCache(name_cache_size) if name_cache_size > 0 else None
+        self.locks = [threading.Lock() for _ in range(self.num_shards)]
+        self.maintenance_thread = None
+        self.creation_time = time.time()
+        
+        print(f"🧠 Sharded Smart Cache initialized - {self.num_shards} shards, "
+              f"Max: {max_size} items, {max_memory_kb}KB")
+    
+    def get_cache_key(self, name1, name2):
+        """Generate cache key for name pair (same key scheme as SmartCache)"""
+        return self.shards[0].get_cache_key(name1, name2)
+    
+    def _shard_index(self, cache_key):
+        """Map a hex cache key to its shard"""
+        return int(cache_key, 16) % self.num_shards
+    
+    def get(self, name1, name2):
+        """
+        Get cached comparison result (thread-safe)
+        
+        Returns:
+            tuple: (found, result) - found is boolean, result is cached data or None
+        """
+        cache_key = self.get_cache_key(name1, name2)
+        index = self._shard_index(cache_key)
+        with self.locks[index]:
+            return self.shards[index].get_by_key(cache_key)
+    
+    def put(self, name1, name2, comparison_result):
+        """Store comparison result in the owning shard (thread-safe)"""
+        cache_key = self.get_cache_key(name1, name2)
+        index = self._shard_index(cache_key)
+        with self.locks[index]:
+            self.shards[index].put_by_key(cache_key, comparison_result, name1, name2)
+    
+    def clear(self):
+        """Clear all shards"""
+        cleared_count = 0
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                cleared_count += shard.clear()
+        if self.name_cache:
+            self.name_cache.clear()
+        
+        print(f"🗑️ Sharded cache cleared - removed {cleared_count} items")
+        return cleared_count
+    
+    def expire_due(self, max_items_per_shard=None):
+        """Expire due items shard by shard, holding one shard lock at a time"""
+        removed = 0
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                removed += shard.expire_due(max_items_per_shard)
+        return removed
+    
+    def start_maintenance(self, interval=1.0, max_items_per_shard=64):
+        """
+        Move expiry off the lookup path into a background maintenance thread
+        
+        Args:
+            interval: Seconds between expiry ticks
+            max_items_per_shard: Bound on work per shard per tick
+        """
+        if self.maintenance_thread is not None:
+            return self.maintenance_thread
+        
+        for shard in self.shards:
+            shard.inline_expiry = False
+        
+        self.maintenance_thread = CacheMaintenanceThread(
+            lambda: self.expire_due(max_items_per_shard), interval
+        )
+        self.maintenance_thread.start()
+        return self.maintenance_thread
+    
+    def stop_maintenance(self):
+        """Stop the maintenance thread and restore inline expiry"""
+        if self.maintenance_thread is None:
+            return
+        
+        self.maintenance_thread.stop()
+        self.maintenance_thread = None
+        for shard in self.shards:
+            shard.inline_expiry = True
+    
+    def optimize(self):
+        """Optimize every shard, one lock at a time"""
+        totals = {}
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                shard_result = shard.optimize()
+            for key, value in shard_result.items():
+                totals[key] = totals.get(key, 0) + value
+        return totals
+    
+    def get_statistics(self):
+        """
+        Get aggregated cache statistics
+        
+        Counters are read without locking; under concurrent load the snapshot
+        may be a few operations stale but never blocks a lookup.
+        """
+        hits = sum(shard.hits for shard in self.shards)
+        misses = sum(shard.misses for shard in self.shards)
+        evictions = sum(shard.evictions for shard in self.shards)
+        expirations = sum(shard.expirations for shard in self.shards)
+        total_requests = sum(shard.total_requests for shard in self.shards)
+        current_size = sum(len(shard.cache) for shard in self.shards)
+        memory_bytes = sum(shard.estimated_memory_bytes for shard in self.shards)
+        
+        safe_requests = max(1, total_requests)
+        hit_rate = hits / safe_requests
+        current_memory_kb = memory_bytes / 1024
+        memory_utilization = (current_memory_kb / self.max_memory_kb) * 100 if self.max_memory_kb > 0 else 0
+        
+        return {
+            'total_requests': total_requests,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': hit_rate,
+            'miss_rate': misses / safe_requests,
+            'evictions': evictions,
+            'expirations': expirations,
+            
+            'current_size': current_size,
+            'max_size': self.max_size,
+            'size_utilization': (current_size / self.max_size) * 100 if self.max_size > 0 else 0,
+            
+            'estimated_memory_kb': current_memory_kb,
+            'max_memory_kb': self.max_memory_kb,
+            'memory_utilization': memory_utilization,
+            
+            'num_shards': self.num_shards,
+            'maintenance_running': self.maintenance_thread is not None,
+            'shard_sizes': [len(shard.cache) for shard in self.shards],
+            'cache_age_hours': (time.time() - self.creation_time) / 3600,
+            'efficiency_score': self.shards[0]._calculate_efficiency_score(hit_rate, memory_utilization),
+            'name_tier': self.name_cache.get_statistics() if self.name_cache else None
+        }
+
+
+class CachePolicy:
+    """Sizing and expiry settings for a @cached method"""
+    
+    def __init__(self, max_size=256, max_memory_kb=128, expire_hours=12):
+        """
+        Args:
+            max_size: Maximum cached results per method per instance
+            max_memory_kb: Estimated memory budget per method per instance
+            expire_hours: Entry lifetime in hours
+        """
+        self.max_size = max_size
+        self.max_memory_kb = max_memory_kb
+        self.expire_hours = expire_hours
+    
+    def create_cache(self):
+        """Build a quiet SmartCache configured by this policy"""
+        cache = SmartCache(max_size=self.max_size, max_memory_kb=self.max_memory_kb,
+                           verbose=False, name_cache_size=0)
+        cache.expire_hours = self.expire_hours
+        return cache
+
+
+def _normalize_key_name(name):
+    """Case- and whitespace-insensitive form of a name for cache keys"""
+    return ' '.join(str(name).upper().split()) if name else ''
+
+
+def canonical_pair(name1, name2):
+    """Symmetric cache key: (a, b) and (b, a) map to the same normalized key"""
+    n1, n2 = _normalize_key_name(name1), _normalize_key_name(name2)
+    return (n1, n2) if n1 <= n2 else (n2, n1)
+
+
+def ordered_pair(name1, name2):
+    """Exact cache key for methods whose result echoes the inputs in order"""
+    return (name1, name2)
+
+
+def _dependency_fingerprint(value):
+    """
+    Change marker compared by content
+    
+    Lexicon containers are serialized (marshal: nested dicts, lists and
+    sets of strings and numbers, at C speed), so an in-place edit that
+    keeps the size still changes the marker. Other objects compare by
+    identity.
+    """
+    if value is None or isinstance(value, (int, float, str, bool, bytes)):
+        return value
+    try:
+        return marshal.dumps(value)
+    except ValueError:
+        return id(value)
+
+
+def _dependency_value(instance, path):
+    """Attribute value for a split depends_on entry (('threshold',) or ('calculator', 'threshold'))"""
+    value = instance
+    for attr in path:
+        value = getattr(value, attr, None)
+    return value
+
+
+def _method_cache_lock(instance):
+    """Per-instance lock guarding the @cached state (created atomically on first use)"""
+    lock = instance.__dict__.get('_method_cache_lock')
+    if lock is None:
+        # dict.setdefault is atomic, so racing first calls agree on one lock
+        lock = instance.__dict__.setdefault('_method_cache_lock', threading.Lock())
+    return lock
+
+
+def cached(policy=None, key=canonical_pair, depends_on=()):
+    """
+    Cache a method's results per instance in a SmartCache
+    
+    Args:
+        policy: CachePolicy (default sizing when None)
+        key: Function mapping the call arguments to a hashable cache key
+        depends_on: Instance attributes (threshold, lexicons; dotted paths
+            reach into helpers) whose change invalidates the method's cache
+            on the next call. Containers are compared by content, so
+            in-place edits count.
+    
+    Calls with keyword arguments bypass the cache, as do all calls on an
+    instance after set_method_caching(instance, False). Per-method statistics
+    are available through method_cache_statistics(instance).
+    
+    Instances may be shared between threads: cache lookups and updates hold a
+    per-instance lock, the method itself runs outside it (two threads missing
+    on the same key both compute, which is harmless).
+    """
+    policy = policy or CachePolicy()
+    dependency_paths = [tuple(attr.split('.')) for attr in depends_on]
+    
+    def decorator(method):
+        method_name = method.__name__
+        
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if kwargs or self.__dict__.get('_method_caching_disabled'):
+                return method(self, *args, **kwargs)
+            
+            fingerprint = tuple(_dependency_fingerprint(_dependency_value(self, path)) for path in dependency_paths)
+            cache_key = key(*args)
+            
+            with _method_cache_lock(self):
+                caches = self.__dict__.setdefault('_method_caches', {})
+                state = caches.get(method_name)
+                if state is None:
+                    state = caches[method_name] = {
+                        'cache': policy.create_cache(),
+                        'fingerprint': fingerprint,
+                        'invalidations': 0
+                    }
+                elif state['fingerprint'] != fingerprint:
+                    state['cache'].clear()
+                    state['fingerprint'] = fingerprint
+                    state['invalidations'] += 1
+                
+                found, result = state['cache'].get_by_key(cache_key)
+                if found:
+                    return result
+            
+            result = method(self, *args)
+            with _method_cache_lock(self):
+                # Skip the store if the dependencies changed while computing
+                if state['fingerprint'] == fingerprint:
+                    state['cache'].put_by_key(cache_key, result, *args[:2])
+            return result
+        
+        wrapper.cache_policy = policy
+        return wrapper
+    
+    return decorator
+
+
+def method_cache_statistics(instance):
+    """Per-method cache statistics for an object using @cached methods"""
+    statistics = {}
+    with _method_cache_lock(instance):
+        for method_name, state in instance.__dict__.get('_method_caches', {}).items():
+            cache = state['cache']
+            total_requests = max(1, cache.total_requests)
+            statistics[method_name] = {
+                'total_requests': cache.total_requests,
+                'hits': cache.hits,
+                'misses': cache.misses,
+                'hit_rate': cache.hits / total_requests,
+                'evictions': cache.evictions,
+                'current_size': len(cache.cache),
+                'invalidations': state['invalidations']
+            }
+    return statistics
+
+
+def invalidate_method_caches(instance, method_name=None):
+    """Clear @cached results of one method (or all methods) on an instance"""
+    cleared_count = 0
+    with _method_cache_lock(instance):
+        for name, state in instance.__dict__.get('_method_caches', {}).items():
+            if method_name is None or name == method_name:
+                cleared_count += state['cache'].clear()
+                state['invalidations'] += 1
+    return cleared_count
+
+
+def set_method_caching(instance, enabled):
+    """Turn @cached lookups on or off for one instance (off = always compute)"""
+    instance.__dict__['_method_caching_disabled'] = not enabled
+
 # Testing and usage example
 if __name__ == "__main__":
     print("🧠 Smart Cache System Test - Mobile Optimized")
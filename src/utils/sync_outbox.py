@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Durable Sync Outbox for BlueEdge Framework
+==========================================
+SQLite-backed queue of comparisons waiting for cloud sync
+Features:
+- Survives crashes and app kills: pending items replay on the next start
+- Idempotency keys (used as Firebase push keys, so a replayed write
+  lands on the same path instead of creating a duplicate)
+- WAL journal: commits append to the log, fsync is batched at checkpoints
+  ("normal") or done on every commit ("full", power-loss safe)
+- Acknowledged entries are compacted away; rejected ones are parked
+  and can be revived
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import threading
+
+# Item states
+PENDING = 'pending'
+ACKED = 'acked'
+DEAD = 'dead'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    user_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    retries INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT 'pending',
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS outbox_state ON outbox (state, id);
+"""
+
+
+class SyncOutbox:
+    """Durable FIFO of sync items with acknowledgement and compaction"""
+
+    def __init__(self, path, max_items=100000, durability='normal', compact_every=500):
+        """
+        Args:
+            path: SQLite file (':memory:' for a non-durable outbox)
+            max_items: Pending items kept; the oldest are dropped beyond this
+            durability: 'normal' (batched fsync, crash-safe) or 'full' (fsync per commit)
+            compact_every: Acknowledgements between automatic compactions
+        """
+        if durability not in ('normal', 'full'):
+            raise ValueError(f"Unknown outbox durability '{durability}' (expected 'normal' or 'full')")
+        if path != ':memory:' and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        self.path = path
+        self.max_items = max_items
+        self.compact_every = compact_every
+        self.lock = threading.Lock()
+
+        self.connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(f"PRAGMA synchronous={durability.upper()}")
+        self.connection.executescript(SCHEMA)
+
+        # Statistics
+        self.enqueued = 0
+        self.duplicates_ignored = 0
+        self.dropped = 0
+        self.acked_since_compaction = 0
+
+        # Pending count kept in memory (COUNT(*) per enqueue grows with the table)
+        self.pending = self._count(PENDING)
+        if self.pending:
+            print(f"♻️ Sync outbox: replaying {self.pending} pending item(s) from {path}")
+
+    def enqueue(self, user_id, data, idempotency_key=None):
+        """
+        Persist one item
+
+        Returns:
+            str: Idempotency key (an existing key is ignored, not duplicated)
+        """
+        key = idempotency_key or uuid.uuid4().hex
+        payload = json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=str)
+
+        with self.lock:
+            cursor = self.connection.execute(
+                "INSERT OR IGNORE INTO outbox (idempotency_key, user_id, payload, created_at) VALUES (?, ?, ?, ?)",
+                (key, user_id, payload, time.time())
+            )
+            if cursor.rowcount:
+                self.enqueued += 1
+                self.pending += 1
+                self._enforce_limit()
+            else:
+                self.duplicates_ignored += 1
+        return key
+
+    def replace_pending(self, idempotency_key, data):
+        """
+        Overwrite the payload of an item that has not been synced yet
+
+        Returns:
+            bool: False when the item is gone (synced, parked or dropped)
+        """
+        payload = json.dumps(data, separators=(',', ':'), ensure_ascii=False, default=str)
+        with self.lock:
+            return self.connection.execute(
+                "UPDATE outbox SET payload = ?, updated_at = ? WHERE idempotency_key = ? AND state = ?",
+                (payload, time.time(), idempotency_key, PENDING)
+            ).rowcount > 0
+
+    def _enforce_limit(self):
+        """Drop the oldest pending items beyond max_items (lock held)"""
+        excess = self.pending - self.max_items
+        if excess > 0:
+            self.connection.execute(
+                "DELETE FROM outbox WHERE id IN (SELECT id FROM outbox WHERE state = ? ORDER BY id LIMIT ?)",
+                (PENDING, excess)
+            )
+            self.pending -= excess
+            self.dropped += excess
+            print(f"⚠️ Sync outbox full - dropped {excess} oldest item(s)")
+
+    def peek(self, limit=50):
+        """
+        Oldest pending items, left in the outbox until acknowledged
+
+        Returns:
+            list: [{'id', 'idempotency_key', 'user_id', 'data', 'retries', 'created_at'}, ...]
+        """
+        return self._select(PENDING, limit)
+
+    def peek_dead(self, limit=50):
+        """Oldest parked items (same format as peek)"""
+        return self._select(DEAD, limit)
+
+    def _select(self, state, limit):
+        with self.lock:
+            rows = self.connection.execute(
+                "SELECT id, idempotency_key, user_id, payload, retries, created_at "
+                "FROM outbox WHERE state = ? ORDER BY id LIMIT ?",
+                (state, limit)
+            ).fetchall()
+        return [
+            {'id': row[0], 'idempotency_key': row[1], 'user_id': row[2],
+             'data': json.loads(row[3]), 'retries': row[4], 'created_at': row[5]}
+            for row in rows
+        ]
+
+    def ack(self, ids):
+        """Mark items as synced (removed at the next compaction)"""
+        if not ids:
+            return 0
+        now = time.time()
+        with self.lock:
+            acked = self.connection.executemany(
+                "UPDATE outbox SET state = ?, updated_at = ? WHERE id = ? AND state = ?",
+                [(ACKED, now, item_id, PENDING) for item_id in ids]
+            ).rowcount
+            self.pending -= acked
+            self.acked_since_compaction += acked
+            should_compact = self.acked_since_compaction >= self.compact_every
+        if should_compact:
+            self.compact()
+        return acked
+
+    def fail(self, ids, max_retries=3):
+        """
+        Count a rejected sync attempt
+
+        Items past max_retries are parked as dead (kept for inspection
+        and revive, no longer synced).
+
+        Returns:
+            int: Items parked by this call
+        """
+        if not ids:
+            return 0
+        now = time.time()
+        with self.lock:
+            self.connection.execute("BEGIN")
+            self.connection.executemany(
+                "UPDATE outbox SET retries = retries + 1, updated_at = ? WHERE id = ?",
+                [(now, item_id) for item_id in ids]
+            )
+            placeholders = ','.join('?' * len(ids))
+            parked = self.connection.execute(
+                f"UPDATE outbox SET state = ? WHERE state = ? AND retries > ? AND id IN ({placeholders})",
+                (DEAD, PENDING, max_retries, *ids)
+            ).rowcount
+            self.connection.execute("COMMIT")
+            self.pending -= parked
+        return parked
+
+    def revive(self, ids=None):
+        """
+        Return parked items to the queue with their retries reset
+
+        Args:
+            ids: Item ids to revive (default: every parked item)
+
+        Returns:
+            int: Items revived
+        """
+        now = time.time()
+        with self.lock:
+            if ids is None:
+                revived = self.connection.execute(
+                    "UPDATE outbox SET state = ?, retries = 0, updated_at = ? WHERE state = ?",
+                    (PENDING, now, DEAD)
+                ).rowcount
+            else:
+                revived = self.connection.executemany(
+                    "UPDATE outbox SET state = ?, retries = 0, updated_at = ? WHERE id = ? AND state = ?",
+                    [(PENDING, now, item_id, DEAD) for item_id in ids]
+                ).rowcount
+            self.pending += revived
+            self._enforce_limit()
+        return revived
+
+    def compact(self):
+        """Delete acknowledged items and checkpoint the WAL"""
+        with self.lock:
+            removed = self.connection.execute("DELETE FROM outbox WHERE state = ?", (ACKED,)).rowcount
+            self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.acked_since_compaction = 0
+        return removed
+
+    def _count(self, state):
+        return self.connection.execute("SELECT COUNT(*) FROM outbox WHERE state = ?", (state,)).fetchone()[0]
+
+    def pending_count(self):
+        """Items waiting for sync"""
+        return self.pending
+
+    def __len__(self):
+        return self.pending_count()
+
+    def get_statistics(self):
+        """Outbox sizes and counters"""
+        with self.lock:
+            return {
+                'path': self.path,
+                'pending': self.pending,
+                'acked_uncompacted': self._count(ACKED),
+                'dead': self._count(DEAD),
+                'enqueued': self.enqueued,
+                'duplicates_ignored': self.duplicates_ignored,
+                'dropped': self.dropped
+            }
+
+    def close(self):
+        """Checkpoint and close the database"""
+        with self.lock:
+            self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self.connection.close()
+
+
+# Testing and usage example
+if __name__ == "__main__":
+    import tempfile
+
+    print("📮 Sync Outbox Test")
+    print("=" * 40)
+
+    path = os.path.join(tempfile.mkdtemp(), 'outbox.db')
+    outbox = SyncOutbox(path)
+    start = time.perf_counter()
+    for i in range(1000):
+        outbox.enqueue('user_1', {'name1': f'AHMED {i}', 'name2': f'AHMAD {i}'})
+    print(f"Enqueued 1000 items in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    batch = outbox.peek(100)
+    outbox.ack([item['id'] for item in batch])
+    outbox.close()
+
+    reopened = SyncOutbox(path)
+    print(f"After reopen: {reopened.get_statistics()}")
+    print(f"Compacted: {reopened.compact()} acknowledged item(s)")
+    reopened.close()
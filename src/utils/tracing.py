@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Hot-Path Tracing for BlueEdge Framework
+=======================================
+Lightweight span instrumentation for the comparison pipeline
+Features:
+- span() context manager and @traced decorator
+- Near-zero overhead when disabled (one attribute check per call)
+- Chrome trace_event JSON export (chrome://tracing, Perfetto)
+- Collapsed-stack export (flamegraph.pl, speedscope)
+- Per-stage count/total/self time summary of the buffered spans
+- Monotonic per-stage totals since start (for counter exports; unaffected
+  by clear() or the buffer dropping old spans)
+
+Enable at runtime with TRACER.enable() or at startup with BLUEEDGE_TRACE=1.
+"""
+
+import os
+import json
+import time
+import threading
+import functools
+from collections import deque
+
+
+class _Span:
+    """One timed region; created only while tracing is enabled"""
+
+    __slots__ = ('tracer', 'name', 'start_ns', 'child_ns', 'frames')
+
+    def __init__(self, tracer, name):
+        self.tracer = tracer
+        self.name = name
+        self.child_ns = 0
+
+    def __enter__(self):
+        self.frames = self.tracer._frames()
+        self.frames.append(self)
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration_ns = time.perf_counter_ns() - self.start_ns
+        self.frames.pop()
+        if self.frames:
+            self.frames[-1].child_ns += duration_ns
+
+        stack = tuple(frame.name for frame in self.frames) + (self.name,)
+        self_ns = duration_ns - self.child_ns
+        self.tracer.events.append(
+            (self.name, self.start_ns, duration_ns, self_ns, threading.get_ident(), stack)
+        )
+        self.tracer._add_totals(self.name, duration_ns, self_ns)
+        return False
+
+
+class _NullSpan:
+    """Shared do-nothing span returned while tracing is disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Collects completed spans in a bounded in-memory buffer"""
+
+    def __init__(self, max_events=200000):
+        """
+        Args:
+            max_events: Most recent spans kept (older spans are dropped)
+        """
+        self.enabled = False
+        self.events = deque(maxlen=max_events)
+        self.epoch_ns = time.perf_counter_ns()
+        self._local = threading.local()
+        
+        # name -> [count, total_ns, self_ns]; only ever grows
+        self.totals = {}
+        self._totals_lock = threading.Lock()
+
+    def _frames(self):
+        """Per-thread stack of open spans"""
+        frames = getattr(self._local, 'frames', None)
+        if frames is None:
+            frames = self._local.frames = []
+        return frames
+
+    def _add_totals(self, name, duration_ns, self_ns):
+        with self._totals_lock:
+            totals = self.totals.get(name)
+            if totals is None:
+                totals = self.totals[name] = [0, 0, 0]
+            totals[0] += 1
+            totals[1] += duration_ns
+            totals[2] += self_ns
+
+    def enable(self):
+        """Start recording spans"""
+        self.enabled = True
+
+    def disable(self):
+        """Stop recording spans (recorded spans are kept)"""
+        self.enabled = False
+
+    def clear(self):
+        """Drop recorded spans (stage_totals keeps counting)"""
+        self.events.clear()
+        self.epoch_ns = time.perf_counter_ns()
+
+    def span(self, name):
+        """Context manager timing a named region"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name)
+
+    def stage_summary(self):
+        """
+        Per-stage totals over recorded spans
+
+        Returns:
+            dict: {name: {'count', 'total_ms', 'self_ms'}} sorted by self time
+        """
+        summary = {}
+        for name, _, duration_ns, self_ns, _, _ in list(self.events):
+            stage = summary.setdefault(name, {'count': 0, 'total_ms': 0.0, 'self_ms': 0.0})
+            stage['count'] += 1
+            stage['total_ms'] += duration_ns / 1e6
+            stage['self_ms'] += self_ns / 1e6
+        return dict(sorted(summary.items(), key=lambda item: -item[1]['self_ms']))
+
+    def stage_totals(self):
+        """
+        Per-stage totals of every span recorded since the tracer was created
+
+        Unlike stage_summary these never decrease, so they can be exported
+        as counters.
+
+        Returns:
+            dict: {name: {'count', 'total_seconds', 'self_seconds'}}
+        """
+        with self._totals_lock:
+            return {
+                name: {'count': count, 'total_seconds': total_ns / 1e9, 'self_seconds': self_ns / 1e9}
+                for name, (count, total_ns, self_ns) in self.totals.items()
+            }
+
+    def chrome_trace(self):
+        """Recorded spans as a Chrome trace_event document"""
+        pid = os.getpid()
+        trace_events = [
+            {
+                'name': name,
+                'cat': 'blueedge',
+                'ph': 'X',
+                'ts': (start_ns - self.epoch_ns) / 1000,
+                'dur': duration_ns / 1000,
+                'pid': pid,
+                'tid': thread_id
+            }
+            for name, start_ns, duration_ns, _, thread_id, _ in list(self.events)
+        ]
+        return {'traceEvents': trace_events, 'displayTimeUnit': 'ms'}
+
+    def export_chrome_trace(self, path):
+        """Write Chrome trace_event JSON; returns the number of spans written"""
+        document = self.chrome_trace()
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(document, f)
+        return len(document['traceEvents'])
+
+    def collapsed_stacks(self):
+        """Self time per call stack in microseconds: {'a;b;c': us}"""
+        stacks = {}
+        for _, _, _, self_ns, _, stack in list(self.events):
+            key = ';'.join(stack)
+            stacks[key] = stacks.get(key, 0) + self_ns / 1000
+        return stacks
+
+    def export_collapsed(self, path):
+        """Write collapsed stacks ('a;b;c <microseconds>' per line); returns line count"""
+        stacks = self.collapsed_stacks()
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, micros in sorted(stacks.items()):
+                f.write(f"{stack} {max(1, round(micros))}\n")
+        return len(stacks)
+
+
+# Process-wide tracer used by the @traced pipeline stages
+TRACER = Tracer()
+if os.environ.get('BLUEEDGE_TRACE', '').lower() in ('1', 'true', 'yes', 'on'):
+    TRACER.enable()
+
+
+def span(name):
+    """Context manager timing a named region on the process-wide tracer"""
+    return TRACER.span(name)
+
+
+def traced(name=None):
+    """
+    Decorator recording each call as a span on the process-wide tracer
+
+    Args:
+        name: Span name (default: the function's qualified name)
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not TRACER.enabled:
+                return func(*args, **kwargs)
+            with _Span(TRACER, span_name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# Testing and usage example
+if __name__ == "__main__":
+    print("🔬 Tracing Test")
+    print("=" * 40)
+
+    @traced()
+    def inner(n):
+        return sum(range(n))
+
+    @traced()
+    def outer():
+        return [inner(10000) for _ in range(5)]
+
+    TRACER.enable()
+    outer()
+    TRACER.disable()
+
+    for stage, totals in TRACER.stage_summary().items():
+        print(f"{stage}: {totals['count']} calls, {totals['self_ms']:.3f}ms self")
+    for stack, micros in TRACER.collapsed_stacks().items():
+        print(f"{stack} {micros:.0f}")
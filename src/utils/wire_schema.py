@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Compact Wire Schema for BlueEdge Framework
+==========================================
+Versioned encoding of synced comparison records
+Features:
+- Short field keys; empty/default fields are omitted
+- Categories as small integer codes, booleans as 0/1, timestamps as epoch ms
+- Constant framework metadata sent once per session, not per record
+- Decoder back to the verbose (v1) record shape; v1 records pass through
+
+Request bodies are additionally gzipped by HTTPClient above 1 KB.
+"""
+
+import time
+from datetime import datetime
+
+SCHEMA_VERSION = 2
+
+# comparison_data field -> wire key
+FIELD_KEYS = {
+    'name1': 'n1',
+    'name2': 'n2',
+    'name1_processed': 'p1',
+    'name2_processed': 'p2',
+    'similarity_score': 'sc',
+    'is_duplicate': 'd',
+    'category': 'c',
+    'processing_time': 'pt',
+    'confidence_level': 'cl',
+    'error_types': 'e'
+}
+WIRE_FIELDS = {short: field for field, short in FIELD_KEYS.items()}
+
+# Category codes (append only: codes are stored in the database)
+CATEGORY_CODES = (
+    'unknown', 'different_spelling', 'misspellings', 'name_abbreviations',
+    'honorific_prefixes', 'common_nicknames', 'split_names'
+)
+CATEGORY_INDEX = {category: code for code, category in enumerate(CATEGORY_CODES)}
+
+# Fields of the short user_history entry
+HISTORY_KEYS = ('v', 't', 'n1', 'n2', 'sc', 'd', 'c')
+
+# Written once per session instead of once per record (v1 repeated it everywhere)
+SESSION_METADATA = {
+    "schema_version": SCHEMA_VERSION,
+    "memory_usage": "~5KB",
+    "platform": "mobile_edge_computing",
+    "framework": {
+        "name": "BlueEdge",
+        "version": "1.0.0",
+        "algorithm_type": "levenshtein_enhanced",
+        "mobile_optimized": True,
+        "language_support": ["english", "arabic"],
+        "categories_supported": [
+            "different_spelling", "misspelling", "abbreviation",
+            "honorific_prefix", "nickname", "split_name"
+        ]
+    }
+}
+
+
+def _timestamp_ms(value):
+    """Epoch milliseconds of an ISO timestamp (None if unparsable)"""
+    try:
+        return int(datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp() * 1000)
+    except ValueError:
+        return None
+
+
+def encode_record(user_id, comparison_data, session_id, timestamp_ms=None):
+    """
+    Compact (v2) record for comparisons/<key>
+
+    Args:
+        user_id: Owner of the comparison
+        comparison_data: Comparison dict from the app (format_blueedge_data fields)
+        session_id: Session whose metadata record describes this one
+        timestamp_ms: Epoch ms (default: comparison_data['timestamp'] or now)
+
+    Returns:
+        dict: Wire record; unknown comparison fields are kept under 'x'
+    """
+    extra = dict(comparison_data)
+    if timestamp_ms is None and 'timestamp' in extra:
+        timestamp_ms = _timestamp_ms(extra['timestamp'])
+        if timestamp_ms is not None:
+            del extra['timestamp']
+
+    record = {
+        'v': SCHEMA_VERSION,
+        'u': user_id,
+        's': session_id,
+        't': timestamp_ms if timestamp_ms is not None else int(time.time() * 1000)
+    }
+
+    for field, short in FIELD_KEYS.items():
+        value = extra.pop(field, None)
+        if value is None or value == '' or value == []:
+            continue
+        if field == 'category':
+            value = CATEGORY_INDEX.get(value, value)
+        elif field == 'is_duplicate':
+            value = 1 if value else 0
+        elif field == 'similarity_score' and isinstance(value, float):
+            value = round(value, 4)
+        elif field == 'processing_time' and isinstance(value, float):
+            value = round(value, 6)
+        record[short] = value
+
+    if extra:
+        record['x'] = extra
+    return record
+
+
+def encode_history_entry(record):
+    """Short user_history/<uid>/<key> entry of a wire record"""
+    return {key: record[key] for key in HISTORY_KEYS if key in record}
+
+
+def decode_record(stored):
+    """
+    Verbose (v1-shaped) view of a stored record or history entry
+
+    v1 records (no 'v' key) are returned unchanged, so mixed histories
+    decode to one shape.
+    """
+    if not isinstance(stored, dict) or 'v' not in stored:
+        return stored
+
+    comparison = dict(stored.get('x', {}))
+    for short, field in WIRE_FIELDS.items():
+        if short in stored:
+            comparison[field] = stored[short]
+
+    category = comparison.get('category', 0)
+    if isinstance(category, int) and 0 <= category < len(CATEGORY_CODES):
+        category = CATEGORY_CODES[category]
+    comparison['category'] = category
+    comparison['is_duplicate'] = bool(comparison.get('is_duplicate', 0))
+    timestamp = datetime.fromtimestamp(stored['t'] / 1000).isoformat() if 't' in stored else ''
+
+    return {
+        "schema_version": stored['v'],
+        "user_id": stored.get('u'),
+        "session_id": stored.get('s'),
+        "timestamp": timestamp,
+        "comparison_results": comparison,
+        "processing_time": comparison.get("processing_time", 0),
+        "similarity_score": comparison.get("similarity_score", 0),
+        "duplicate_status": comparison['is_duplicate'],
+        "confidence_level": comparison.get("confidence_level", "unknown"),
+        "error_category": category,
+        "error_types_detected": comparison.get("error_types", []),
+        "name1_data": {
+            "full_name": comparison.get("name1", ""),
+            "processed": comparison.get("name1_processed", "")
+        },
+        "name2_data": {
+            "full_name": comparison.get("name2", ""),
+            "processed": comparison.get("name2_processed", "")
+        }
+    }
+
+
+# Testing and usage example
+if __name__ == "__main__":
+    import json
+
+    print("📦 Wire Schema Test")
+    print("=" * 40)
+
+    comparison = {
+        'name1': 'MOHAMMED AHMED HASSAN', 'name2': 'MOHAMMAD AHMAD HASAN',
+        'similarity_score': 0.8912345, 'is_duplicate': True, 'processing_time': 0.0012,
+        'category': 'different_spelling', 'confidence_level': 'high', 'error_types': [],
+        'algorithm_version': 'blueedge_v1.0', 'platform': 'mobile_edge'
+    }
+    record = encode_record('user_20250101', comparison, 'session_1')
+    print(f"Wire record ({len(json.dumps(record, separators=(',', ':')))} bytes): {record}")
+    print(f"Decoded category: {decode_record(record)['error_category']}")
@@ -0,0 +1,162 @@
+"""
+Async Firebase client tests for BlueEdge framework (database calls are mocked)
+"""
+import unittest
+import sys
+import os
+import time
+import asyncio
+import threading
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.async_firebase import AsyncFirebaseClient, FirebaseIO
+
+
+class RecordingDatabase:
+    """Database double: slow batched writes, records concurrency"""
+
+    def __init__(self, delay=0.05, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.batches = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def save_comparison_results(self, batch):
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.batches.append(batch)
+        time.sleep(self.delay)
+        with self.lock:
+            self.active -= 1
+        if self.fail:
+            raise ConnectionError('offline')
+        return True, [f"-k{data['i']}" for _, data in batch]
+
+    def get_user_history(self, user_id, limit=10, refresh=True):
+        time.sleep(self.delay)
+        with self.lock:
+            self.batches.append(user_id)
+        return True, [user_id]
+
+
+class TestAsyncFirebaseClient(unittest.TestCase):
+    """Bounded concurrency, coalescing and cancellation"""
+
+    def test_saves_are_coalesced_and_bounded(self):
+        """Test that concurrent saves share writes with at most max_concurrency in flight"""
+        database = RecordingDatabase()
+        client = AsyncFirebaseClient(database, max_concurrency=2, max_batch=20)
+
+        async def save_all():
+            return await asyncio.gather(*(client.save_comparison_result('u', {'i': i}) for i in range(100)))
+
+        results = asyncio.run(save_all())
+        client.close()
+
+        self.assertEqual(results, [(True, f'-k{i}') for i in range(100)])
+        self.assertEqual(database.peak, 2)
+        self.assertLess(len(database.batches), 10)
+        self.assertTrue(all(len(batch) <= 20 for batch in database.batches))
+
+    def test_cancelled_saves_are_not_sent(self):
+        """Test that saves cancelled before sending are dropped"""
+        database = RecordingDatabase()
+        client = AsyncFirebaseClient(database, max_concurrency=1, max_batch=1)
+
+        async def scenario():
+            tasks = [asyncio.ensure_future(client.save_comparison_result('u', {'i': i})) for i in range(3)]
+            await asyncio.sleep(0.01)   # first write in flight, the others queued
+            tasks[1].cancel()
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        results = asyncio.run(scenario())
+        client.close()
+
+        self.assertIsInstance(results[1], asyncio.CancelledError)
+        self.assertEqual([data['i'] for batch in database.batches for _, data in batch], [0, 2])
+        self.assertEqual(client.get_statistics()['cancelled'], 1)
+
+    def test_errors_reach_every_caller(self):
+        """Test that a failed write raises in each save that shared it"""
+        client = AsyncFirebaseClient(RecordingDatabase(fail=True))
+
+        async def scenario():
+            return await asyncio.gather(*(client.save_comparison_result('u', {'i': i}) for i in range(3)),
+                                        return_exceptions=True)
+
+        results = asyncio.run(scenario())
+        client.close()
+        self.assertTrue(all(isinstance(result, ConnectionError) for result in results))
+
+
+    def test_budget_and_queue_limit(self):
+        """Test that the write budget delays writes and a full queue sheds saves"""
+        from src.utils.rate_limiter import TokenBucket
+        database = RecordingDatabase(delay=0.0)
+        client = AsyncFirebaseClient(database, max_concurrency=4, max_batch=10,
+                                     rate_limiter=TokenBucket(rate=20, capacity=1), max_queued=30)
+
+        async def burst():
+            return await asyncio.gather(*(client.save_comparison_result('u', {'i': i}) for i in range(40)))
+
+        start = time.perf_counter()
+        results = asyncio.run(burst())
+        elapsed = time.perf_counter() - start
+        client.close()
+
+        self.assertEqual(sum(1 for success, _ in results if success), 30)
+        self.assertEqual(client.get_statistics()['shed'], 10)
+        self.assertEqual(len(database.batches), 3)
+        self.assertGreaterEqual(elapsed, 0.09)
+
+
+class TestFirebaseIO(unittest.TestCase):
+    """Synchronous facade"""
+
+    def setUp(self):
+        self.database = RecordingDatabase(delay=0.02)
+        self.io = FirebaseIO(self.database, max_concurrency=3)
+
+    def tearDown(self):
+        self.io.close()
+
+    def test_blocking_calls(self):
+        """Test that blocking wrappers return the database results"""
+        self.assertEqual(self.io.save_comparison_result('u', {'i': 7}, timeout=5), (True, '-k7'))
+        self.assertEqual(self.io.get_user_history('u', timeout=5), (True, ['u']))
+
+    def test_nowait_uses_fixed_threads(self):
+        """Test that many fire-and-forget saves do not create a thread each"""
+        threads_before = threading.active_count()
+        done = []
+        futures = [self.io.save_comparison_result_nowait('u', {'i': i}, callback=lambda *r: done.append(r))
+                   for i in range(300)]
+        for future in futures:
+            future.result(timeout=10)
+
+        self.assertEqual(len(done), 300)
+        self.assertLessEqual(threading.active_count() - threads_before, 3)
+        self.assertLessEqual(self.database.peak, 3)
+        self.assertLess(self.io.get_statistics()['write_batches'], 30)
+
+    def test_batch_nowait_callback(self):
+        """Test that a batched nowait save reports its keys, and (False, []) when it raises"""
+        done = []
+        self.io.save_comparison_results_nowait([('u', {'i': 1}), ('u', {'i': 2})],
+                                               callback=lambda *r: done.append(r)).result(timeout=5)
+        self.database.fail = True
+        future = self.io.save_comparison_results_nowait([('u', {'i': 3})], callback=lambda *r: done.append(r))
+        with self.assertRaises(ConnectionError):
+            future.result(timeout=5)
+
+        time.sleep(0.05)  # done callbacks run right after the result is set
+        self.assertEqual(done, [(True, ['-k1', '-k2']), (False, [])])
+
+
+if __name__ == '__main__':
+    unittest.main()
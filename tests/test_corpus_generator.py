@@ -0,0 +1,143 @@
+"""
+Synthetic corpus generator tests for BlueEdge framework
+"""
+import unittest
+import sys
+import os
+import csv
+import json
+import tempfile
+from collections import Counter
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.corpus_generator import (
+    CorpusGenerator, DUPLICATE_CATEGORIES, RECORD_FIELDS, save_corpus, np
+)
+
+
+class TestCorpusGenerator(unittest.TestCase):
+    """Seeded records, injected duplicates and ground truth"""
+
+    def test_same_seed_same_corpus(self):
+        """Test that the corpus is reproducible from its seed"""
+        first = list(CorpusGenerator(seed=3).records(500))
+        self.assertEqual(first, list(CorpusGenerator(seed=3).records(500)))
+        self.assertNotEqual(first, list(CorpusGenerator(seed=4).records(500)))
+
+    def test_category_rates(self):
+        """Test that every category is injected close to its configured rate"""
+        records = list(CorpusGenerator(seed=1).records(20000))
+        counts = Counter(record['category'] for record in records)
+
+        for category in DUPLICATE_CATEGORIES:
+            self.assertAlmostEqual(counts[category] / len(records), 0.02, delta=0.006, msg=category)
+
+    def test_ground_truth_points_to_earlier_original(self):
+        """Test that duplicates reference an earlier original of the same entity"""
+        records = list(CorpusGenerator(seed=5).records(5000))
+
+        for record in records:
+            if record['duplicate_of'] is None:
+                self.assertIsNone(record['category'])
+                continue
+            original = records[record['duplicate_of']]
+            self.assertLess(original['record_id'], record['record_id'])
+            self.assertIsNone(original['duplicate_of'])
+            self.assertEqual(original['entity_id'], record['entity_id'])
+            self.assertNotEqual(original['full_name'], record['full_name'])
+
+    def test_entities_get_distinct_names(self):
+        """Test that ancestor tokens disambiguate entities that drew the same name"""
+        generator = CorpusGenerator(seed=1)
+        originals = [record['full_name'] for record in generator.records(20000) if record['duplicate_of'] is None]
+
+        self.assertEqual(generator.entities, len(originals))
+        self.assertLess(generator.collision_rate(), 0.01)
+        self.assertGreater(len(set(originals)) / len(originals), 0.99)
+
+        plain = CorpusGenerator(seed=1, distinct_names=False)
+        list(plain.records(20000))
+        self.assertGreater(plain.collision_rate(), generator.collision_rate())
+
+    def test_rejects_unknown_category(self):
+        """Test that unknown categories and rates above 1 are rejected"""
+        with self.assertRaises(ValueError):
+            CorpusGenerator(category_rates={'typos': 0.1})
+        with self.assertRaises(ValueError):
+            CorpusGenerator(category_rates={'misspellings': 0.6, 'split_names': 0.6})
+
+    def test_labeled_pairs(self):
+        """Test the ResultsReproducer case format and duplicate share"""
+        cases = list(CorpusGenerator(seed=2).labeled_pairs(2000, duplicate_share=0.3))
+
+        duplicates = sum(case['is_duplicate'] for case in cases)
+        self.assertAlmostEqual(duplicates / len(cases), 0.3, delta=0.05)
+        for case in cases:
+            self.assertEqual(set(case), {'type', 'name1', 'name2', 'is_duplicate', 'case_id'})
+            self.assertEqual(case['is_duplicate'], case['type'] != 'non_duplicate')
+            self.assertNotEqual(case['name1'], case['name2'])
+
+
+class TestCorpusOutput(unittest.TestCase):
+    """CSV / JSONL / NumPy writers"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.records = list(CorpusGenerator(seed=9).records(300))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_csv_roundtrip(self):
+        """Test that CSV output keeps every record and field"""
+        path = os.path.join(self.directory.name, 'corpus.csv')
+        self.assertEqual(save_corpus(iter(self.records), path), 300)
+
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(list(rows[0]), RECORD_FIELDS)
+        self.assertEqual([row['full_name'] for row in rows], [r['full_name'] for r in self.records])
+
+    def test_jsonl_roundtrip(self):
+        """Test that JSONL output round-trips exactly"""
+        path = os.path.join(self.directory.name, 'corpus.jsonl')
+        save_corpus(iter(self.records), path)
+
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual([json.loads(line) for line in f], self.records)
+
+    def test_unknown_format(self):
+        """Test that unsupported extensions are rejected"""
+        with self.assertRaises(ValueError):
+            save_corpus(iter(self.records), os.path.join(self.directory.name, 'corpus.xml'))
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_numpy_output(self):
+        """Test the structured-array output"""
+        path = os.path.join(self.directory.name, 'corpus.npy')
+        save_corpus(iter(self.records), path)
+
+        array = np.load(path)
+        self.assertEqual(len(array), 300)
+        self.assertEqual(array['full_name'][10], self.records[10]['full_name'])
+
+    @unittest.skipIf(np is None, "numpy not installed")
+    def test_numpy_streaming_and_truncation(self):
+        """Test the memory-mapped write with a known count and the truncation warning"""
+        from src.utils.corpus_generator import write_numpy
+
+        path = os.path.join(self.directory.name, 'corpus.npy')
+        self.assertEqual(save_corpus(iter(self.records), path, count=300), 300)
+        self.assertEqual(list(np.load(path)['record_id']), list(range(300)))
+        with self.assertRaises(ValueError):
+            write_numpy(iter(self.records), path, count=301)
+
+        with self.assertWarns(UserWarning):
+            write_numpy(iter(self.records), path, name_width=8, chunk_size=64)
+        self.assertEqual(len(np.load(path)), 300)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,247 @@
+"""
+Local Firebase REST stand-in tests for BlueEdge framework
+"""
+import unittest
+import sys
+import os
+import json
+import gzip
+import time
+import urllib.error
+import urllib.request
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scripts.firebase_standin import FirebaseStandin, apply_query
+
+try:
+    from src.utils import firebase_config
+    FIREBASE_AVAILABLE = True
+except ImportError:  # requests not installed
+    FIREBASE_AVAILABLE = False
+
+
+class TestQueries(unittest.TestCase):
+    """Firebase query semantics"""
+
+    NODE = {'-c': {'u': 'x', 't': 2}, '-a': {'u': 'x', 't': 3}, '-b': {'u': 'y', 't': 1}, '-d': {'t': 4}}
+
+    def test_order_by_key(self):
+        """Test that $key queries sort keys and apply bounds and limits"""
+        self.assertEqual(list(apply_query(self.NODE, {'orderBy': '"$key"'})), ['-a', '-b', '-c', '-d'])
+        self.assertEqual(list(apply_query(self.NODE, {'orderBy': '"$key"', 'startAt': '"-b"',
+                                                      'limitToFirst': '2'})), ['-b', '-c'])
+        self.assertEqual(list(apply_query(self.NODE, {'orderBy': '"$key"', 'limitToLast': '1'})), ['-d'])
+
+    def test_order_by_child(self):
+        """Test that child ordering puts missing values first and filters with equalTo"""
+        self.assertEqual(list(apply_query(self.NODE, {'orderBy': '"u"'})), ['-d', '-a', '-c', '-b'])
+        self.assertEqual(list(apply_query(self.NODE, {'orderBy': '"u"', 'equalTo': '"x"',
+                                                      'limitToLast': '1'})), ['-c'])
+        self.assertEqual(list(apply_query(self.NODE, {'orderBy': '"t"', 'startAt': '2', 'endAt': '3'})),
+                         ['-c', '-a'])
+
+    def test_filters_require_order_by(self):
+        """Test that filters without orderBy are rejected like Firebase does"""
+        with self.assertRaises(ValueError):
+            apply_query(self.NODE, {'limitToLast': '1'})
+
+
+class TestStandinServer(unittest.TestCase):
+    """REST operations, conditional writes and fault injection over HTTP"""
+
+    def setUp(self):
+        self.standin = FirebaseStandin().start()
+
+    def tearDown(self):
+        self.standin.stop()
+
+    def request(self, method, path, body=None, headers=None, compress=False):
+        headers = dict(headers or {})
+        data = None
+        if body is not None:
+            data = json.dumps(body).encode('utf-8')
+            if compress:
+                data = gzip.compress(data)
+                headers['Content-Encoding'] = 'gzip'
+        request = urllib.request.Request(self.standin.url + path, data=data, method=method, headers=headers)
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, json.loads(response.read()), response.headers
+        except urllib.error.HTTPError as error:
+            return error.code, json.loads(error.read()), error.headers
+
+    def test_multipath_patch_and_shallow_get(self):
+        """Test that a gzipped multi-path PATCH writes every path"""
+        status, _, _ = self.request('PATCH', '/.json', {'comparisons/-a': {'u': 'x'},
+                                                        'user_history/x/-a': {'n1': 'A'}}, compress=True)
+        self.assertEqual(status, 200)
+        self.assertEqual(self.standin.get('user_history/x'), {'-a': {'n1': 'A'}})
+        self.assertEqual(self.request('GET', '/.json?shallow=true')[1],
+                         {'comparisons': True, 'user_history': True})
+
+        stats = self.standin.get_statistics()
+        self.assertLess(stats['bytes_received'], stats['bytes_received_raw'] + 30)
+        self.assertEqual(stats['requests_by_method'], {'PATCH': 1, 'GET': 1})
+
+    def test_post_put_delete(self):
+        """Test push keys, overwrites and deletes (empty parents disappear)"""
+        first = self.request('POST', '/items.json', {'i': 1})[1]['name']
+        second = self.request('POST', '/items.json', {'i': 2})[1]['name']
+        self.assertLess(first, second)
+
+        self.request('PUT', f'/items/{first}.json', {'i': 10})
+        self.assertEqual(self.standin.get(f'items/{first}'), {'i': 10})
+        self.request('DELETE', f'/items/{first}.json')
+        self.request('DELETE', f'/items/{second}.json')
+        self.assertIsNone(self.standin.get())
+
+    def test_etag_conditional_put(self):
+        """Test that a stale if-match gets 412 with the current value and ETag"""
+        self.standin.reset({'statistics': {'total': 1}})
+        _, value, headers = self.request('GET', '/statistics.json', headers={'X-Firebase-ETag': 'true'})
+        etag = headers['ETag']
+
+        self.assertEqual(self.request('PUT', '/statistics.json', {'total': 2}, {'if-match': etag})[0], 200)
+        status, current, headers = self.request('PUT', '/statistics.json', {'total': 3}, {'if-match': etag})
+        self.assertEqual((status, current), (412, {'total': 2}))
+        self.assertNotEqual(headers['ETag'], etag)
+        self.assertEqual(self.standin.get_statistics()['conflicts'], 1)
+
+    def test_injected_errors(self):
+        """Test scripted failures and lost acknowledgements"""
+        self.standin.fail_next(2, status=500)
+        self.assertEqual(self.request('PUT', '/a.json', 1)[0], 500)
+        self.assertEqual(self.request('PUT', '/a.json', 1)[0], 500)
+        self.assertIsNone(self.standin.get('a'))
+
+        self.standin.ack_loss_rate = 1.0
+        self.assertEqual(self.request('PUT', '/a.json', 1)[0], 503)
+        self.assertEqual(self.standin.get('a'), 1)
+        self.assertEqual(self.standin.get_statistics()['lost_acks'], 1)
+
+    def test_latency_and_bandwidth(self):
+        """Test that responses are held for latency plus transfer time"""
+        self.standin.latency = 0.05
+        self.standin.bandwidth = 10000
+        start = time.perf_counter()
+        self.request('PUT', '/blob.json', 'x' * 1000)
+        self.assertGreaterEqual(time.perf_counter() - start, 0.05 + 2000 / 10000)
+
+
+@unittest.skipUnless(FIREBASE_AVAILABLE, "requests not installed")
+class TestSyncAgainstStandin(unittest.TestCase):
+    """FirebaseDatabase and FirebaseSync end to end against the stand-in"""
+
+    def setUp(self):
+        self.standin = FirebaseStandin().start()
+        self.print_patch = mock.patch('builtins.print')
+        self.print_patch.start()
+        self.config = firebase_config.FirebaseConfig(database_url=self.standin.url)
+        self.database = firebase_config.FirebaseDatabase(self.config, history_path=':memory:')
+
+    def tearDown(self):
+        self.database.statistics.stop()
+        self.config.http.close()
+        self.print_patch.stop()
+        self.standin.stop()
+
+    def test_save_and_read_history(self):
+        """Test that saved comparisons come back through get_user_history"""
+        self.assertTrue(self.config.test_connection()[0])
+        success, keys = self.database.save_comparison_results(
+            [('user_1', {'name1': f'AHMED {i}', 'name2': f'AHMAD {i}', 'category': 'misspellings'})
+             for i in range(3)])
+        self.assertTrue(success)
+
+        success, history = self.database.get_user_history('user_1', limit=2)
+        self.assertTrue(success)
+        self.assertEqual(sorted(item['firebase_key'] for item in history), keys[1:])
+        self.assertEqual(history[0]['error_category'], 'misspellings')
+
+        # Unchanged history: one GET answered with just the cursor entry
+        self.standin.reset_statistics()
+        self.assertEqual(len(self.database.get_user_history('user_1')[1]), 3)
+        stats = self.standin.get_statistics()
+        self.assertEqual(stats['requests_by_method'], {'GET': 1})
+        self.assertLess(stats['bytes_sent'], 150)
+
+        self.assertTrue(self.database.statistics.flush())
+        self.assertEqual(self.standin.get('statistics')['total_comparisons'], 3)
+
+    def test_lost_acks_do_not_duplicate(self):
+        """Test that outbox replays after lost acknowledgements overwrite, not duplicate"""
+        self.config.connected = True
+        self.standin.ack_loss_rate = 0.5
+        sync = firebase_config.FirebaseSync(self.database, outbox_path=':memory:')
+        sync.sync_batch_size = 5
+        sync.batch_linger = 0.0
+        sync.backoff_base = 0.01
+        sync.max_retries = 1000
+        for i in range(20):
+            sync.add_to_sync_queue('user_1', {'name1': f'SARA {i}'})
+
+        sync.start_sync_service()
+        deadline = time.monotonic() + 30
+        while sync.outbox.pending_count() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        sync.stop_sync_service()
+
+        self.assertEqual(sync.outbox.pending_count(), 0)
+        self.assertGreater(self.standin.get_statistics()['lost_acks'], 0)
+        self.assertEqual(len(self.standin.get('comparisons')), 20)
+
+    def test_outage_keeps_items_pending(self):
+        """Test that an outage and server errors park nothing, and only 4xx rejections park"""
+        from src.utils.http_client import HTTPClient
+        self.config.http.close()
+        self.config.http = HTTPClient(retries=0, timeout=2)
+        self.assertTrue(self.config.test_connection()[0])
+        sync = firebase_config.FirebaseSync(self.database, outbox_path=':memory:')
+        sync.sync_batch_size = 5
+        sync.batch_linger = 0.0
+        sync.backoff_base = 0.01
+        sync.backoff_max = 0.05
+
+        def wait_until(predicate, timeout=20):
+            deadline = time.monotonic() + timeout
+            while not predicate() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            return predicate()
+
+        # Outage: the server goes away while items are being queued
+        port = self.standin.port
+        self.standin.stop()
+        sync.start_sync_service()
+        try:
+            for i in range(12):
+                sync.add_to_sync_queue('user_1', {'name1': f'SARA {i}'})
+            self.assertTrue(wait_until(lambda: sync.reconnects == 0 and self.config.connection_attempts > 10))
+            self.assertFalse(self.config.is_connected())
+            self.assertEqual(sync.outbox.get_statistics()['dead'], 0)
+            self.assertEqual({item['retries'] for item in sync.outbox.peek(20)}, {0})
+
+            # Back online, with a burst of server errors first
+            self.standin = FirebaseStandin(port=port).start()
+            self.standin.fail_next(4, 503)
+            self.assertTrue(wait_until(lambda: sync.outbox.pending_count() == 0))
+            self.assertGreaterEqual(sync.reconnects, 1)
+            self.assertGreater(sync.deferred, 0)
+            self.assertEqual(len(self.standin.get('comparisons')), 12)
+            self.assertEqual(sync.outbox.get_statistics()['dead'], 0)
+
+            # A permanent rejection parks the batch after max_retries, replay delivers it
+            self.standin.fail_next(sync.max_retries + 1, 400)
+            sync.add_to_sync_queue('user_1', {'name1': 'NOUR'})
+            self.assertTrue(wait_until(lambda: sync.outbox.get_statistics()['dead'] == 1))
+            self.assertEqual(sync.replay_dead(), 1)
+            self.assertTrue(wait_until(lambda: sync.outbox.pending_count() == 0))
+            self.assertEqual(len(self.standin.get('comparisons')), 13)
+        finally:
+            sync.stop_sync_service()
+
+
+if __name__ == '__main__':
+    unittest.main()
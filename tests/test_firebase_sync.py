@@ -0,0 +1,419 @@
+"""
+Firebase sync tests for BlueEdge framework (no network: HTTP calls are mocked)
+"""
+import unittest
+import sys
+import os
+import time
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from src.utils import firebase_config
+    FIREBASE_AVAILABLE = True
+except ImportError:  # requests not installed
+    FIREBASE_AVAILABLE = False
+
+
+def _response(status_code=200, payload=None, etag=None):
+    response = mock.Mock(status_code=status_code, headers={'ETag': etag} if etag else {})
+    response.json.return_value = payload
+    return response
+
+
+@unittest.skipUnless(FIREBASE_AVAILABLE, "requests not installed")
+class TestBatchedWrites(unittest.TestCase):
+    """Multi-path batched comparison writes"""
+
+    def setUp(self):
+        with mock.patch('builtins.print'):
+            self.config = firebase_config.FirebaseConfig()
+            self.database = firebase_config.FirebaseDatabase(self.config, history_path=':memory:')
+        self.config.connected = True
+
+    def test_push_keys_unique_and_ordered(self):
+        """Test that keys generated in a burst are unique and sort by creation"""
+        keys = [firebase_config.generate_push_key() for _ in range(2000)]
+        self.assertEqual(len(set(keys)), len(keys))
+        self.assertEqual(keys, sorted(keys))
+        self.assertTrue(all(len(key) == 20 for key in keys))
+
+    def test_batch_is_one_fanout_patch(self):
+        """Test that a batch becomes one PATCH writing comparisons/ and user_history/"""
+        batch = [('user_a', {'name1': 'AHMED', 'name2': 'AHMAD', 'is_duplicate': True}),
+                 ('user_b', {'name1': 'SARA', 'name2': 'NOUR', 'is_duplicate': False})]
+
+        with mock.patch.object(self.config.http, 'patch', return_value=_response()) as patch, \
+                mock.patch.object(self.database.statistics, 'add') as add_statistics:
+            success, keys = self.database.save_comparison_results(batch)
+
+        self.assertTrue(success)
+        self.assertEqual(patch.call_count, 1)
+        self.assertEqual(patch.call_args.args[0], self.config.root_endpoint)
+        updates = patch.call_args.kwargs['json']
+        self.assertEqual(set(updates), {
+            f'comparisons/{keys[0]}', f'user_history/user_a/{keys[0]}',
+            f'comparisons/{keys[1]}', f'user_history/user_b/{keys[1]}',
+            f'sessions/{self.database.session_id}'
+        })
+        self.assertEqual(updates[f'comparisons/{keys[1]}']['u'], 'user_b')
+        self.assertEqual(updates[f'user_history/user_a/{keys[0]}']['n2'], 'AHMAD')
+        self.assertEqual(add_statistics.call_count, 2)
+        self.assertTrue(add_statistics.call_args.args[0]['duplicate_status'] is False)
+    
+    def test_session_metadata_sent_once(self):
+        """Test that framework metadata goes out with the first successful batch only"""
+        with mock.patch.object(self.config.http, 'patch', return_value=_response()) as patch, \
+                mock.patch.object(self.database.statistics, 'add'):
+            self.database.save_comparison_results([('u', {'name1': 'A'})])
+            self.database.save_comparison_results([('u', {'name1': 'B'})])
+        
+        first, second = [call.kwargs['json'] for call in patch.call_args_list]
+        self.assertEqual(first[f'sessions/{self.database.session_id}']['framework']['name'], 'BlueEdge')
+        self.assertFalse(any(path.startswith('sessions/') for path in second))
+        self.assertFalse(any('framework' in record for record in second.values()))
+    
+    def test_history_decodes_entries(self):
+        """Test that history reads user_history/ and decodes compact and legacy entries"""
+        stored = {
+            '-Nb': {'v': 2, 't': 1700000000000, 'n1': 'SARA', 'n2': 'SARAH', 'sc': 0.9, 'd': 1, 'c': 1},
+            '-Na': {'timestamp': '2023-01-01T00:00:00', 'similarity_score': 0.5, 'duplicate_status': False,
+                    'error_category': 'unknown', 'comparison_results': {'name1': 'X', 'name2': 'Y'}}
+        }
+        with mock.patch.object(self.config.http, 'get', return_value=_response(200, stored)) as get:
+            success, history = self.database.get_user_history('user_a')
+        
+        self.assertTrue(success)
+        self.assertEqual(get.call_args.args[0], f'{self.config.database_url}/user_history/user_a.json')
+        self.assertEqual([item['firebase_key'] for item in history], ['-Nb', '-Na'])
+        self.assertEqual(history[0]['display']['category'], 'Different Spelling')
+        self.assertEqual(history[0]['display']['name2'], 'SARAH')
+        self.assertTrue(history[0]['display']['is_duplicate'])
+        self.assertEqual(history[1]['display']['name1'], 'X')
+    
+    def test_history_refresh_fetches_only_new_keys(self):
+        """Test that later refreshes query from the cursor and serve from the local store"""
+        first = {'-Na': {'v': 2, 'n1': 'A'}, '-Nb': {'v': 2, 'n1': 'B'}}
+        delta = {'-Nb': {'v': 2, 'n1': 'B'}, '-Nc': {'v': 2, 'n1': 'C'}}
+        responses = [_response(200, first), _response(200, delta), _response(200, {'-Nc': {'v': 2, 'n1': 'C'}})]
+        
+        with mock.patch.object(self.config.http, 'get', side_effect=responses) as get:
+            self.database.get_user_history('user_a')
+            success, history = self.database.get_user_history('user_a')
+            self.database.get_user_history('user_a')
+        
+        self.assertTrue(success)
+        self.assertEqual([item['firebase_key'] for item in history], ['-Nc', '-Nb', '-Na'])
+        params = [call.kwargs['params'] for call in get.call_args_list]
+        self.assertEqual(params[0], {'orderBy': '"$key"', 'limitToLast': 50})
+        self.assertEqual((params[1]['startAt'], params[2]['startAt']), ('"-Nb"', '"-Nc"'))
+        self.assertEqual(self.database.history_entries_fetched, 3)
+    
+    def test_history_pages_and_offline(self):
+        """Test that a long gap is fetched in pages and offline reads use the store"""
+        self.database.history.advance('user_a', '-N00')
+        self.database.history_page_size = 2
+        pages = [{'-N00': {}, '-N01': {'v': 2}, '-N02': {'v': 2}}, {'-N02': {'v': 2}, '-N03': {'v': 2}}]
+        
+        with mock.patch.object(self.config.http, 'get', side_effect=[_response(200, page) for page in pages]) as get:
+            self.database.get_user_history('user_a')
+        self.assertEqual(get.call_count, 2)
+        self.assertEqual(self.database.history.cursor('user_a'), '-N03')
+        
+        self.config.connected = False
+        with mock.patch.object(self.config.http, 'get') as get:
+            success, history = self.database.get_user_history('user_a', limit=2)
+        get.assert_not_called()
+        self.assertTrue(success)
+        self.assertEqual([item['firebase_key'] for item in history], ['-N03', '-N02'])
+    
+    def test_own_writes_visible_without_fetch(self):
+        """Test that saved comparisons enter the local history but not the cursor"""
+        with mock.patch.object(self.config.http, 'patch', return_value=_response()), \
+                mock.patch.object(self.database.statistics, 'add'):
+            _, keys = self.database.save_comparison_results([('user_a', {'name1': 'OMAR'})])
+        
+        self.assertEqual(self.database.get_user_history('user_a', refresh=False)[1][0]['firebase_key'], keys[0])
+        self.assertIsNone(self.database.history.cursor('user_a'))
+
+    def test_given_keys_are_reused(self):
+        """Test that outbox idempotency keys become the written paths"""
+        with mock.patch.object(self.config.http, 'patch', return_value=_response()) as patch, \
+                mock.patch.object(self.database.statistics, 'add'):
+            success, keys = self.database.save_comparison_results([('u', {}, '-Nabc')])
+
+        self.assertEqual(keys, ['-Nabc'])
+        self.assertIn('comparisons/-Nabc', patch.call_args.kwargs['json'])
+
+    def test_failed_batch(self):
+        """Test that an HTTP error fails the whole batch without inline retries"""
+        with mock.patch.object(self.config.http, 'patch', return_value=_response(500)) as patch:
+            self.assertEqual(self.database.save_comparison_results([('u', {})]), (False, []))
+        self.assertEqual(patch.call_count, 1)
+
+    def test_failure_classification(self):
+        """Test that outages and server errors are transient, other 4xx are rejections"""
+        import requests
+        for status, failure in ((503, 'transient'), (429, 'transient'), (400, 'rejected'), (401, 'rejected')):
+            with mock.patch.object(self.config.http, 'patch', return_value=_response(status)):
+                self.assertEqual(self.database.write_comparison_batch([('u', {})]), (False, [], failure))
+        self.assertTrue(self.config.is_connected())
+
+        with mock.patch.object(self.config.http, 'patch', side_effect=requests.exceptions.ConnectionError()):
+            self.assertEqual(self.database.write_comparison_batch([('u', {})])[2], 'transient')
+        self.assertFalse(self.config.is_connected())
+        self.assertEqual(self.database.write_comparison_batch([('u', {})])[2], 'transient')
+
+
+@unittest.skipUnless(FIREBASE_AVAILABLE, "requests not installed")
+class TestStatisticsAggregator(unittest.TestCase):
+    """Local statistics aggregation and conditional flushes"""
+
+    RECORDS = [{'duplicate_status': True, 'processing_time': 1.0, 'error_category': 'misspellings'},
+               {'duplicate_status': False, 'processing_time': 3.0, 'error_category': 'misspellings'}]
+
+    def setUp(self):
+        with mock.patch('builtins.print'):
+            self.config = firebase_config.FirebaseConfig()
+        self.config.connected = True
+        self.aggregator = firebase_config.StatisticsAggregator(self.config, flush_interval=3600)
+        self.aggregator.start = mock.Mock()  # no background thread in tests
+        for record in self.RECORDS:
+            self.aggregator.add(record)
+
+    def test_merge_statistics(self):
+        """Test that a delta merges into the stored document"""
+        stats = firebase_config.merge_statistics(
+            {'total_comparisons': 2, 'total_processing_time': 2.0, 'min_processing_time': 0.5,
+             'category_distribution': {'split_names': 1}},
+            self.aggregator.delta
+        )
+        self.assertEqual(stats['total_comparisons'], 4)
+        self.assertEqual(stats['total_duplicates_found'], 1)
+        self.assertAlmostEqual(stats['average_processing_time'], 1.5)
+        self.assertEqual((stats['min_processing_time'], stats['max_processing_time']), (0.5, 3.0))
+        self.assertEqual(stats['category_distribution'], {'split_names': 1, 'misspellings': 2})
+
+    def test_flush_retries_on_etag_conflict(self):
+        """Test that a 412 re-merges into the returned document and writes with its ETag"""
+        put_responses = [_response(412, {'total_comparisons': 10}, etag='e2'), _response(200)]
+
+        with mock.patch.object(self.config.http, 'get', return_value=_response(200, None, etag='e1')) as get, \
+                mock.patch.object(self.config.http, 'put', side_effect=put_responses) as put, \
+                mock.patch('builtins.print'):
+            self.assertTrue(self.aggregator.flush())
+
+        self.assertEqual(get.call_count, 1)
+        self.assertEqual([call.kwargs['headers']['if-match'] for call in put.call_args_list], ['e1', 'e2'])
+        self.assertEqual(put.call_args.kwargs['json']['total_comparisons'], 12)
+        self.assertEqual(self.aggregator.conflicts, 1)
+        self.assertEqual(self.aggregator.pending_count(), 0)
+
+    def test_missing_etag_never_writes_unconditionally(self):
+        """Test that a read without an ETag is retried and never followed by a PUT without if-match"""
+        get_responses = [_response(200, {'total_comparisons': 5}), _response(200, {'total_comparisons': 5}, etag='e1')]
+        with mock.patch.object(self.config.http, 'get', side_effect=get_responses) as get, \
+                mock.patch.object(self.config.http, 'put', return_value=_response(200)) as put, \
+                mock.patch('builtins.print'):
+            self.assertTrue(self.aggregator.flush())
+        self.assertEqual(get.call_count, 2)
+        self.assertEqual([call.kwargs['headers']['if-match'] for call in put.call_args_list], ['e1'])
+        self.assertEqual(put.call_args.kwargs['json']['total_comparisons'], 7)
+        self.assertEqual(self.aggregator.missing_etags, 1)
+
+        # A 412 without an ETag also goes back to a fresh read
+        self.aggregator.add(self.RECORDS[0])
+        get_responses = [_response(200, None, etag='e2'), _response(200, {'total_comparisons': 9}, etag='e3')]
+        with mock.patch.object(self.config.http, 'get', side_effect=get_responses), \
+                mock.patch.object(self.config.http, 'put', side_effect=[_response(412), _response(200)]) as put, \
+                mock.patch('builtins.print'):
+            self.assertTrue(self.aggregator.flush())
+        self.assertEqual([call.kwargs['headers']['if-match'] for call in put.call_args_list], ['e2', 'e3'])
+        self.assertEqual(put.call_args.kwargs['json']['total_comparisons'], 10)
+
+        # A server that never sends one: no write, delta kept
+        self.aggregator.add(self.RECORDS[0])
+        with mock.patch.object(self.config.http, 'get', return_value=_response(200, {})) as get, \
+                mock.patch.object(self.config.http, 'put') as put, \
+                mock.patch('builtins.print'):
+            self.assertFalse(self.aggregator.flush())
+        put.assert_not_called()
+        self.assertEqual(get.call_count, self.aggregator.max_attempts)
+        self.assertEqual(self.aggregator.pending_count(), 1)
+
+    def test_failed_flush_keeps_delta(self):
+        """Test that a failed write leaves the comparisons pending"""
+        with mock.patch.object(self.config.http, 'get', return_value=_response(500)), \
+                mock.patch('builtins.print'):
+            self.assertFalse(self.aggregator.flush())
+        self.aggregator.add(self.RECORDS[0])
+        self.assertEqual(self.aggregator.pending_count(), 3)
+        self.assertEqual(self.aggregator.delta['categories'], {'misspellings': 3})
+
+
+@unittest.skipUnless(FIREBASE_AVAILABLE, "requests not installed")
+class TestSyncService(unittest.TestCase):
+    """Event-driven sync loop over the outbox"""
+
+    def setUp(self):
+        self.database = mock.Mock()
+        self.database.config.is_connected.return_value = True
+        self.database.write_comparison_batch.return_value = (True, [], None)
+        with mock.patch('builtins.print'):
+            self.sync = firebase_config.FirebaseSync(self.database, outbox_path=':memory:')
+        self.sync.batch_linger = 0.05
+        self.print_patch = mock.patch('builtins.print')
+        self.print_patch.start()
+
+    def tearDown(self):
+        self.sync.stop_sync_service()
+        self.print_patch.stop()
+
+    def wait_until(self, predicate, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while not predicate() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return predicate()
+
+    def test_enqueue_wakes_loop_and_drains_in_batches(self):
+        """Test that queued items are sent promptly in batches of at most sync_batch_size"""
+        self.sync.start_sync_service()
+        for i in range(120):
+            self.sync.add_to_sync_queue('user_1', {'i': i})
+
+        self.assertTrue(self.wait_until(lambda: self.sync.outbox.pending_count() == 0, timeout=2.0))
+        batches = [call.args[0] for call in self.database.write_comparison_batch.call_args_list]
+        self.assertEqual(sum(len(batch) for batch in batches), 120)
+        self.assertTrue(all(len(batch) <= self.sync.sync_batch_size for batch in batches))
+        self.assertEqual([item[1]['i'] for batch in batches for item in batch], list(range(120)))
+
+    def test_failure_backs_off(self):
+        """Test that failures keep items queued and grow the retry delay"""
+        self.database.write_comparison_batch.return_value = (False, [], firebase_config.FAILURE_TRANSIENT)
+        self.sync.backoff_base = 0.05
+        self.sync.start_sync_service()
+        self.sync.add_to_sync_queue('user_1', {'i': 0})
+
+        self.assertTrue(self.wait_until(lambda: self.sync.consecutive_errors >= 5))
+        self.assertEqual(self.sync.outbox.pending_count(), 1)
+        self.assertEqual(self.sync.outbox.peek(1)[0]['retries'], 0)
+
+        self.sync.consecutive_errors = 4
+        delays = [self.sync._backoff_delay() for _ in range(50)]
+        self.assertTrue(all(0.2 <= delay <= 0.4 for delay in delays))
+        self.sync.consecutive_errors = 100
+        self.assertLessEqual(self.sync._backoff_delay(), self.sync.backoff_max)
+    
+    def test_rejected_items_are_parked_and_replayed(self):
+        """Test that only rejected writes use up retries, and replay_dead queues them again"""
+        self.database.write_comparison_batch.return_value = (False, [], firebase_config.FAILURE_REJECTED)
+        self.sync.backoff_base = 0.01
+        self.sync.max_retries = 1
+        self.sync.start_sync_service()
+        self.sync.add_to_sync_queue('user_1', {'i': 0})
+
+        self.assertTrue(self.wait_until(lambda: self.sync.outbox.get_statistics()['dead'] == 1))
+        self.assertEqual(self.database.write_comparison_batch.call_count, 2)
+
+        self.database.write_comparison_batch.return_value = (True, [], None)
+        self.assertEqual(self.sync.replay_dead(), 1)
+        self.assertTrue(self.wait_until(lambda: self.sync.outbox.pending_count() == 0))
+        self.assertEqual(self.sync.outbox.get_statistics()['dead'], 0)
+
+    def test_rate_limit_spaces_writes(self):
+        """Test that the write budget limits requests and fills batches instead"""
+        from src.utils.rate_limiter import TokenBucket
+        self.sync.rate_limiter = TokenBucket(rate=10, capacity=1)
+        self.sync.sync_batch_size = 5
+        self.sync.start_sync_service()
+        
+        start = time.monotonic()
+        for i in range(20):
+            self.sync.add_to_sync_queue('user_1', {'i': i})
+        self.assertTrue(self.wait_until(lambda: self.sync.outbox.pending_count() == 0))
+        writes = self.database.write_comparison_batch.call_count
+        self.assertGreaterEqual(time.monotonic() - start, (writes - 1) / 10 - 0.05)
+        self.assertGreater(self.sync.get_queue_status()['throttle_waits'], 0)
+    
+    def test_overflow_shed_and_coalesce(self):
+        """Test that above the watermark items are shed or merged into pending ones"""
+        self.sync.high_watermark = 2
+        first = self.sync.add_to_sync_queue('u', {'name1': 'A', 'name2': 'B', 'score': 1})
+        self.sync.add_to_sync_queue('u', {'name1': 'C', 'name2': 'D'})
+        
+        self.assertEqual(self.sync.add_to_sync_queue('u', {'name1': 'A', 'name2': 'B', 'score': 2}), first)
+        self.assertIsNone(self.sync.add_to_sync_queue('u', {'name1': 'E', 'name2': 'F'}))
+        
+        status = self.sync.get_queue_status()
+        self.assertEqual((status['queue_size'], status['coalesced'], status['shed']), (2, 1, 1))
+        self.assertEqual(self.sync.outbox.peek(1)[0]['data']['score'], 2)
+        
+        self.sync.overflow_policy = 'shed'
+        self.assertIsNone(self.sync.add_to_sync_queue('u', {'name1': 'A', 'name2': 'B'}))
+    
+    def test_overflow_block_waits_for_drain(self):
+        """Test that 'block' waits until the sync loop makes room"""
+        self.sync.overflow_policy = 'block'
+        self.sync.high_watermark = 1
+        self.sync.add_to_sync_queue('u', {'i': 0})
+        self.sync.start_sync_service()
+        
+        self.assertIsNotNone(self.sync.add_to_sync_queue('u', {'i': 1}))
+        self.assertTrue(self.wait_until(lambda: self.sync.outbox.pending_count() == 0))
+        self.assertEqual(self.sync.get_queue_status()['shed'], 0)
+        
+        self.sync.stop_sync_service()
+        self.sync.block_timeout = 0.05
+        self.sync.add_to_sync_queue('u', {'i': 2})
+        self.assertIsNone(self.sync.add_to_sync_queue('u', {'i': 3}))
+        self.assertEqual(self.sync.get_queue_status()['blocked'], 2)
+    
+    def test_unknown_overflow_policy(self):
+        """Test that an unknown policy is rejected"""
+        with self.assertRaises(ValueError):
+            firebase_config.FirebaseSync(self.database, outbox_path=':memory:', overflow_policy='drop')
+
+
+@unittest.skipUnless(FIREBASE_AVAILABLE, "requests not installed")
+class TestHTTPClient(unittest.TestCase):
+    """Pooled session, retries and request compression"""
+
+    def setUp(self):
+        from src.utils.http_client import HTTPClient
+        self.client = HTTPClient(retries=4, compress_min_bytes=100)
+
+    def tearDown(self):
+        self.client.close()
+
+    def test_large_bodies_are_gzipped(self):
+        """Test that only bodies above the threshold are compressed"""
+        import gzip
+        import json
+
+        with mock.patch.object(self.client.session, 'request', return_value=_response()) as request:
+            self.client.patch('https://example.test/.json', json={'k': 'v'})
+            small = request.call_args.kwargs
+            payload = {f'comparisons/{i}': {'name1': 'MOHAMMED AHMED'} for i in range(20)}
+            self.client.patch('https://example.test/.json', json=payload)
+            large = request.call_args.kwargs
+
+        self.assertNotIn('Content-Encoding', small['headers'])
+        self.assertEqual(large['headers']['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(large['data'])), payload)
+        stats = self.client.get_statistics()
+        self.assertEqual(stats['requests_sent'], 2)
+        self.assertLess(stats['body_bytes_sent'], stats['body_bytes_raw'])
+
+    def test_one_adapter_with_retries(self):
+        """Test that both schemes share the pooled adapter and POST is never retried"""
+        self.assertIs(self.client.session.get_adapter('https://x.test'), self.client.adapter)
+        self.assertIs(self.client.session.get_adapter('http://x.test'), self.client.adapter)
+        self.assertEqual(self.client.retry.total, 4)
+        self.assertNotIn('POST', self.client.retry.allowed_methods)
+        self.assertIn('PATCH', self.client.retry.allowed_methods)
+
+
+if __name__ == '__main__':
+    unittest.main()
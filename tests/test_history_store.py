@@ -0,0 +1,68 @@
+"""
+Local history store tests for BlueEdge framework
+"""
+import unittest
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.history_store import HistoryStore
+
+
+class TestHistoryStore(unittest.TestCase):
+    """Entries, cursors and pruning"""
+
+    def setUp(self):
+        self.store = HistoryStore(':memory:', max_entries_per_user=5)
+
+    def tearDown(self):
+        self.store.close()
+
+    def test_recent_is_newest_key_first(self):
+        """Test that entries come back by descending push key, per user"""
+        self.store.put([('u1', '-b', {'i': 2}), ('u1', '-a', {'i': 1}), ('u2', '-c', {'i': 3})])
+        self.assertEqual(self.store.recent('u1'), [('-b', {'i': 2}), ('-a', {'i': 1})])
+        self.assertEqual(self.store.recent('u1', 1), [('-b', {'i': 2})])
+        self.assertEqual(self.store.count('u2'), 1)
+
+    def test_put_replaces_same_key(self):
+        """Test that re-fetched or replayed keys do not duplicate"""
+        self.store.put([('u', '-a', {'i': 1})])
+        self.store.put([('u', '-a', {'i': 2})])
+        self.assertEqual(self.store.recent('u'), [('-a', {'i': 2})])
+
+    def test_cursor_only_moves_forward(self):
+        """Test that advance keeps the newest key"""
+        self.assertIsNone(self.store.cursor('u'))
+        self.store.advance('u', '-b')
+        self.store.advance('u', '-a')
+        self.assertEqual(self.store.cursor('u'), '-b')
+        self.store.clear('u')
+        self.assertIsNone(self.store.cursor('u'))
+
+    def test_oldest_entries_pruned(self):
+        """Test that only max_entries_per_user newest entries are kept"""
+        self.store.put(('u', f'-{i:02d}', {'i': i}) for i in range(8))
+        self.assertEqual(self.store.count('u'), 5)
+        self.assertEqual([key for key, _ in self.store.recent('u', 10)], ['-07', '-06', '-05', '-04', '-03'])
+
+    def test_persists_across_reopen(self):
+        """Test that entries and cursors survive an app restart"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'history.db')
+            store = HistoryStore(path)
+            store.put([('u', '-a', {'i': 1})])
+            store.advance('u', '-a')
+            store.close()
+
+            store = HistoryStore(path)
+            self.assertEqual(store.cursor('u'), '-a')
+            self.assertEqual(store.recent('u'), [('-a', {'i': 1})])
+            store.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,537 @@
+"""
+Performance monitor tests for BlueEdge framework
+"""
+import unittest
+import sys
+import os
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.performance_monitor import SimplePerformanceMonitor, get_rss_kb
+from src.utils.latency_histogram import LatencyHistogram, WindowedLatencyHistogram
+from src.utils.tracing import TRACER, Tracer
+from src.utils.metrics_registry import MetricsRegistry, bind_blueedge_metrics, start_http_server
+from src.utils.gc_runtime import GCRuntime
+from src.utils.profiler import parse_profile_spec
+
+
+class TestMeasuredResources(unittest.TestCase):
+    """Real wall/CPU/memory measurement"""
+
+    def test_measure_records_comparison(self):
+        """Test that measure() records wall and CPU time"""
+        monitor = SimplePerformanceMonitor(memory_sample_every=0)
+
+        with monitor.measure() as measurement:
+            measurement['cache_hit'] = False
+            sum(range(10000))
+
+        self.assertEqual(monitor.total_comparisons, 1)
+        self.assertEqual(monitor.cache_misses, 1)
+        self.assertGreater(measurement['wall_time'], 0)
+        self.assertIsNotNone(measurement['cpu_time'])
+        self.assertFalse(measurement['sampled'])
+        self.assertIsNone(measurement['peak_memory_bytes'])
+
+    def test_memory_is_sampled(self):
+        """Test that every Nth operation records a tracemalloc peak"""
+        monitor = SimplePerformanceMonitor(memory_sample_every=2)
+
+        for _ in range(4):
+            with monitor.measure():
+                [str(i) for i in range(1000)]
+
+        self.assertEqual(monitor.memory_samples, 2)
+        metrics = monitor.get_current_metrics()
+        self.assertGreater(metrics['measured_peak_memory_per_comparison_kb'], 0)
+
+    def test_no_invented_memory(self):
+        """Test that unmeasured comparisons add no made-up memory"""
+        monitor = SimplePerformanceMonitor()
+        monitor.record_comparison(0.01)
+
+        self.assertEqual(monitor.estimated_memory_usage, 0)
+
+    def test_sampled_peaks_are_per_comparison(self):
+        """Test that sampled peaks give a per-comparison mean/max instead of a growing total"""
+        monitor = SimplePerformanceMonitor()
+        for i in range(500):
+            monitor.record_comparison(0.01, peak_memory_bytes=4096 if i % 2 else 2048)
+
+        metrics = monitor.get_current_metrics()
+        self.assertEqual(monitor.estimated_memory_usage, 0)
+        self.assertEqual(metrics['memory_basis'], 'measured')
+        self.assertAlmostEqual(metrics['memory_kb'], 3.0)
+        self.assertEqual(metrics['max_peak_memory_per_comparison_kb'], 4.0)
+        self.assertTrue(metrics['blueedge_compliance']['memory_compliant'])
+
+        monitor.record_comparison(0.01, peak_memory_bytes=64 * 1024 * 501)
+        self.assertFalse(monitor.get_current_metrics()['blueedge_compliance']['memory_compliant'])
+
+    def test_rss_reported(self):
+        """Test that RSS is available on this platform when /proc or resource exists"""
+        current_kb, peak_kb = get_rss_kb()
+        if current_kb is None and peak_kb is None:
+            self.skipTest("No RSS source on this platform")
+        self.assertGreater(current_kb or peak_kb, 0)
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """Log-bucketed latency histograms"""
+
+    def test_percentile_precision(self):
+        """Test that percentiles are within the configured relative error"""
+        histogram = LatencyHistogram()
+        values = [i * 1000 for i in range(1, 10001)]  # 1us .. 10ms
+        for value in values:
+            histogram.record(value)
+
+        for percent in (50, 95, 99, 99.9):
+            exact = values[int(percent / 100 * len(values)) - 1]
+            self.assertAlmostEqual(histogram.percentile(percent), exact, delta=exact * 0.02)
+
+    def test_merge_across_processes(self):
+        """Test that sparse dict round-trips merge into the same distribution"""
+        first, second, combined = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for value in range(0, 5000, 7):
+            first.record(value)
+            combined.record(value)
+        for value in range(100000, 200000, 13):
+            second.record(value)
+            combined.record(value)
+
+        merged = LatencyHistogram.from_dict(first.to_dict()).merge(LatencyHistogram.from_dict(second.to_dict()))
+        self.assertEqual(merged.count, combined.count)
+        self.assertEqual(merged.percentiles(), combined.percentiles())
+
+    def test_fixed_memory(self):
+        """Test that memory does not grow with the number of values"""
+        histogram = LatencyHistogram()
+        before = histogram.memory_bytes()
+        for value in range(100000):
+            histogram.record(value * 997)
+        self.assertEqual(histogram.memory_bytes(), before)
+
+    def test_windowed_view(self):
+        """Test that old slots fall out of the window"""
+        now = [0.0]
+        windowed = WindowedLatencyHistogram(slot_seconds=10, slots=6, clock=lambda: now[0])
+        windowed.record(1000)
+        now[0] = 30.0
+        windowed.record(2000)
+
+        self.assertEqual(windowed.view(10).count, 1)
+        self.assertEqual(windowed.view(60).count, 2)
+        now[0] = 75.0
+        self.assertEqual(windowed.view().count, 1)
+
+    def test_monitor_reports_tail(self):
+        """Test that the monitor reports p50..p999"""
+        monitor = SimplePerformanceMonitor()
+        for i in range(100):
+            monitor.record_comparison(0.001 if i < 99 else 0.5)
+
+        percentiles = monitor.get_current_metrics()['latency_percentiles_ms']
+        self.assertAlmostEqual(percentiles['p50'], 1.0, delta=0.02)
+        self.assertAlmostEqual(percentiles['p999'], 500.0, delta=10)
+
+
+class TestTracing(unittest.TestCase):
+    """Span tracing of pipeline stages"""
+
+    def tearDown(self):
+        TRACER.disable()
+        TRACER.clear()
+
+    def test_disabled_records_nothing(self):
+        """Test that traced functions record no spans while disabled"""
+        from src.algorithms.duplicate_detector import DuplicateDetector
+
+        TRACER.clear()
+        DuplicateDetector().detect_category("DR. AHMED OMAR SALEM", "AHMED OMAR SALEM")
+        self.assertEqual(len(TRACER.events), 0)
+
+    def test_pipeline_stages_traced(self):
+        """Test that a comparison produces nested stage spans"""
+        from src.algorithms.duplicate_detector import DuplicateDetector
+
+        detector = DuplicateDetector()
+        TRACER.enable()
+        detector.detect_category("MOHAMMED AHMED HASSAN", "MOHAMMAD AHMAD HASAN")
+        TRACER.disable()
+
+        stages = TRACER.stage_summary()
+        for stage in ('DuplicateDetector.detect_category', 'SmartCache.get', 'SmartCache.put',
+                      'DuplicateDetector.prepare_name'):
+            self.assertIn(stage, stages)
+        self.assertTrue(any(stack.startswith('DuplicateDetector.detect_category;')
+                            for stack in TRACER.collapsed_stacks()))
+
+    def test_exports(self):
+        """Test Chrome trace and collapsed-stack output"""
+        import json
+        import tempfile
+
+        tracer = Tracer()
+        tracer.enable()
+        with tracer.span('outer'):
+            with tracer.span('inner'):
+                sum(range(1000))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            trace_path = os.path.join(tmp, 'trace.json')
+            stacks_path = os.path.join(tmp, 'stacks.txt')
+            self.assertEqual(tracer.export_chrome_trace(trace_path), 2)
+            self.assertEqual(tracer.export_collapsed(stacks_path), 2)
+
+            with open(trace_path) as f:
+                events = json.load(f)['traceEvents']
+            with open(stacks_path) as f:
+                lines = f.read().splitlines()
+
+        self.assertEqual({event['name'] for event in events}, {'outer', 'inner'})
+        self.assertTrue(all(event['ph'] == 'X' for event in events))
+        self.assertEqual([line.split()[0] for line in lines], ['outer', 'outer;inner'])
+
+
+class TestGCRuntime(unittest.TestCase):
+    """GC policy and pause accounting"""
+
+    def setUp(self):
+        import gc
+        self.thresholds = gc.get_threshold()
+        self.runtime = GCRuntime()
+
+    def tearDown(self):
+        import gc
+        self.runtime.stop_tracking()
+        gc.set_threshold(*self.thresholds)
+
+    def test_pauses_reported_through_monitor(self):
+        """Test that collections are timed and surface in the monitor metrics"""
+        import gc
+
+        monitor = SimplePerformanceMonitor(gc_runtime=self.runtime)
+        gc.collect()
+
+        stats = monitor.get_current_metrics()['gc']
+        self.assertGreaterEqual(stats['collections_by_generation'][2], 1)
+        self.assertGreater(stats['total_pause_ms'], 0)
+        self.assertIn('garbage_collection', monitor.generate_report()['performance_metrics'])
+
+    def test_collect_only_on_growth(self):
+        """Test that maybe_collect waits for allocation growth"""
+        runtime = GCRuntime(growth_threshold_blocks=50000)
+        self.assertFalse(runtime.maybe_collect())
+
+        retained = [[i] for i in range(60000)]
+        self.assertTrue(runtime.maybe_collect())
+        self.assertFalse(runtime.maybe_collect())
+        self.assertEqual(runtime.growth_collections, 1)
+        del retained
+
+    def test_monitor_does_not_force_collections(self):
+        """Test that routine cleanup no longer runs gc.collect"""
+        runtime = GCRuntime(growth_threshold_blocks=10**9)
+        monitor = SimplePerformanceMonitor(gc_runtime=runtime)
+        for _ in range(50):
+            monitor.record_comparison(0.001)
+
+        self.assertEqual(runtime.growth_collections, 0)
+
+    def test_batch_mode_restores_policy(self):
+        """Test that batch mode tunes thresholds, freezes, then restores"""
+        import gc
+
+        with self.runtime.batch_mode():
+            self.assertEqual(gc.get_threshold(), (50000, 20, 100))
+            self.assertGreater(gc.get_freeze_count(), 0)
+
+        self.assertEqual(gc.get_threshold(), self.thresholds)
+        self.assertEqual(gc.get_freeze_count(), 0)
+
+    def test_batch_mode_keeps_existing_freeze(self):
+        """Test that batch mode does not undo a freeze made before it"""
+        import gc
+
+        frozen = self.runtime.freeze()
+        try:
+            with self.runtime.batch_mode():
+                self.assertEqual(gc.get_freeze_count(), frozen)
+            self.assertEqual(gc.get_freeze_count(), frozen)
+        finally:
+            self.runtime.unfreeze()
+
+
+class TestProfiling(unittest.TestCase):
+    """On-demand profiling of the next N comparisons"""
+
+    def test_profile_next_comparisons(self):
+        """Test that the session stops itself and reports its output files"""
+        import pstats
+        import tempfile
+        from src.algorithms.duplicate_detector import DuplicateDetector
+
+        detector = DuplicateDetector()
+        monitor = SimplePerformanceMonitor(memory_sample_every=0)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            monitor.start_profiling(comparisons=5, output_dir=tmp)
+            for i in range(8):
+                with monitor.measure():
+                    detector.calculate_similarity(f"MOHAMMED AHMED {i}", f"MOHAMMAD AHMAD {i}")
+
+            profile = monitor.get_current_metrics()['last_profile']
+            self.assertFalse(monitor.get_current_metrics()['profiling_active'])
+            self.assertEqual(profile['comparisons'], 5)
+
+            stats = pstats.Stats(profile['pstats_path'])
+            self.assertTrue(any(func[2] == 'calculate_similarity' for func in stats.stats))
+            self.assertTrue(os.path.exists(profile['collapsed_path']))
+
+    def test_time_budget_without_comparisons(self):
+        """Test that a seconds budget ends the session on time even when no comparison arrives"""
+        import time
+        import tempfile
+
+        monitor = SimplePerformanceMonitor(memory_sample_every=0)
+        with tempfile.TemporaryDirectory() as tmp:
+            monitor.start_profiling(seconds=0.2, output_dir=tmp)
+            deadline = time.monotonic() + 5
+            while monitor.profiling_session is not None and time.monotonic() < deadline:
+                time.sleep(0.05)
+
+            profile = monitor.last_profile
+            self.assertIsNone(monitor.profiling_session)
+            self.assertEqual(profile['comparisons'], 0)
+            self.assertLess(profile['duration_s'], 1.0)
+            self.assertTrue(os.path.exists(profile['pstats_path']))
+
+            # The next comparison on the profiled thread drops any leftover cProfile hook
+            monitor.record_comparison(0.001)
+            self.assertIsNone(sys.getprofile())
+            self.assertIsNone(monitor.unreleased_session)
+
+    def test_profile_spec(self):
+        """Test BLUEEDGE_PROFILE parsing"""
+        self.assertIsNone(parse_profile_spec(None))
+        self.assertIsNone(parse_profile_spec('off'))
+        self.assertEqual(parse_profile_spec('250'), {'comparisons': 250, 'seconds': None})
+        self.assertEqual(parse_profile_spec('30s'), {'comparisons': None, 'seconds': 30.0})
+        self.assertEqual(parse_profile_spec('on')['comparisons'], 100)
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """OpenMetrics exposition"""
+
+    def test_exposition_format(self):
+        """Test counter/gauge/histogram samples and the EOF terminator"""
+        registry = MetricsRegistry()
+        registry.counter('jobs', 'Jobs done').inc(3, kind='batch')
+        registry.gauge('depth', 'Queue depth').set(7)
+        latency = registry.histogram('wait_seconds', 'Wait', buckets=(0.1, 1.0), unit='seconds')
+        for value in (0.05, 0.5, 5.0):
+            latency.observe(value)
+
+        text = registry.render()
+        self.assertTrue(text.endswith('# EOF\n'))
+        self.assertIn('jobs_total{kind="batch"} 3', text)
+        self.assertIn('depth 7', text)
+        self.assertIn('wait_seconds_bucket{le="0.1"} 1', text)
+        self.assertIn('wait_seconds_bucket{le="1.0"} 2', text)
+        self.assertIn('wait_seconds_bucket{le="+Inf"} 3', text)
+        self.assertIn('# UNIT wait_seconds seconds', text)
+
+    def test_blueedge_binding(self):
+        """Test that monitor and cache values are read at scrape time"""
+        from src.utils.smart_cache import SmartCache
+
+        monitor = SimplePerformanceMonitor()
+        cache = SmartCache(max_size=10, verbose=False)
+        registry = bind_blueedge_metrics(MetricsRegistry(), monitor=monitor, cache=cache)
+
+        monitor.record_comparison(0.002)
+        cache.get("A", "B")
+        text = registry.render()
+
+        self.assertIn('blueedge_comparisons_total 1', text)
+        self.assertIn('blueedge_comparison_duration_seconds_bucket{le="0.0025"} 1', text)
+        self.assertIn('blueedge_comparison_duration_seconds_bucket{le="0.001"} 0', text)
+        self.assertIn('blueedge_cache_requests_total{result="miss"} 1', text)
+
+    def test_stage_counters_are_monotonic(self):
+        """Test that stage counters survive tracer.clear() and the span buffer wrapping"""
+        tracer = Tracer(max_events=3)
+        registry = bind_blueedge_metrics(MetricsRegistry(), tracer=tracer)
+        tracer.enable()
+        for _ in range(5):
+            with tracer.span('stage'):
+                pass
+        self.assertEqual(len(tracer.events), 3)
+        self.assertIn('blueedge_stage_calls_total{stage="stage"} 5', registry.render())
+
+        tracer.clear()
+        with tracer.span('stage'):
+            pass
+        self.assertIn('blueedge_stage_calls_total{stage="stage"} 6', registry.render())
+        self.assertEqual(tracer.stage_summary()['stage']['count'], 1)
+
+    def test_sync_backpressure_binding(self):
+        """Test that sync queue depth and shed counts are exported per queue"""
+        from unittest import mock
+
+        sync = mock.Mock()
+        sync.get_queue_status.return_value = {'queue_size': 7, 'shed': 2, 'coalesced': 1, 'blocked': 0,
+                                              'throttle_waits': 4}
+        io = mock.Mock()
+        io.get_statistics.return_value = {'queued_saves': 3, 'shed': 5, 'throttle_waits': 1}
+        text = bind_blueedge_metrics(MetricsRegistry(), sync=sync, io=io).render()
+
+        self.assertIn('blueedge_sync_queue_depth{queue="outbox"} 7', text)
+        self.assertIn('blueedge_sync_queue_depth{queue="io"} 3', text)
+        self.assertIn('blueedge_sync_backpressure_total{action="shed",queue="outbox"} 2', text)
+        self.assertIn('blueedge_sync_backpressure_total{action="shed",queue="io"} 5', text)
+        self.assertIn('blueedge_sync_throttle_waits_total{queue="outbox"} 4', text)
+
+    def test_http_and_textfile(self):
+        """Test the /metrics endpoint and the atomic textfile"""
+        import tempfile
+        import urllib.request
+
+        registry = MetricsRegistry()
+        registry.counter('hits', 'Hits').inc()
+
+        server = start_http_server(registry, port=0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                body = response.read().decode('utf-8')
+                content_type = response.headers['Content-Type']
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertIn('hits_total 1', body)
+        self.assertTrue(content_type.startswith('application/openmetrics-text'))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'blueedge.prom')
+            registry.write_textfile(path)
+            with open(path) as f:
+                self.assertEqual(f.read(), registry.render())
+            self.assertEqual(os.listdir(tmp), ['blueedge.prom'])
+
+
+class TestBenchmarkHarness(unittest.TestCase):
+    """Benchmark statistics and the regression gate"""
+
+    def test_regression_gate(self):
+        """Test that only drops beyond the tolerance count as regressions"""
+        from scripts.benchmark_framework import compare_with_baseline, summarize
+
+        baseline = {'benchmarks': {'a': summarize([1.0, 1.0], 1000), 'b': summarize([1.0], 1000)}}
+        current = {'benchmarks': {
+            'a': summarize([1.1, 1.1, 1.1], 1000),   # 9% slower
+            'b': summarize([1.5], 1000),             # 33% slower
+            'c': summarize([1.0], 1000)              # not in baseline
+        }}
+
+        comparisons = {entry['benchmark']: entry for entry in compare_with_baseline(current, baseline, 0.2)}
+        self.assertEqual(set(comparisons), {'a', 'b'})
+        self.assertFalse(comparisons['a']['regressed'])
+        self.assertTrue(comparisons['b']['regressed'])
+
+    def test_noisy_gate(self):
+        """Test that measured spread widens the allowed drop without hiding large regressions"""
+        from scripts.benchmark_framework import compare_with_baseline, pool_results, summarize
+
+        # Five worker processes, one 25% faster than the rest; the second used twice the loops
+        runs = [{'benchmarks': {'a': summarize([1.0, 1.0], 1000)}} for _ in range(5)]
+        runs[1] = {'benchmarks': {'a': summarize([2.0, 2.0], 2000)}}
+        runs[4] = {'benchmarks': {'a': summarize([0.8, 0.8], 1000)}}
+        baseline = {'benchmarks': pool_results(runs)}
+        self.assertEqual(baseline['benchmarks']['a']['repeats'], 10)
+        self.assertEqual(baseline['benchmarks']['a']['processes'], 5)
+        self.assertEqual(baseline['benchmarks']['a']['median_s'], 1.0)
+
+        slower = compare_with_baseline({'benchmarks': {'a': summarize([1.3], 1000)}}, baseline, 0.2)[0]
+        self.assertGreater(slower['allowed_drop'], 0.2)
+        self.assertFalse(slower['regressed'])
+        much_slower = compare_with_baseline({'benchmarks': {'a': summarize([3.0], 1000)}}, baseline, 0.2)[0]
+        self.assertTrue(much_slower['regressed'])
+
+    def test_calibrated_gate(self):
+        """Test that throughput is compared relative to the machine-speed readings"""
+        from scripts.benchmark_framework import compare_with_baseline, summarize
+
+        baseline = {'benchmarks': {'a': dict(summarize([1.0], 1000), machine_speed=[100.0])}}
+        # Twice as slow on a machine running at half speed: no regression
+        current = {'benchmarks': {'a': dict(summarize([2.0], 1000), machine_speed=[50.0])}}
+        entry = compare_with_baseline(current, baseline, 0.2)[0]
+        self.assertTrue(entry['calibrated'])
+        self.assertAlmostEqual(entry['ratio'], 1.0)
+        self.assertFalse(entry['regressed'])
+
+    def test_every_category_benchmarked(self):
+        """Test that the micro suite reaches every duplicate category"""
+        from scripts.benchmark_framework import micro_benchmarks, uncached_detector
+        from src.utils.corpus_generator import DUPLICATE_CATEGORIES
+
+        benchmarks = micro_benchmarks(uncached_detector())
+        for category in DUPLICATE_CATEGORIES:
+            self.assertIn(f'rule.category.{category}', benchmarks)
+
+    def test_workload_is_seeded(self):
+        """Test that macro workloads are reproducible"""
+        from scripts.benchmark_framework import generate_pairs
+
+        self.assertEqual(list(generate_pairs(50, seed=7)), list(generate_pairs(50, seed=7)))
+        self.assertNotEqual(list(generate_pairs(50, seed=7)), list(generate_pairs(50, seed=8)))
+
+    def test_confidence_interval(self):
+        """Test the Student t confidence half-width"""
+        from scripts.benchmark_framework import mean_confidence_interval
+
+        mean, half_width = mean_confidence_interval([10.0, 12.0, 14.0])
+        self.assertEqual(mean, 12.0)
+        self.assertAlmostEqual(half_width, 4.303 * 2.0 / 3 ** 0.5, places=6)
+        self.assertEqual(mean_confidence_interval([5.0]), (5.0, 0.0))
+
+    def test_workload_profiles(self):
+        """Test that profiles avoid the identical-name short-circuit and that hot runs hit the cache"""
+        from scripts.benchmark_framework import (
+            build_workload_profiles, time_workload, HOT_WORKING_SET, LONG_NAME_TOKENS
+        )
+        from src.algorithms.duplicate_detector import DuplicateDetector
+
+        profiles = build_workload_profiles(comparisons=300, seed=1)
+        self.assertTrue(all(len(pairs) == 300 for pairs in profiles.values()))
+        for name in ('distinct', 'realistic', 'long_names'):
+            self.assertTrue(all(name1 != name2 for name1, name2 in profiles[name]), name)
+        self.assertTrue(all(len(name1.split()) >= LONG_NAME_TOKENS for name1, _ in profiles['long_names']))
+        self.assertLessEqual(len(set(profiles['cache_hot'])), HOT_WORKING_SET)
+
+        # A caller's detector is the one timed, and its caching is left on
+        class CountingDetector(DuplicateDetector):
+            calls = 0
+
+            def are_duplicates(self, name1, name2):
+                CountingDetector.calls += 1
+                return super().are_duplicates(name1, name2)
+
+        detector = CountingDetector()
+        shared = time_workload(profiles['realistic'][:20], 'off', repeats=1, detector=detector)
+        self.assertEqual(CountingDetector.calls, 40)
+        self.assertTrue(shared['detector'].endswith('.CountingDetector'))
+        self.assertNotIn(True, [instance.__dict__.get('_method_caching_disabled', False)
+                                for instance in (detector, detector.similarity_calculator)])
+
+        cold = time_workload(profiles['cache_cold'][:50], 'cold', repeats=2)
+        hot = time_workload(profiles['cache_hot'][:50], 'hot', repeats=2)
+        self.assertEqual(cold['repeats'], 2)
+        self.assertGreater(hot['throughput_mean'], cold['throughput_mean'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+"""
+Token bucket rate limiter tests for BlueEdge framework
+"""
+import unittest
+import sys
+import os
+import threading
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.rate_limiter import TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Burst, refill and waiting"""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.bucket = TokenBucket(rate=2, capacity=3, clock=self.clock)
+
+    def test_burst_then_refill(self):
+        """Test that a full bucket allows a burst and then refills at the rate"""
+        self.assertEqual([self.bucket.try_acquire() for _ in range(4)], [True, True, True, False])
+        self.assertAlmostEqual(self.bucket.time_until(), 0.5)
+
+        self.clock.now = 0.5
+        self.assertTrue(self.bucket.try_acquire())
+        self.clock.now = 100.0
+        self.assertEqual(self.bucket.get_statistics()['available'], 3)
+
+    def test_acquire_timeout_and_stop(self):
+        """Test that acquire gives up at the timeout or when stopped"""
+        bucket = TokenBucket(rate=1, capacity=1)
+        self.assertTrue(bucket.acquire())
+        self.assertFalse(bucket.acquire(timeout=0.05))
+
+        stop = threading.Event()
+        stop.set()
+        self.assertFalse(bucket.acquire(stop_event=stop))
+
+    def test_statistics_and_validation(self):
+        """Test counters and that a non-positive rate is rejected"""
+        self.bucket.try_acquire(3)
+        self.bucket.try_acquire()
+        stats = self.bucket.get_statistics()
+        self.assertEqual((stats['granted'], stats['throttled']), (1, 1))
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+    def test_impossible_requests_are_rejected(self):
+        """Test that capacity below 1 and requests above capacity raise instead of waiting forever"""
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=5, capacity=0.5)
+        with self.assertRaises(ValueError):
+            self.bucket.acquire(4)
+        with self.assertRaises(ValueError):
+            self.bucket.time_until(4)
+        self.assertTrue(self.bucket.acquire(3, timeout=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
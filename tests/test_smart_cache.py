@@ -0,0 +1,292 @@
+"""
+Smart Cache tests for BlueEdge framework
+"""
+import unittest
+import sys
+import os
+import threading
+import tempfile
+from unittest import mock
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.smart_cache import (
+    SmartCache, ShardedSmartCache, PreparedNameCache,
+    method_cache_statistics, invalidate_method_caches
+)
+
+
+class TestSmartCache(unittest.TestCase):
+    """Single-threaded SmartCache behaviour"""
+
+    def test_symmetric_lookup(self):
+        """Test that pair order does not change the cache key"""
+        cache = SmartCache(max_size=10, verbose=False)
+        cache.put("Ahmed Hassan", "Ahmad Hasan", {"similarity_score": 0.89})
+
+        found, result = cache.get("Ahmad Hasan", "Ahmed Hassan")
+        self.assertTrue(found)
+        self.assertEqual(result["similarity_score"], 0.89)
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = SmartCache(max_size=2, max_memory_kb=100, verbose=False)
+        cache.put("A", "B", {"v": 1})
+        cache.put("C", "D", {"v": 2})
+        cache.get("A", "B")
+        cache.put("E", "F", {"v": 3})
+
+        self.assertTrue(cache.get("A", "B")[0])
+        self.assertFalse(cache.get("C", "D")[0])
+        self.assertEqual(cache.evictions, 1)
+
+    def test_bounded_expiry_per_lookup(self):
+        """Test that a lookup expires at most expire_batch_size items"""
+        cache = SmartCache(max_size=100, max_memory_kb=100, verbose=False)
+        cache.expire_hours = 0
+        for i in range(50):
+            cache.put(f"N{i}", f"M{i}", {"i": i})
+
+        cache.get("X", "Y")
+        self.assertEqual(len(cache.cache), 50 - cache.expire_batch_size)
+
+        self.assertEqual(cache.expire_due(), 50 - cache.expire_batch_size)
+        self.assertEqual(len(cache.cache), 0)
+        self.assertEqual(cache.expirations, 50)
+
+    def test_replaced_entry_not_expired_early(self):
+        """Test that stale heap entries for replaced keys are skipped"""
+        cache = SmartCache(max_size=10, verbose=False)
+        cache.expire_hours = 0
+        cache.put("A", "B", {"v": 1})
+        cache.expire_hours = 12
+        cache.put("A", "B", {"v": 2})
+
+        self.assertEqual(cache.expire_due(), 0)
+        self.assertEqual(cache.get("A", "B"), (True, {"v": 2}))
+
+    def test_snapshot_roundtrip(self):
+        """Test that a snapshot restores entries into a fresh cache"""
+        cache = SmartCache(max_size=10, verbose=False)
+        cache.put("Ahmed Hassan", "Ahmad Hasan", {"similarity_score": 0.89, "names": ["A", "B"]})
+        cache.put_by_key(("AHMED", "AHMAD"), True)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.bin")
+            self.assertEqual(cache.snapshot(path), 2)
+
+            restored = SmartCache(max_size=10, verbose=False)
+            self.assertEqual(restored.load(path), 2)
+
+        self.assertEqual(restored.get("Ahmad Hasan", "Ahmed Hassan")[1]["similarity_score"], 0.89)
+        self.assertEqual(restored.get_by_key(("AHMED", "AHMAD")), (True, True))
+
+    def test_snapshot_replaces_atomically(self):
+        """Test that a failed snapshot write keeps the previous file and leaves no temp file"""
+        cache = SmartCache(max_size=10, verbose=False)
+        cache.put("A", "B", {"v": 1})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.bin")
+            cache.snapshot(path)
+            cache.put("C", "D", {"v": 2})
+            with mock.patch('os.replace', side_effect=OSError("disk full")):
+                with self.assertRaises(OSError):
+                    cache.snapshot(path)
+
+            self.assertEqual(os.listdir(tmp), ["cache.bin"])
+            self.assertEqual(SmartCache(verbose=False).load(path), 1)
+
+    def test_load_rejects_foreign_file(self):
+        """Test that load refuses files without the snapshot header"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bogus.bin")
+            with open(path, 'wb') as f:
+                f.write(b"not a snapshot at all")
+            with self.assertRaises(ValueError):
+                SmartCache(verbose=False).load(path)
+
+
+class TestShardedSmartCache(unittest.TestCase):
+    """Concurrent ShardedSmartCache behaviour"""
+
+    def test_concurrent_access(self):
+        """Test that counters stay consistent under a thread pool"""
+        cache = ShardedSmartCache(max_size=2000, max_memory_kb=2000, num_shards=4)
+        threads_count = 8
+        per_thread = 200
+
+        def worker(worker_id):
+            for i in range(per_thread):
+                name1, name2 = f"NAME{i}", f"OTHER{i}"
+                found, _ = cache.get(name1, name2)
+                if not found:
+                    cache.put(name1, name2, {"worker": worker_id, "i": i})
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(threads_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        stats = cache.get_statistics()
+        self.assertEqual(stats['total_requests'], threads_count * per_thread)
+        self.assertEqual(stats['hits'] + stats['misses'], stats['total_requests'])
+        self.assertEqual(stats['current_size'], per_thread)
+        self.assertEqual(sum(stats['shard_sizes']), per_thread)
+
+    def test_shard_budget(self):
+        """Test that the total size limit is split across shards"""
+        cache = ShardedSmartCache(max_size=8, max_memory_kb=100, num_shards=4)
+        for i in range(100):
+            cache.put(f"N{i}", f"M{i}", {"i": i})
+
+        self.assertLessEqual(cache.get_statistics()['current_size'], 8)
+
+    def test_background_maintenance(self):
+        """Test that the maintenance thread expires items off the lookup path"""
+        import time
+
+        cache = ShardedSmartCache(max_size=100, max_memory_kb=100, num_shards=2)
+        for shard in cache.shards:
+            shard.expire_hours = 0
+        for i in range(20):
+            cache.put(f"N{i}", f"M{i}", {"i": i})
+
+        cache.start_maintenance(interval=0.01)
+        deadline = time.time() + 2
+        while cache.get_statistics()['current_size'] and time.time() < deadline:
+            time.sleep(0.01)
+        cache.stop_maintenance()
+
+        stats = cache.get_statistics()
+        self.assertEqual(stats['current_size'], 0)
+        self.assertEqual(stats['expirations'], 20)
+        self.assertFalse(stats['maintenance_running'])
+
+
+class TestTwoTierCache(unittest.TestCase):
+    """Prepared-name tier underneath the pair cache"""
+
+    def test_one_vs_many_hits_name_tier(self):
+        """Test that a repeated probe name is prepared only once"""
+        from src.algorithms.duplicate_detector import DuplicateDetector
+
+        detector = DuplicateDetector()
+        cache = SmartCache(max_size=50, verbose=False)
+        detector.attach_name_cache(cache.name_cache)
+
+        probe = "MOHAMMED AHMED HASSAN"
+        candidates = ["MOHAMMAD AHMAD HASAN", "SARA OMAR SALEM", "DR. AHMED OMAR SALEM"]
+        baseline = [DuplicateDetector().are_duplicates(probe, c) for c in candidates]
+        cached = [detector.are_duplicates(probe, c) for c in candidates]
+
+        self.assertEqual(baseline, cached)
+        detector_hits = cache.name_cache.get_statistics()['hits']
+        self.assertGreaterEqual(detector_hits, len(candidates) - 1)
+
+    def test_name_tier_is_bounded(self):
+        """Test that the name tier evicts beyond its size"""
+        tier = PreparedNameCache(max_size=3)
+        for i in range(10):
+            tier.get_or_prepare(f"NAME{i}", str.lower)
+
+        stats = tier.get_statistics()
+        self.assertEqual(stats['current_size'], 3)
+        self.assertEqual(stats['evictions'], 7)
+        self.assertEqual(tier.get_or_prepare("NAME9", str.lower), "name9")
+        self.assertEqual(tier.get_statistics()['hits'], 1)
+
+
+class TestCachedDecorator(unittest.TestCase):
+    """@cached on DuplicateDetector methods"""
+
+    def setUp(self):
+        from src.algorithms.duplicate_detector import DuplicateDetector
+        self.detector = DuplicateDetector()
+
+    def test_symmetric_hits(self):
+        """Test that swapped and re-cased pairs hit the same entry"""
+        first = self.detector.are_duplicates("MOHAMMED AHMED HASSAN", "MOHAMMAD AHMAD HASAN")
+        second = self.detector.are_duplicates("mohammad ahmad  hasan", "MOHAMMED AHMED HASSAN")
+
+        self.assertEqual(first, second)
+        stats = method_cache_statistics(self.detector)['are_duplicates']
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_threshold_change_invalidates(self):
+        """Test that changing the threshold drops cached decisions"""
+        pair = ("MOHAMMED AHMED HASSAN", "MOHAMMAD AHMAD HASAN")
+        self.assertTrue(self.detector.are_duplicates(*pair))
+
+        self.detector.threshold = 0.0
+        self.assertFalse(self.detector.are_duplicates(*pair))
+        self.assertEqual(method_cache_statistics(self.detector)['are_duplicates']['invalidations'], 1)
+
+    def test_in_place_lexicon_edit_invalidates(self):
+        """Test that a same-size lexicon edit and a calculator change drop cached decisions"""
+        pair = ("BEBO ALI HASSAN", "IBRAHIM ALI HASSAN")
+        self.assertTrue(self.detector.are_duplicates(*pair))
+        self.assertEqual(self.detector.detect_category(*pair), 'common_nicknames')
+
+        # Same sizes: only the content of the calculator's nickname list changes
+        self.detector.similarity_calculator.nicknames['IBRAHIM'].remove('BEBO')
+        self.detector.similarity_calculator.nicknames['IBRAHIM'].append('HEMA')
+        self.assertFalse(self.detector.are_duplicates(*pair))
+        self.assertEqual(self.detector.detect_category(*pair), 'different_spelling')
+
+        self.detector.similarity_calculator.threshold = 0.5
+        self.detector.are_duplicates(*pair)
+        self.assertEqual(method_cache_statistics(self.detector)['are_duplicates']['invalidations'], 2)
+
+    def test_explicit_invalidation(self):
+        """Test that invalidate_method_caches clears every method"""
+        self.detector.detect_category("DR. AHMED OMAR SALEM", "AHMED OMAR SALEM")
+        self.detector.calculate_similarity("SARA", "SOSO")
+
+        self.assertEqual(invalidate_method_caches(self.detector), 2)
+        stats = method_cache_statistics(self.detector)
+        self.assertEqual(stats['detect_category']['current_size'], 0)
+        self.assertEqual(stats['calculate_similarity']['current_size'], 0)
+
+    def test_shared_detector_across_threads(self):
+        """Test that threads sharing one detector neither fail nor disagree with serial results"""
+        # More distinct pairs than the cache holds, so lookups race with eviction
+        names = [f"AHMED {letter} HASSAN" for letter in "ABCDEFGH"] + [f"MOHAMMED {i} ALI" for i in range(72)]
+        pairs = [(names[i % len(names)], names[(i * 7 + i // len(names)) % len(names)]) for i in range(2000)]
+        expected = [(self.detector.are_duplicates(*pair), self.detector.detect_category(*pair)) for pair in pairs]
+        invalidate_method_caches(self.detector)
+        requests_before = method_cache_statistics(self.detector)['are_duplicates']['total_requests']
+
+        errors = []
+        mismatches = []
+
+        def worker(offset):
+            try:
+                for _ in range(2):
+                    for i in range(len(pairs)):
+                        index = (i + offset * 50) % len(pairs)
+                        result = (self.detector.are_duplicates(*pairs[index]),
+                                  self.detector.detect_category(*pairs[index]))
+                        if result != expected[index]:
+                            mismatches.append(index)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(mismatches, [])
+        stats = method_cache_statistics(self.detector)['are_duplicates']
+        self.assertEqual(stats['hits'] + stats['misses'], stats['total_requests'])
+        self.assertEqual(stats['total_requests'] - requests_before, 8 * 2 * len(pairs))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Durable sync outbox tests for BlueEdge framework
+"""
+import unittest
+import sys
+import os
+import tempfile
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.sync_outbox import SyncOutbox
+
+
+class TestSyncOutbox(unittest.TestCase):
+    """Persistence, acknowledgement, retries and compaction"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'outbox.db')
+        self.outbox = SyncOutbox(self.path, compact_every=1000)
+
+    def tearDown(self):
+        self.outbox.close()
+        self.directory.cleanup()
+
+    def test_fifo_until_acked(self):
+        """Test that items are peeked oldest first and stay until acknowledged"""
+        for i in range(5):
+            self.outbox.enqueue('user_1', {'i': i})
+
+        batch = self.outbox.peek(3)
+        self.assertEqual([item['data']['i'] for item in batch], [0, 1, 2])
+        self.assertEqual(self.outbox.peek(3), batch)
+
+        self.assertEqual(self.outbox.ack([item['id'] for item in batch]), 3)
+        self.assertEqual([item['data']['i'] for item in self.outbox.peek(10)], [3, 4])
+        self.assertEqual(len(self.outbox), 2)
+
+    def test_idempotency_key(self):
+        """Test that re-enqueueing a key does not create a second item"""
+        self.assertEqual(self.outbox.enqueue('u', {'v': 1}, 'key-1'), 'key-1')
+        self.outbox.enqueue('u', {'v': 2}, 'key-1')
+
+        items = self.outbox.peek(10)
+        self.assertEqual(len(items), 1)
+        self.assertEqual(items[0]['data'], {'v': 1})
+        self.assertEqual(self.outbox.get_statistics()['duplicates_ignored'], 1)
+
+    def test_replay_after_reopen(self):
+        """Test that pending items survive closing the database (app restart)"""
+        for i in range(3):
+            self.outbox.enqueue('user_1', {'i': i})
+        self.outbox.ack([self.outbox.peek(1)[0]['id']])
+        self.outbox.close()
+
+        self.outbox = SyncOutbox(self.path)
+        self.assertEqual(len(self.outbox), 2)
+        self.assertEqual([item['data']['i'] for item in self.outbox.peek(10)], [1, 2])
+
+    def test_failed_items_are_parked(self):
+        """Test that items past max_retries stop being synced"""
+        self.outbox.enqueue('u', {'v': 1})
+        item_id = self.outbox.peek(1)[0]['id']
+
+        for _ in range(2):
+            self.assertEqual(self.outbox.fail([item_id], max_retries=2), 0)
+        self.assertEqual(self.outbox.peek(1)[0]['retries'], 2)
+        self.assertEqual(self.outbox.fail([item_id], max_retries=2), 1)
+
+        self.assertEqual(self.outbox.peek(10), [])
+        self.assertEqual(self.outbox.get_statistics()['dead'], 1)
+
+    def test_revive_parked_items(self):
+        """Test that revived items are pending again with their retries reset"""
+        for i in range(3):
+            self.outbox.enqueue('u', {'i': i})
+        ids = [item['id'] for item in self.outbox.peek(3)]
+        self.outbox.fail(ids, max_retries=0)
+        self.assertEqual(len(self.outbox), 0)
+        self.assertEqual([item['data']['i'] for item in self.outbox.peek_dead()], [0, 1, 2])
+
+        self.assertEqual(self.outbox.revive([ids[1]]), 1)
+        self.assertEqual(self.outbox.peek(10)[0]['retries'], 0)
+        self.assertEqual(self.outbox.revive(), 2)
+        self.assertEqual(self.outbox.revive(), 0)
+        self.assertEqual([item['data']['i'] for item in self.outbox.peek(10)], [0, 1, 2])
+        self.assertEqual(self.outbox.get_statistics()['dead'], 0)
+
+    def test_compaction_and_limit(self):
+        """Test that compaction removes acknowledged rows and the cap drops the oldest"""
+        outbox = SyncOutbox(':memory:', max_items=3)
+        for i in range(5):
+            outbox.enqueue('u', {'i': i})
+        self.assertEqual([item['data']['i'] for item in outbox.peek(10)], [2, 3, 4])
+        self.assertEqual(outbox.get_statistics()['dropped'], 2)
+
+        outbox.ack([item['id'] for item in outbox.peek(2)])
+        self.assertEqual(outbox.compact(), 2)
+        self.assertEqual(outbox.get_statistics()['acked_uncompacted'], 0)
+        outbox.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
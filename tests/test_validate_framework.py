@@ -0,0 +1,42 @@
+"""
+Validation script tests for BlueEdge framework
+"""
+import unittest
+import sys
+import os
+import io
+import contextlib
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from scripts.validate_framework import ResultsReproducer
+    VALIDATION_AVAILABLE = True
+except ImportError:  # numpy not installed
+    VALIDATION_AVAILABLE = False
+
+
+@unittest.skipUnless(VALIDATION_AVAILABLE, "numpy not installed")
+class TestResultsReproducer(unittest.TestCase):
+    """Serial and process-pool evaluation"""
+
+    def test_pool_matches_serial(self):
+        """Test that pooled counts equal in-process counts, batch by batch"""
+        serial = ResultsReproducer(workers=1)
+        pooled = ResultsReproducer(workers=2, parallel_min_cases=0, chunk_size=70)
+        with contextlib.redirect_stdout(io.StringIO()):
+            cases = serial.generate_synthetic_dataset(600, seed=3)
+        batches = [[case for case in cases if case['type'] == case_type]
+                   for case_type in sorted({case['type'] for case in cases})]
+
+        try:
+            expected = serial.count_correct(batches)
+            self.assertEqual(pooled.count_correct(batches), expected)
+            self.assertTrue(0 < sum(expected) <= len(cases))
+        finally:
+            pooled.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+Compact wire schema tests for BlueEdge framework
+"""
+import unittest
+import sys
+import os
+import json
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.utils.wire_schema import (
+    SCHEMA_VERSION, SESSION_METADATA, CATEGORY_CODES,
+    encode_record, encode_history_entry, decode_record
+)
+
+
+COMPARISON = {
+    'name1': 'MOHAMMED AHMED HASSAN', 'name2': 'MOHAMMAD AHMAD HASAN',
+    'name1_processed': 'mohammed ahmed hassan', 'name2_processed': 'mohammad ahmad hasan',
+    'similarity_score': 0.8912345, 'is_duplicate': True, 'processing_time': 0.0012,
+    'category': 'different_spelling', 'confidence_level': 'high', 'error_types': [],
+    'timestamp': '2025-01-01T12:00:00', 'algorithm_version': 'blueedge_v1.0'
+}
+
+
+def _size(payload):
+    return len(json.dumps(payload, separators=(',', ':')))
+
+
+class TestWireSchema(unittest.TestCase):
+    """Encoding, decoding and backwards compatibility"""
+
+    def test_roundtrip(self):
+        """Test that decoding restores the verbose record fields"""
+        record = encode_record('user_1', COMPARISON, 'session_1')
+        self.assertEqual(record['v'], SCHEMA_VERSION)
+        self.assertEqual(record['c'], CATEGORY_CODES.index('different_spelling'))
+        self.assertNotIn('e', record)
+
+        decoded = decode_record(record)
+        self.assertEqual(decoded['user_id'], 'user_1')
+        self.assertEqual(decoded['session_id'], 'session_1')
+        self.assertEqual(decoded['timestamp'], '2025-01-01T12:00:00')
+        self.assertEqual(decoded['error_category'], 'different_spelling')
+        self.assertIs(decoded['duplicate_status'], True)
+        self.assertAlmostEqual(decoded['similarity_score'], 0.8912)
+        self.assertEqual(decoded['name2_data'], {'full_name': 'MOHAMMAD AHMAD HASAN',
+                                                 'processed': 'mohammad ahmad hasan'})
+        self.assertEqual(decoded['comparison_results']['algorithm_version'], 'blueedge_v1.0')
+
+    def test_unknown_category_kept(self):
+        """Test that categories without a code travel as strings"""
+        record = encode_record('u', {'category': 'transliteration'}, 's')
+        self.assertEqual(record['c'], 'transliteration')
+        self.assertEqual(decode_record(record)['error_category'], 'transliteration')
+        self.assertEqual(decode_record(encode_record('u', {}, 's'))['error_category'], 'unknown')
+
+    def test_legacy_records_pass_through(self):
+        """Test that v1 records (no version key) are returned unchanged"""
+        legacy = {'user_id': 'u', 'timestamp': '2024-01-01T00:00:00', 'comparison_results': {}}
+        self.assertIs(decode_record(legacy), legacy)
+
+    def test_history_entry_subset(self):
+        """Test that history entries keep only what the history list displays"""
+        entry = encode_history_entry(encode_record('u', COMPARISON, 's'))
+        self.assertEqual(set(entry), {'v', 't', 'n1', 'n2', 'sc', 'd', 'c'})
+        self.assertEqual(decode_record(entry)['comparison_results']['name1'], 'MOHAMMED AHMED HASSAN')
+
+    def test_smaller_than_verbose_record(self):
+        """Test that the wire record is well under half the verbose record with metadata"""
+        record = encode_record('user_1', COMPARISON, 'session_1')
+        verbose = dict(decode_record(record), **{key: SESSION_METADATA[key] for key in SESSION_METADATA
+                                                if key != 'schema_version'})
+        self.assertLess(_size(record) * 2, _size(verbose))
+
+
+if __name__ == '__main__':
+    unittest.main()